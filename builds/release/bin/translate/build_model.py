@@ -0,0 +1,653 @@
+#! /usr/bin/env python3
+
+
+from collections import defaultdict, deque
+import itertools
+import operator
+import os
+import sys
+
+import pddl
+import timers
+import tools
+from functools import reduce
+
+def convert_rules(prog):
+    RULE_TYPES = {
+        "join": JoinRule,
+        "product": ProductRule,
+        "project": ProjectRule,
+        }
+    result = []
+    for rule in prog.rules:
+        RuleType = RULE_TYPES[rule.type]
+        new_effect, new_conditions = variables_to_numbers(
+            rule.effect, rule.conditions)
+        rule = RuleType(new_effect, new_conditions)
+        rule.validate()
+        result.append(rule)
+    return result
+
+def variables_to_numbers(effect, conditions):
+    new_effect_args = list(effect.args)
+    rename_map = {}
+    for i, arg in enumerate(effect.args):
+        if arg[0] == "?":
+            rename_map[arg] = i
+            new_effect_args[i] = i
+    new_effect = pddl.Atom(effect.predicate, new_effect_args)
+
+    # There are three possibilities for arguments in conditions:
+    # 1. They are variables that occur in the effect. In that case,
+    #    they are replaced by the corresponding position in the
+    #    effect, as indicated by the rename_map.
+    # 2. They are constants. In that case, the unifier must guarantee
+    #    that they are matched appropriately. In that case, they are
+    #    not modified (remain strings denoting objects).
+    # 3. They are variables that don't occur in the effect (are
+    #    projected away). This is only allowed in projection rules.
+    #    Such arguments are also not modified (remain "?x" strings).
+
+    new_conditions = []
+    for cond in conditions:
+        new_cond_args = [rename_map.get(arg, arg) for arg in cond.args]
+        new_conditions.append(pddl.Atom(cond.predicate, new_cond_args))
+    return new_effect, new_conditions
+
+class BuildRule:
+    def prepare_effect(self, new_atom, cond_index):
+        effect_args = list(self.effect.args)
+        cond = self.conditions[cond_index]
+        for var_no, obj in zip(cond.args, new_atom.args):
+            if isinstance(var_no, int):
+                effect_args[var_no] = obj
+        return effect_args
+    def __str__(self):
+        return "%s :- %s" % (self.effect, ", ".join(map(str, self.conditions)))
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self)
+
+class JoinRule(BuildRule):
+    def __init__(self, effect, conditions):
+        self.effect = effect
+        self.conditions = conditions
+        left_args = conditions[0].args
+        right_args = conditions[1].args
+        left_vars = {var for var in left_args if isinstance(var, int)}
+        right_vars = {var for var in right_args if isinstance(var, int)}
+        common_vars = sorted(left_vars & right_vars)
+        self.common_var_positions = [
+            [args.index(var) for var in common_vars]
+            for args in (list(left_args), list(right_args))]
+        self.atoms_by_key = ({}, {})
+    def validate(self):
+        assert len(self.conditions) == 2, self
+        left_args = self.conditions[0].args
+        right_args = self.conditions[1].args
+        eff_args = self.effect.args
+        left_vars = {v for v in left_args
+                     if isinstance(v, int) or v[0] == "?"}
+        right_vars = {v for v in right_args
+                      if isinstance(v, int) or v[0] == "?"}
+        eff_vars = {v for v in eff_args
+                    if isinstance(v, int) or v[0] == "?"}
+        assert left_vars & right_vars, self
+        assert (left_vars | right_vars) == (left_vars & right_vars) | eff_vars, self
+    def update_index(self, new_atom, cond_index):
+        ordered_common_args = [
+            new_atom.args[position]
+            for position in self.common_var_positions[cond_index]]
+        key = tuple(ordered_common_args)
+        self.atoms_by_key[cond_index].setdefault(key, []).append(new_atom)
+    def get_index_size(self):
+        return sum(len(atoms) for index in self.atoms_by_key
+                   for atoms in index.values())
+    def release_index(self):
+        self.atoms_by_key = ({}, {})
+    def spill_index(self, store):
+        self.atoms_by_key = tuple(
+            SpilledIndex(store, cond.predicate, index)
+            for cond, index in zip(self.conditions, self.atoms_by_key))
+    def fire(self, new_atom, cond_index, enqueue_func):
+        effect_args = self.prepare_effect(new_atom, cond_index)
+        ordered_common_args = [
+            new_atom.args[position]
+            for position in self.common_var_positions[cond_index]]
+        key = tuple(ordered_common_args)
+        other_cond_index = 1 - cond_index
+        other_cond = self.conditions[other_cond_index]
+        for atom in self.atoms_by_key[other_cond_index].get(key, []):
+            for var_no, obj in zip(other_cond.args, atom.args):
+                if isinstance(var_no, int):
+                    effect_args[var_no] = obj
+            enqueue_func(self.effect.predicate, effect_args)
+
+def _make_tuple_getter(indices):
+    """Return a function that maps a sequence to the tuple of its
+    elements at the given indices."""
+    if len(indices) >= 2:
+        return operator.itemgetter(*indices)
+    elif indices:
+        index = indices[0]
+        return lambda sequence: (sequence[index],)
+    else:
+        return lambda sequence: ()
+
+class ProductRule(BuildRule):
+    def __init__(self, effect, conditions):
+        self.effect = effect
+        self.conditions = conditions
+        # For each condition, the objects that the atoms seen so far bind
+        # to the variables of the condition (as tuples in the order of
+        # the variables). They are collected in update_index, so that
+        # firing does not need to recompute them for all atoms of the
+        # other conditions.
+        self.values_by_index = [[] for c in self.conditions]
+        cond_vars = [[var_no for var_no in cond.args if isinstance(var_no, int)]
+                     for cond in conditions]
+        self.get_values = [
+            _make_tuple_getter([pos for pos, var_no in enumerate(cond.args)
+                                if isinstance(var_no, int)])
+            for cond in conditions]
+        # When an atom of condition i arrives, the effect arguments are
+        # selected from the constants of the effect, followed by the
+        # values of the new atom and the values of the atoms of the other
+        # conditions (in their order).
+        self.effect_constants = tuple(
+            arg for arg in effect.args if not isinstance(arg, int))
+        self.get_effect_args = []
+        for cond_index in range(len(conditions)):
+            layout = cond_vars[cond_index] + [
+                var_no for pos, vars in enumerate(cond_vars)
+                if pos != cond_index for var_no in vars]
+            num_constants = len(self.effect_constants)
+            var_positions = {var_no: num_constants + pos
+                             for pos, var_no in enumerate(layout)}
+            constant_positions = iter(range(num_constants))
+            self.get_effect_args.append(_make_tuple_getter([
+                var_positions[arg] if isinstance(arg, int)
+                else next(constant_positions)
+                for arg in effect.args]))
+        self.empty_atom_list_no = len(self.conditions)
+    def validate(self):
+        assert len(self.conditions) >= 2, self
+        cond_vars = [{v for v in cond.args
+                      if isinstance(v, int) or v[0] == "?"}
+                     for cond in self.conditions]
+        all_cond_vars = reduce(set.union, cond_vars)
+        eff_vars = {v for v in self.effect.args
+                    if isinstance(v, int) or v[0] == "?"}
+        assert len(all_cond_vars) == len(eff_vars), self
+        assert len(all_cond_vars) == sum([len(c) for c in cond_vars])
+    def update_index(self, new_atom, cond_index):
+        values_list = self.values_by_index[cond_index]
+        if not values_list:
+            self.empty_atom_list_no -= 1
+        values_list.append(self.get_values[cond_index](new_atom.args))
+    def get_index_size(self):
+        return sum(len(values) for values in self.values_by_index)
+    def release_index(self):
+        self.values_by_index = [[] for c in self.conditions]
+
+    def fire(self, new_atom, cond_index, enqueue_func):
+        if self.empty_atom_list_no:
+            return
+
+        predicate = self.effect.predicate
+        get_effect_args = self.get_effect_args[cond_index]
+        prefix = (self.effect_constants +
+                  self.get_values[cond_index](new_atom.args))
+        *outer_factors, inner_factor = [
+            values for pos, values in enumerate(self.values_by_index)
+            if pos != cond_index]
+        for values_list in itertools.product(*outer_factors):
+            outer_prefix = prefix + sum(values_list, ())
+            for values in inner_factor:
+                enqueue_func(predicate, get_effect_args(outer_prefix + values))
+
+
+class ProjectRule(BuildRule):
+    def __init__(self, effect, conditions):
+        self.effect = effect
+        self.conditions = conditions
+    def validate(self):
+        assert len(self.conditions) == 1
+    def update_index(self, new_atom, cond_index):
+        pass
+    def get_index_size(self):
+        return 0
+    def release_index(self):
+        pass
+    def fire(self, new_atom, cond_index, enqueue_func):
+        effect_args = self.prepare_effect(new_atom, cond_index)
+        enqueue_func(self.effect.predicate, effect_args)
+
+class Unifier:
+    """Map atoms to the (rule, cond_index) pairs of the conditions they
+    match.
+
+    The matches are organized in a decision tree per predicate (see
+    LeafGenerator and MatchGenerator) that tests the arguments at which
+    some condition of the predicate has a constant. Since the matches of
+    an atom only depend on its predicate and its arguments at these
+    positions, we compile the tree into flat dispatch tables: for
+    predicates without constants in conditions, the matches are
+    precomputed; for the others, the tree is evaluated once for each
+    combination of arguments at the tested positions, and the result
+    is cached as a tuple."""
+    def __init__(self, rules):
+        self.predicate_to_rule_generator = {}
+        constant_positions = {}
+        for rule in rules:
+            for i, cond in enumerate(rule.conditions):
+                positions = constant_positions.setdefault(cond.predicate, set())
+                positions.update(self._insert_condition(rule, i))
+        self.matches_by_predicate = {}
+        self.dispatch_tables = {}
+        for predicate, positions in constant_positions.items():
+            generator = self.predicate_to_rule_generator[predicate]
+            if positions:
+                get_key = operator.itemgetter(*sorted(positions))
+                self.dispatch_tables[predicate] = (get_key, generator, {})
+            else:
+                matches = []
+                generator.generate(None, matches)
+                self.matches_by_predicate[predicate] = tuple(matches)
+    def unify(self, atom):
+        matches = self.matches_by_predicate.get(atom.predicate)
+        if matches is not None:
+            return matches
+        dispatch_table = self.dispatch_tables.get(atom.predicate)
+        if dispatch_table is None:
+            return ()
+        get_key, generator, matches_by_key = dispatch_table
+        key = get_key(atom.args)
+        matches = matches_by_key.get(key)
+        if matches is None:
+            result = []
+            generator.generate(atom, result)
+            matches = matches_by_key[key] = tuple(result)
+        return matches
+    def _insert_condition(self, rule, cond_index):
+        condition = rule.conditions[cond_index]
+        root = self.predicate_to_rule_generator.get(condition.predicate)
+        if not root:
+            root = LeafGenerator()
+        constant_arguments = [
+            (arg_index, arg)
+            for (arg_index, arg) in enumerate(condition.args)
+            if not isinstance(arg, int) and arg[0] != "?"]
+        newroot = root._insert(constant_arguments, (rule, cond_index))
+        self.predicate_to_rule_generator[condition.predicate] = newroot
+        return [arg_index for arg_index, _ in constant_arguments]
+    def dump(self):
+        predicates = sorted(self.predicate_to_rule_generator)
+        print("Unifier:")
+        for pred in predicates:
+            print("    %s:" % pred)
+            rule_gen = self.predicate_to_rule_generator[pred]
+            rule_gen.dump("    " * 2)
+
+class LeafGenerator:
+    index = sys.maxsize
+    def __init__(self):
+        self.matches = []
+    def empty(self):
+        return not self.matches
+    def generate(self, atom, result):
+        result += self.matches
+    def _insert(self, args, value):
+        if not args:
+            self.matches.append(value)
+            return self
+        else:
+            root = LeafGenerator()
+            root.matches.append(value)
+            for arg_index, arg in args[::-1]:
+                new_root = MatchGenerator(arg_index, LeafGenerator())
+                new_root.match_generator[arg] = root
+                root = new_root
+            root.matches = self.matches # can be swapped in C++
+            return root
+    def dump(self, indent):
+        for match in self.matches:
+            print("%s%s" % (indent, match))
+
+class MatchGenerator:
+    def __init__(self, index, next):
+        self.index = index
+        self.matches = []
+        self.match_generator = {}
+        self.next = next
+    def empty(self):
+        return False
+    def generate(self, atom, result):
+        result += self.matches
+        generator = self.match_generator.get(atom.args[self.index])
+        if generator:
+            generator.generate(atom, result)
+        self.next.generate(atom, result)
+    def _insert(self, args, value):
+        if not args:
+            self.matches.append(value)
+            return self
+        else:
+            arg_index, arg = args[0]
+            if self.index < arg_index:
+                self.next = self.next._insert(args, value)
+                return self
+            elif self.index > arg_index:
+                new_parent = MatchGenerator(arg_index, self)
+                new_branch = LeafGenerator()._insert(args[1:], value)
+                new_parent.match_generator[arg] = new_branch
+                return new_parent
+            else:
+                branch_generator = self.match_generator.get(arg)
+                if not branch_generator:
+                    branch_generator = LeafGenerator()
+                self.match_generator[arg] = branch_generator._insert(
+                    args[1:], value)
+                return self
+    def dump(self, indent):
+        for match in self.matches:
+            print("%s%s" % (indent, match))
+        for key in sorted(self.match_generator.keys()):
+            print("%sargs[%s] == %s:" % (indent, self.index, key))
+            self.match_generator[key].dump(indent + "    ")
+        if not self.next.empty():
+            assert isinstance(self.next, MatchGenerator)
+            print("%s[*]" % indent)
+            self.next.dump(indent + "    ")
+
+class Queue:
+    def __init__(self, atoms):
+        self.queue = atoms
+        self.queue_pos = 0
+        self.enqueued = {(atom.predicate,) + tuple(atom.args)
+                         for atom in self.queue}
+        self.num_pushes = len(atoms)
+    def __bool__(self):
+        return self.queue_pos < len(self.queue)
+    __nonzero__ = __bool__
+    def push(self, predicate, args):
+        self.num_pushes += 1
+        eff_tuple = (predicate,) + tuple(args)
+        if eff_tuple not in self.enqueued:
+            self.enqueued.add(eff_tuple)
+            self.queue.append(pddl.Atom(predicate, list(args)))
+    def __len__(self):
+        return len(self.queue)
+    def pop(self):
+        result = self.queue[self.queue_pos]
+        self.queue_pos += 1
+        return result
+    def get_model(self):
+        return self.queue
+
+def is_auxiliary_predicate(predicate):
+    return isinstance(predicate, str) and "$" in predicate
+
+class MemoryBoundedQueue:
+    """Queue for exploring large Datalog programs under a memory limit.
+
+    Atoms are popped in the same order as from Queue, but the queue
+    keeps less state:
+
+    - Popped auxiliary atoms (of predicates "p$N" introduced by rule
+      splitting) are not kept in the model.
+    - The duplicate check stores the arguments of the enqueued atoms by
+      predicate, sharing the argument tuples with the atoms.
+    - Every CHECK_INTERVAL pops, we determine which predicates are
+      saturated, i.e., cannot get new atoms any more because no atom of
+      a predicate in their stratum or a stratum they depend on is
+      waiting in the queue. (A stratum is a strongly connected component
+      of the predicate dependency graph.) The duplicate checks of
+      saturated predicates and the indexes of rules whose conditions
+      only use saturated predicates are released.
+    - If the process uses more than the memory limit nevertheless, the
+      indexes of the join rules with at least SPILL_MIN_ATOMS atoms are
+      moved to a SpillStore on disk."""
+    CHECK_INTERVAL = 10000
+    SPILL_MIN_ATOMS = 1000
+
+    def __init__(self, atoms, rules, memory_limit):
+        self.memory_limit_in_kb = memory_limit * 1024
+        self.rules = rules
+        self.pending = deque()
+        self.model = []
+        self.num_atoms = 0
+        self.num_pushes = 0
+        self.num_pops = 0
+        self.num_released_rules = 0
+        self.num_spilled_rules = 0
+        self.spill_store = None
+        self._compute_strata(atoms, rules)
+        self.enqueued = defaultdict(set)
+        for atom in atoms:
+            self.push(atom.predicate, atom.args)
+
+    def _compute_strata(self, atoms, rules):
+        import compact_graph
+        predicate_ids = {}
+        def get_id(predicate):
+            return predicate_ids.setdefault(predicate, len(predicate_ids))
+        for atom in atoms:
+            get_id(atom.predicate)
+        arcs = []
+        self.rules_by_condition_predicate = defaultdict(list)
+        self.unsaturated_conditions = []
+        for rule_no, rule in enumerate(rules):
+            condition_predicates = {cond.predicate for cond in rule.conditions}
+            for predicate in condition_predicates:
+                arcs.append((get_id(predicate), get_id(rule.effect.predicate)))
+                self.rules_by_condition_predicate[predicate].append(rule_no)
+            self.unsaturated_conditions.append(len(condition_predicates))
+        graph = compact_graph.CompactGraph.from_arcs(len(predicate_ids), arcs)
+        predicates = list(predicate_ids)
+        # The SCCs are in topological order.
+        self.strata = [[predicates[node] for node in scc]
+                       for scc in graph.get_sccs()]
+        self.stratum_of = {}
+        for stratum_no, stratum in enumerate(self.strata):
+            for predicate in stratum:
+                self.stratum_of[predicate] = stratum_no
+        self.stratum_predecessors = [set() for _ in self.strata]
+        for u, v in arcs:
+            u_stratum = self.stratum_of[predicates[u]]
+            v_stratum = self.stratum_of[predicates[v]]
+            if u_stratum != v_stratum:
+                self.stratum_predecessors[v_stratum].add(u_stratum)
+        self.pending_by_stratum = [0] * len(self.strata)
+        self.saturated = [False] * len(self.strata)
+
+    def __bool__(self):
+        return bool(self.pending)
+    __nonzero__ = __bool__
+    def __len__(self):
+        return self.num_atoms
+    def push(self, predicate, args):
+        self.num_pushes += 1
+        args = tuple(args)
+        enqueued = self.enqueued[predicate]
+        if args not in enqueued:
+            enqueued.add(args)
+            self.pending.append(pddl.Atom(predicate, args))
+            self.pending_by_stratum[self.stratum_of[predicate]] += 1
+            self.num_atoms += 1
+    def pop(self):
+        # All previously popped atoms have been processed at this point,
+        # so the rules of saturated predicates can safely be released.
+        if self.num_pops % self.CHECK_INTERVAL == 0 and self.num_pops:
+            self._release_saturated()
+            self._check_memory()
+        self.num_pops += 1
+        result = self.pending.popleft()
+        self.pending_by_stratum[self.stratum_of[result.predicate]] -= 1
+        if not is_auxiliary_predicate(result.predicate):
+            self.model.append(result)
+        return result
+    def get_model(self):
+        print("%d rule indexes released early" % self.num_released_rules)
+        print("%d rule indexes spilled to disk" % self.num_spilled_rules)
+        if self.spill_store is not None:
+            self.spill_store.close()
+            self.spill_store = None
+        return self.model
+
+    def _release_saturated(self):
+        for stratum_no, stratum in enumerate(self.strata):
+            if (self.saturated[stratum_no] or
+                    self.pending_by_stratum[stratum_no] or
+                    not all(self.saturated[predecessor] for predecessor in
+                            self.stratum_predecessors[stratum_no])):
+                continue
+            self.saturated[stratum_no] = True
+            for predicate in stratum:
+                self.enqueued.pop(predicate, None)
+                for rule_no in self.rules_by_condition_predicate[predicate]:
+                    self.unsaturated_conditions[rule_no] -= 1
+                    if not self.unsaturated_conditions[rule_no]:
+                        self.rules[rule_no].release_index()
+                        self.num_released_rules += 1
+
+    def _check_memory(self):
+        try:
+            memory = tools.get_memory_in_kb()
+        except Warning:
+            return
+        if memory <= self.memory_limit_in_kb:
+            return
+        candidates = [
+            rule for rule_no, rule in enumerate(self.rules)
+            if isinstance(rule, JoinRule) and
+            self.unsaturated_conditions[rule_no] and
+            not isinstance(rule.atoms_by_key[0], SpilledIndex) and
+            rule.get_index_size() >= self.SPILL_MIN_ATOMS]
+        if not candidates:
+            return
+        if self.spill_store is None:
+            self.spill_store = SpillStore()
+        candidates.sort(key=lambda rule: -rule.get_index_size())
+        for rule in candidates:
+            rule.spill_index(self.spill_store)
+            self.num_spilled_rules += 1
+
+def _encode_objects(objects):
+    # Keys are compared as text by SQLite, so equal tuples must give equal
+    # strings. (This is not the case for pickle, which depends on the
+    # identity of the elements.) Object names cannot contain "\0".
+    return "".join("\0" + obj for obj in objects)
+
+def _decode_objects(text):
+    return tuple(text.split("\0")[1:])
+
+class SpillStore:
+    """Temporary SQLite database holding the spilled rule indexes."""
+    def __init__(self):
+        import sqlite3
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory(prefix="translate-")
+        self.connection = sqlite3.connect(
+            os.path.join(self.directory.name, "indexes.db"))
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute(
+            "CREATE TABLE atoms (part INTEGER, key TEXT, args TEXT)")
+        self.connection.execute("CREATE INDEX atoms_by_key ON atoms (part, key)")
+        self.num_parts = 0
+    def new_part(self):
+        self.num_parts += 1
+        return self.num_parts
+    def add(self, part, key, args):
+        self.connection.execute(
+            "INSERT INTO atoms VALUES (?, ?, ?)",
+            (part, _encode_objects(key), _encode_objects(args)))
+    def get(self, part, key):
+        rows = self.connection.execute(
+            "SELECT args FROM atoms WHERE part = ? AND key = ? ORDER BY rowid",
+            (part, _encode_objects(key)))
+        return [_decode_objects(args) for (args,) in rows]
+    def close(self):
+        self.connection.close()
+        self.directory.cleanup()
+
+class SpilledIndex:
+    """Replacement for a dict mapping keys to lists of atoms (as in
+    JoinRule.atoms_by_key) whose entries are stored in a SpillStore.
+    Atoms are returned in the order in which they were added."""
+    def __init__(self, store, predicate, index):
+        self.store = store
+        self.predicate = predicate
+        self.part = store.new_part()
+        for key, atoms in index.items():
+            for atom in atoms:
+                store.add(self.part, key, atom.args)
+    def get(self, key, default):
+        atoms = [pddl.Atom(self.predicate, args)
+                 for args in self.store.get(self.part, key)]
+        return atoms or default
+    def setdefault(self, key, default):
+        return _SpilledAtomList(self, key)
+
+class _SpilledAtomList:
+    # Supports index.setdefault(key, []).append(atom) for SpilledIndex.
+    def __init__(self, index, key):
+        self.index = index
+        self.key = key
+    def append(self, atom):
+        self.index.store.add(self.index.part, self.key, atom.args)
+
+def compute_model(prog, memory_limit=None):
+    """Return the atoms of the minimal model of prog in the order in
+    which they are derived. If memory_limit (in MiB) is given, use a
+    MemoryBoundedQueue, which omits auxiliary atoms from the result."""
+    with timers.timing("Preparing model"):
+        rules = convert_rules(prog)
+        unifier = Unifier(rules)
+        # unifier.dump()
+        fact_atoms = sorted(fact.atom for fact in prog.facts)
+        if memory_limit is None:
+            queue = Queue(fact_atoms)
+        else:
+            queue = MemoryBoundedQueue(fact_atoms, rules, memory_limit)
+
+    print("Generated %d rules." % len(rules))
+    with timers.timing("Computing model"):
+        relevant_atoms = 0
+        auxiliary_atoms = 0
+        while queue:
+            next_atom = queue.pop()
+            pred = next_atom.predicate
+            if is_auxiliary_predicate(pred):
+                auxiliary_atoms += 1
+            else:
+                relevant_atoms += 1
+            matches = unifier.unify(next_atom)
+            for rule, cond_index in matches:
+                rule.update_index(next_atom, cond_index)
+                rule.fire(next_atom, cond_index, queue.push)
+    print("%d relevant atoms" % relevant_atoms)
+    print("%d auxiliary atoms" % auxiliary_atoms)
+    print("%d final queue length" % len(queue))
+    print("%d total queue pushes" % queue.num_pushes)
+    return queue.get_model()
+
+if __name__ == "__main__":
+    import pddl_parser
+    import normalize
+    import pddl_to_prolog
+    import options
+
+    options.setup()
+
+    print("Parsing...")
+    task = pddl_parser.open()
+    print("Normalizing...")
+    normalize.normalize(task)
+    print("Writing rules...")
+    prog = pddl_to_prolog.translate(task)
+
+    model = compute_model(prog)
+    for atom in model:
+        print(atom)
+    print("%d atoms" % len(model))
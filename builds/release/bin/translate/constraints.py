@@ -0,0 +1,241 @@
+class NegativeClause:
+    # disjunction of inequalities
+    def __init__(self, parts):
+        self.parts = parts
+        assert len(parts)
+
+    def __str__(self):
+        disj = " or ".join(["(%s != %s)" % (v1, v2)
+                            for (v1, v2) in self.parts])
+        return "(%s)" % disj
+
+    def is_satisfiable(self):
+        for part in self.parts:
+            if part[0] != part[1]:
+                return True
+        return False
+
+    def apply_mapping(self, m):
+        new_parts = [(m.get(v1, v1), m.get(v2, v2)) for (v1, v2) in self.parts]
+        return NegativeClause(new_parts)
+
+
+class Assignment:
+    def __init__(self, equalities):
+        self.equalities = tuple(equalities)
+        # represents a conjunction of expressions ?x = ?y or ?x = d
+        # with ?x, ?y being variables and d being a domain value
+
+        self.consistent = None
+        self.mapping = None
+        self.eq_classes = None
+
+    def __str__(self):
+        conj = " and ".join(["(%s = %s)" % (v1, v2)
+                            for (v1, v2) in self.equalities])
+        return "(%s)" % conj
+
+    def _compute_equivalence_classes(self):
+        eq_classes = {}
+        for (v1, v2) in self.equalities:
+            c1 = eq_classes.setdefault(v1, {v1})
+            c2 = eq_classes.setdefault(v2, {v2})
+            if c1 is not c2:
+                if len(c2) > len(c1):
+                    v1, c1, v2, c2 = v2, c2, v1, c1
+                c1.update(c2)
+                for elem in c2:
+                    eq_classes[elem] = c1
+        self.eq_classes = eq_classes
+
+    def _compute_mapping(self):
+        if not self.eq_classes:
+            self._compute_equivalence_classes()
+
+        # create mapping: each key is mapped to the smallest
+        # element in its equivalence class (with objects being
+        # smaller than variables)
+        mapping = {}
+        for eq_class in self.eq_classes.values():
+            variables = [item for item in eq_class if item.startswith("?")]
+            constants = [item for item in eq_class if not item.startswith("?")]
+            if len(constants) >= 2:
+                self.consistent = False
+                self.mapping = None
+                return
+            if constants:
+                set_val = constants[0]
+            else:
+                set_val = min(variables)
+            for entry in eq_class:
+                mapping[entry] = set_val
+        self.consistent = True
+        self.mapping = mapping
+
+    def is_consistent(self):
+        if self.consistent is None:
+            self._compute_mapping()
+        return self.consistent
+
+    def get_mapping(self):
+        if self.consistent is None:
+            self._compute_mapping()
+        return self.mapping
+
+
+class ConstraintSystem:
+    def __init__(self):
+        self.combinatorial_assignments = []
+        self.neg_clauses = []
+
+    def __str__(self):
+        combinatorial_assignments = []
+        for comb_assignment in self.combinatorial_assignments:
+            disj = " or ".join([str(assig) for assig in comb_assignment])
+            disj = "(%s)" % disj
+            combinatorial_assignments.append(disj)
+        assigs = " and\n".join(combinatorial_assignments)
+
+        neg_clauses = [str(clause) for clause in self.neg_clauses]
+        neg_clauses = " and ".join(neg_clauses)
+        return assigs + "(" + neg_clauses + ")"
+
+    def add_assignment(self, assignment):
+        self.add_assignment_disjunction([assignment])
+
+    def add_assignment_disjunction(self, assignments):
+        self.combinatorial_assignments.append(assignments)
+
+    def add_negative_clause(self, negative_clause):
+        self.neg_clauses.append(negative_clause)
+
+    def combine(self, other):
+        """Combines two constraint systems to a new system"""
+        combined = ConstraintSystem()
+        combined.combinatorial_assignments = (self.combinatorial_assignments +
+                                              other.combinatorial_assignments)
+        combined.neg_clauses = self.neg_clauses + other.neg_clauses
+        return combined
+
+    def copy(self):
+        other = ConstraintSystem()
+        other.combinatorial_assignments = list(self.combinatorial_assignments)
+        other.neg_clauses = list(self.neg_clauses)
+        return other
+
+    def dump(self):
+        print("AssignmentSystem:")
+        for comb_assignment in self.combinatorial_assignments:
+            disj = " or ".join([str(assig) for assig in comb_assignment])
+            print("  ASS: ", disj)
+        for neg_clause in self.neg_clauses:
+            print("  NEG: ", str(neg_clause))
+
+    def is_solvable(self):
+        """Check whether the combinatorial assignments include at least
+           one consistent assignment under which the negative clauses
+           are satisfiable"""
+        # Instead of enumerating the Cartesian product of the
+        # disjunctions, we choose one assignment per disjunction in a
+        # depth-first search and extend the equivalence classes
+        # incrementally. Since adding equalities never makes an
+        # inconsistent assignment consistent or a violated negative
+        # clause satisfiable, we can backtrack as soon as this happens.
+        # Disjunctions with fewer alternatives are tried first.
+        disjunctions = sorted(self.combinatorial_assignments, key=len)
+        classes = _EquivalenceClasses()
+        if not self._negative_clauses_satisfiable(classes):
+            return False
+
+        def extend(depth):
+            if depth == len(disjunctions):
+                return True
+            for assignment in disjunctions[depth]:
+                checkpoint = classes.checkpoint()
+                if (classes.add_equalities(assignment.equalities) and
+                        self._negative_clauses_satisfiable(classes) and
+                        extend(depth + 1)):
+                    return True
+                classes.undo(checkpoint)
+            return False
+
+        return extend(0)
+
+    def _negative_clauses_satisfiable(self, classes):
+        for neg_clause in self.neg_clauses:
+            for (v1, v2) in neg_clause.parts:
+                if not classes.same_class(v1, v2):
+                    break
+            else:
+                return False
+        return True
+
+
+class _EquivalenceClasses:
+    """Union-find structure over variables and objects that supports
+    undoing the most recent unions. Each class may contain at most
+    one object (i.e., an item not starting with "?")."""
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.constant = {}
+        # Roots that have been attached to another root, most recent last.
+        self.trail = []
+
+    def find(self, item):
+        # No path compression, so that unions can be undone.
+        parent = self.parent
+        while item in parent:
+            item = parent[item]
+        return item
+
+    def same_class(self, item1, item2):
+        return item1 == item2 or self.find(item1) == self.find(item2)
+
+    def _get_constant(self, root):
+        if root in self.constant:
+            return self.constant[root]
+        if not root.startswith("?"):
+            return root
+        return None
+
+    def union(self, item1, item2):
+        """Merge the classes of the given items and return False if this
+        would put two different objects into the same class."""
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return True
+        const1 = self._get_constant(root1)
+        const2 = self._get_constant(root2)
+        if const1 is not None and const2 is not None:
+            return False
+        size1 = self.size.get(root1, 1)
+        size2 = self.size.get(root2, 1)
+        if size1 < size2:
+            root1, root2, size1, size2 = root2, root1, size2, size1
+            const1, const2 = const2, const1
+        self.parent[root2] = root1
+        self.size[root1] = size1 + size2
+        added_constant = const1 is None and const2 is not None
+        if added_constant:
+            self.constant[root1] = const2
+        self.trail.append((root1, root2, size1, added_constant))
+        return True
+
+    def add_equalities(self, equalities):
+        for (v1, v2) in equalities:
+            if not self.union(v1, v2):
+                return False
+        return True
+
+    def checkpoint(self):
+        return len(self.trail)
+
+    def undo(self, checkpoint):
+        while len(self.trail) > checkpoint:
+            root1, root2, old_size1, added_constant = self.trail.pop()
+            del self.parent[root2]
+            self.size[root1] = old_size1
+            if added_constant:
+                del self.constant[root1]
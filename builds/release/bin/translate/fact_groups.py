@@ -0,0 +1,173 @@
+import options
+import pddl
+import timers
+
+
+DEBUG = False
+
+
+def expand_group(group, task, reachable_facts):
+    result = []
+    for fact in group:
+        try:
+            pos = list(fact.args).index("?X")
+        except ValueError:
+            result.append(fact)
+        else:
+            # NOTE: This could be optimized by only trying objects of the correct
+            #       type, or by using a unifier which directly generates the
+            #       applicable objects. It is not worth optimizing this at this stage,
+            #       though.
+            for obj in task.objects:
+                newargs = list(fact.args)
+                newargs[pos] = obj.name
+                atom = pddl.Atom(fact.predicate, newargs)
+                if atom in reachable_facts:
+                    result.append(atom)
+    return result
+
+def instantiate_groups(groups, task, reachable_facts):
+    return [expand_group(group, task, reachable_facts) for group in groups]
+
+class GroupCoverQueue:
+    """Bucket queue for the greedy choice of covering groups.
+
+    Facts are mapped to integer IDs and groups are stored as
+    immutable tuples of fact IDs. Instead of removing covered facts
+    from all groups containing them, we mark them as covered and only
+    decrement the size counters of the affected groups. Buckets are
+    updated lazily: a group is only moved to the bucket of its
+    current size when it reaches the top of its old bucket. This
+    gives the same choices (including tie-breaking) as shrinking the
+    groups explicitly, but runs in time linear in the total size of
+    the groups."""
+    def __init__(self, groups):
+        self.facts = []
+        fact_ids = {}
+        self.groups = []
+        self.sizes = []
+        self.groups_by_fact = []
+        if groups:
+            for group in groups:
+                group_ids = []
+                for fact in group:
+                    fact_id = fact_ids.get(fact)
+                    if fact_id is None:
+                        fact_id = len(self.facts)
+                        fact_ids[fact] = fact_id
+                        self.facts.append(fact)
+                        self.groups_by_fact.append([])
+                    group_ids.append(fact_id)
+                # Remove duplicates.
+                group_ids = tuple(dict.fromkeys(group_ids))
+                group_no = len(self.groups)
+                self.groups.append(group_ids)
+                self.sizes.append(len(group_ids))
+                for fact_id in group_ids:
+                    self.groups_by_fact[fact_id].append(group_no)
+            self.covered = bytearray(len(self.facts))
+            self.max_size = max(self.sizes)
+            self.groups_by_size = [[] for i in range(self.max_size + 1)]
+            for group_no, size in enumerate(self.sizes):
+                self.groups_by_size[size].append(group_no)
+            self._update_top()
+        else:
+            self.max_size = 0
+    def __bool__(self):
+        return self.max_size > 1
+    __nonzero__ = __bool__
+    def pop(self):
+        covered = self.covered
+        result = [fact_id for fact_id in self.groups[self.top]
+                  if not covered[fact_id]]
+        if options.use_partial_encoding:
+            sizes = self.sizes
+            for fact_id in result:
+                covered[fact_id] = 1
+                for group_no in self.groups_by_fact[fact_id]:
+                    sizes[group_no] -= 1
+        self._update_top()
+        return [self.facts[fact_id] for fact_id in result]
+    def _update_top(self):
+        while self.max_size > 1:
+            max_list = self.groups_by_size[self.max_size]
+            while max_list:
+                candidate = max_list.pop()
+                size = self.sizes[candidate]
+                if size == self.max_size:
+                    self.top = candidate
+                    return
+                self.groups_by_size[size].append(candidate)
+            self.max_size -= 1
+
+def choose_groups(groups, reachable_facts):
+    queue = GroupCoverQueue(groups)
+    uncovered_facts = reachable_facts.copy()
+    result = []
+    while queue:
+        group = queue.pop()
+        uncovered_facts.difference_update(group)
+        result.append(group)
+    print(len(uncovered_facts), "uncovered facts")
+    result += [[fact] for fact in uncovered_facts]
+    return result
+
+def build_translation_key(groups):
+    group_keys = []
+    for group in groups:
+        group_key = [str(fact) for fact in group]
+        if len(group) == 1:
+            group_key.append(str(group[0].negate()))
+        else:
+            group_key.append("<none of those>")
+        group_keys.append(group_key)
+    return group_keys
+
+def collect_all_mutex_groups(groups, atoms):
+    # NOTE: This should be functionally identical to choose_groups
+    # when partial_encoding is set to False. Maybe a future
+    # refactoring could take that into account.
+    all_groups = list(groups)
+    uncovered_facts = atoms.difference(*groups)
+    all_groups += [[fact] for fact in uncovered_facts]
+    return all_groups
+
+def sort_groups(groups):
+    return sorted(sorted(group) for group in groups)
+
+def compute_groups(task, atoms, reachable_action_params,
+                   propositional_actions=None):
+    """If propositional_actions is given, the task is propositional
+    (see propositional.py) and the invariants are synthesized on these
+    ground actions instead of the lifted task."""
+    if options.invariant_generation_max_candidates == 0:
+        groups = []
+    elif propositional_actions is not None:
+        import propositional
+        groups = propositional.get_groups(task, atoms, propositional_actions)
+    else:
+        import invariant_finder
+        groups = invariant_finder.get_groups(task, reachable_action_params)
+
+    with timers.timing("Instantiating groups"):
+        groups = instantiate_groups(groups, task, atoms)
+
+    # Sort here already to get deterministic mutex groups.
+    groups = sort_groups(groups)
+    # TODO: I think that collect_all_mutex_groups should do the same thing
+    #       as choose_groups with partial_encoding=False, so these two should
+    #       be unified.
+    with timers.timing("Collecting mutex groups"):
+        mutex_groups = collect_all_mutex_groups(groups, atoms)
+    with timers.timing("Choosing groups", block=True):
+        groups = choose_groups(groups, atoms)
+    groups = sort_groups(groups)
+    with timers.timing("Building translation key"):
+        translation_key = build_translation_key(groups)
+
+    if DEBUG:
+        for group in groups:
+            if len(group) >= 2:
+                print("{%s}" % ", ".join(map(str, group)))
+
+    return groups, mutex_groups, translation_key
@@ -0,0 +1,42 @@
+#! /usr/bin/env python3
+
+
+import compact_graph
+
+
+class Graph:
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.neighbours = {u: set() for u in nodes}
+    def connect(self, u, v):
+        self.neighbours[u].add(v)
+        self.neighbours[v].add(u)
+    def connected_components(self):
+        # Since the graph is undirected, its connected components are
+        # the strongly connected components of the symmetric digraph.
+        nodes = list(self.neighbours)
+        node_to_index = {node: index for index, node in enumerate(nodes)}
+        graph = compact_graph.CompactGraph.from_adjacency_list(
+            [[node_to_index[v] for v in self.neighbours[u]] for u in nodes])
+        return sorted(sorted(nodes[index] for index in component)
+                      for component in graph.get_sccs())
+
+
+def transitive_closure(pairs):
+    nodes = list(dict.fromkeys(node for pair in pairs for node in pair))
+    node_to_index = {node: index for index, node in enumerate(nodes)}
+    graph = compact_graph.CompactGraph.from_arcs(
+        len(nodes), ((node_to_index[u], node_to_index[v]) for (u, v) in pairs))
+    closure = graph.get_transitive_closure()
+    result = [(nodes[u], nodes[v])
+              for u in range(len(nodes))
+              for v in compact_graph.get_nodes(closure[u])]
+    return sorted(result)
+
+
+if __name__ == "__main__":
+    g = Graph([1, 2, 3, 4, 5, 6])
+    g.connect(1, 2)
+    g.connect(1, 3)
+    g.connect(4, 5)
+    print(g.connected_components())
@@ -0,0 +1,44 @@
+__all__ = ["ParseError", "parse_nested_list"]
+
+class ParseError(Exception):
+    def __init__(self, value):
+        self.value = value
+    def __str__(self):
+        return self.value
+
+# Basic functions for parsing PDDL (Lisp) files.
+def parse_nested_list(input_file):
+    tokens = tokenize(input_file)
+    next_token = next(tokens)
+    if next_token != "(":
+        raise ParseError("Expected '(', got %s." % next_token)
+    result = list(parse_list_aux(tokens))
+    for tok in tokens:  # Check that generator is exhausted.
+        raise ParseError("Unexpected token: %s." % tok)
+    return result
+
+def tokenize(input):
+    for line in input:
+        line = line.split(";", 1)[0]  # Strip comments.
+        try:
+            line.encode("ascii")
+        except UnicodeEncodeError:
+            raise ParseError("Non-ASCII character outside comment: %s" %
+                             line[0:-1])
+        line = line.replace("(", " ( ").replace(")", " ) ").replace("?", " ?")
+        for token in line.split():
+            yield token.lower()
+
+def parse_list_aux(tokenstream):
+    # Leading "(" has already been swallowed.
+    while True:
+        try:
+            token = next(tokenstream)
+        except StopIteration:
+            raise ParseError("Missing ')'")
+        if token == ")":
+            return
+        elif token == "(":
+            yield list(parse_list_aux(tokenstream))
+        else:
+            yield token
@@ -0,0 +1,204 @@
+#! /usr/bin/env python3
+
+# Fast path for tasks that are already grounded, i.e., whose actions
+# and axioms have no parameters and no quantified variables after
+# normalization (typically machine-generated PDDL with 0-ary
+# predicates). For such tasks, the exploration rules are ground, so we
+# compute the relaxed reachable atoms by direct counter-based
+# propagation instead of building, normalizing and evaluating the
+# Datalog program, and we synthesize mutex groups with a ground
+# version of the invariant synthesis of invariant_finder.
+
+from collections import defaultdict, deque
+import time
+
+import instantiate
+import normalize
+import options
+import pddl
+import timers
+
+
+def is_propositional(task):
+    """Return True if the (normalized) task has no parameters and no
+    quantified variables in its actions, effects and axioms."""
+    for action in task.actions:
+        if (action.parameters or
+                isinstance(action.precondition, pddl.ExistentialCondition)):
+            return False
+        for effect in action.effects:
+            if (effect.parameters or
+                    isinstance(effect.condition, pddl.ExistentialCondition)):
+                return False
+    for axiom in task.axioms:
+        if (axiom.parameters or
+                isinstance(axiom.condition, pddl.ExistentialCondition)):
+            return False
+    return True
+
+
+def get_initial_facts(task):
+    # These are the facts of the Datalog program (see pddl_to_prolog).
+    yield from task.get_type_index().get_type_atoms()
+    for fact in task.init:
+        if isinstance(fact, pddl.Atom):
+            yield fact
+
+
+def compute_model(task):
+    """Return the list of atoms that are true in the minimal model of
+    the (ground) exploration rules of the task."""
+    rules = normalize.build_exploration_rules(task)
+    print("Generated %d ground rules." % len(rules))
+
+    # Each rule counts its unreached body atoms and fires when the
+    # counter drops to zero.
+    rules_by_body_atom = defaultdict(list)
+    unreached_counters = []
+    queue = list(get_initial_facts(task))
+    for rule_no, (conditions, effect) in enumerate(rules):
+        body_atoms = set(conditions)
+        unreached_counters.append(len(body_atoms))
+        for atom in body_atoms:
+            rules_by_body_atom[atom].append(rule_no)
+        if not body_atoms:
+            queue.append(effect)
+
+    model = []
+    reached = set()
+    queue.reverse()
+    while queue:
+        atom = queue.pop()
+        if atom in reached:
+            continue
+        reached.add(atom)
+        model.append(atom)
+        for rule_no in rules_by_body_atom.get(atom, ()):
+            unreached_counters[rule_no] -= 1
+            if not unreached_counters[rule_no]:
+                queue.append(rules[rule_no][1])
+    print("%d reachable atoms" % len(model))
+    return model
+
+
+def explore(task):
+    """Replacement for instantiate.explore for propositional tasks."""
+    with timers.timing("Computing propositional model"):
+        model = compute_model(task)
+    with timers.timing("Completing instantiation"):
+        return instantiate.instantiate(task, model)
+
+
+# Ground invariant synthesis. A candidate is a set of fluent atoms. It
+# is an invariant (at most one of its atoms is true in every reachable
+# state where at most one is true initially) if every action that may
+# make one of its atoms true also makes another one false. If an action
+# violates this, we try to fix the candidate by adding atoms deleted by
+# the action, as in invariant_finder.
+
+class GroundBalanceChecker:
+    def __init__(self, actions):
+        self.add_actions_by_atom = defaultdict(list)
+        for action in actions:
+            for atom in {atom for _, atom in action.add_effects}:
+                self.add_actions_by_atom[atom].append(action)
+
+    def get_threats(self, candidate):
+        threats = {}
+        for atom in candidate:
+            for action in self.add_actions_by_atom.get(atom, ()):
+                threats[id(action)] = action
+        return threats.values()
+
+    def is_balanced(self, candidate, action, enqueue_func):
+        precondition = set(action.precondition)
+        increasing_effects = []
+        for condition, atom in action.add_effects:
+            if atom not in candidate:
+                continue
+            lhs = precondition.union(condition)
+            if atom in lhs:
+                # The atom is already true, so the count does not change.
+                continue
+            increasing_effects.append((lhs, atom))
+
+        for (lhs1, atom1), (lhs2, atom2) in _pairs(increasing_effects):
+            if atom1 != atom2 and _is_consistent(lhs1 | lhs2):
+                # The action may make two atoms of the candidate true.
+                return False
+
+        added_atoms = {atom for _, atom in action.add_effects}
+        for lhs, atom in increasing_effects:
+            if not _is_consistent(lhs):
+                continue
+            for del_condition, del_atom in action.del_effects:
+                if (del_atom in candidate and del_atom != atom and
+                        del_atom not in added_atoms and
+                        del_atom in lhs and lhs.issuperset(del_condition)):
+                    break
+            else:
+                for _, del_atom in action.del_effects:
+                    if del_atom not in candidate:
+                        enqueue_func(candidate | {del_atom})
+                return False
+        return True
+
+
+def _pairs(items):
+    for pos, item1 in enumerate(items):
+        for item2 in items[pos + 1:]:
+            yield item1, item2
+
+
+def _is_consistent(literals):
+    return not any(literal.negate() in literals
+                   for literal in literals if not literal.negated)
+
+
+def find_invariants(actions):
+    limit = options.invariant_generation_max_candidates
+    initial_atoms = sorted({atom for action in actions
+                            for _, atom in action.add_effects})
+    candidates = deque(frozenset([atom]) for atom in initial_atoms[:limit])
+    print(len(candidates), "initial candidates")
+    seen_candidates = set(candidates)
+    balance_checker = GroundBalanceChecker(actions)
+
+    def enqueue_func(candidate):
+        if len(seen_candidates) < limit and candidate not in seen_candidates:
+            candidates.append(candidate)
+            seen_candidates.add(candidate)
+
+    start_time = time.process_time()
+    while candidates:
+        candidate = candidates.popleft()
+        if time.process_time() - start_time > options.invariant_generation_max_time:
+            print("Time limit reached, aborting invariant generation")
+            return
+        if all(balance_checker.is_balanced(candidate, action, enqueue_func)
+               for action in balance_checker.get_threats(candidate)):
+            yield candidate
+
+
+def get_groups(task, atoms, actions):
+    """Return the mutex groups of the propositional task: the ground
+    invariants with exactly one initially true atom, restricted to the
+    reachable atoms."""
+    init = {fact for fact in task.init if isinstance(fact, pddl.Atom)}
+    with timers.timing("Finding ground invariants", block=True):
+        invariants = list(find_invariants(actions))
+    with timers.timing("Checking invariant weight"):
+        groups = set()
+        for invariant in invariants:
+            if sum(1 for atom in invariant if atom in init) == 1:
+                groups.add(tuple(sorted(atom for atom in invariant
+                                        if atom in atoms)))
+    return [list(group) for group in sorted(groups)]
+
+
+if __name__ == "__main__":
+    import pddl_parser
+    options.setup()
+    task = pddl_parser.open()
+    normalize.normalize(task)
+    print("propositional: %s" % is_propositional(task))
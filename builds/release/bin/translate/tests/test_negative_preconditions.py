@@ -0,0 +1,94 @@
+import subprocess
+import sys
+
+from .test_propositional import TRANSLATE_DIR
+
+
+# The finish action has two negative preconditions on three-valued
+# variables, so multiplying them out yields 3 * 3 = 9 conditions (the
+# third value is "none of those").
+DOMAIN = """
+(define (domain moving)
+  (:predicates (at ?l) (pos ?l) (done))
+  (:action move
+    :parameters (?from ?to)
+    :precondition (at ?from)
+    :effect (and (at ?to) (not (at ?from))))
+  (:action push
+    :parameters (?from ?to)
+    :precondition (pos ?from)
+    :effect (and (pos ?to) (not (pos ?from))))
+  (:action finish
+    :precondition (and (not (at a)) (not (pos a)))
+    :effect (done)))
+"""
+
+PROBLEM = """
+(define (problem moving-1)
+  (:domain moving)
+  (:objects a b c)
+  (:init (at a) (pos a))
+  (:goal (done)))
+"""
+
+
+def translate(tmp_path, *options):
+    domain = tmp_path / "domain.pddl"
+    problem = tmp_path / "problem.pddl"
+    sas_file = tmp_path / "output.sas"
+    domain.write_text(DOMAIN)
+    problem.write_text(PROBLEM)
+    cmd = [sys.executable, "translate.py", str(domain), str(problem),
+           "--sas-file", str(sas_file)] + list(options)
+    output = subprocess.check_output(cmd, cwd=TRANSLATE_DIR, text=True)
+    return output, sas_file.read_text().splitlines()
+
+
+def get_sections(lines, name):
+    sections = []
+    for pos, line in enumerate(lines):
+        if line == "begin_%s" % name:
+            end = lines.index("end_%s" % name, pos)
+            sections.append(lines[pos + 1:end])
+    return sections
+
+
+def test_negative_preconditions_multiplied_out(tmp_path):
+    output, lines = translate(tmp_path)
+    assert "2 negative preconditions multiplied out" in output
+    assert "0 negative preconditions compiled into derived variables" in output
+    assert not get_sections(lines, "rule")
+
+
+def test_negative_preconditions_above_expansion_limit(tmp_path):
+    output, lines = translate(
+        tmp_path, "--negative-precondition-expansion-limit", "3")
+    assert "1 negative preconditions multiplied out" in output
+    assert "1 negative preconditions compiled into derived variables" in output
+
+    variables = get_sections(lines, "variable")
+    [aux_var] = [var for var, (name, layer, size, *values)
+                 in enumerate(variables)
+                 if values[0].startswith("Atom @negative-precondition-")]
+    name, layer, size, *values = variables[aux_var]
+    assert layer == "0"
+    assert size == "2"
+    [init] = get_sections(lines, "state")
+    assert init[aux_var] == "1"
+
+    # The auxiliary variable is derived to be true (value 0) iff the
+    # variable for "at" has one of the values other than "at(a)". The
+    # "none of those" value is unreachable, so its axiom is removed.
+    [at_var] = [var for var, (name, layer, size, *values)
+                in enumerate(variables) if values[0] == "Atom at(a)"]
+    rules = get_sections(lines, "rule")
+    assert sorted(rules) == [
+        ["1", "%d %d" % (at_var, val), "%d 1 0" % aux_var]
+        for val in [1, 2]]
+
+    # The other negative precondition is still multiplied out.
+    finish_ops = [op for op in get_sections(lines, "operator")
+                  if op[0].strip() == "finish"]
+    assert len(finish_ops) == 2
+    for op in finish_ops:
+        assert "%d 0" % aux_var in op[2:2 + int(op[1])]
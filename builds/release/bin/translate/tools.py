@@ -0,0 +1,44 @@
+def cartesian_product(sequences):
+    # TODO: Rename this. It's not good that we have two functions
+    # called "product" and "cartesian_product", of which "product"
+    # computes cartesian products, while "cartesian_product" does not.
+
+    # This isn't actually a proper cartesian product because we
+    # concatenate lists, rather than forming sequences of atomic elements.
+    # We could probably also use something like
+    # map(itertools.chain, product(*sequences))
+    # but that does not produce the same results
+    if not sequences:
+        yield []
+    else:
+        temp = list(cartesian_product(sequences[1:]))
+        for item in sequences[0]:
+            for sequence in temp:
+                yield item + sequence
+
+
+def _read_proc_status(key, description):
+    """Return the value of *key* (e.g. "VmPeak") in /proc/self/status in
+    KB. Raise a Warning mentioning *description* if it is not available."""
+    try:
+        # This will only work on Linux systems.
+        with open("/proc/self/status") as status_file:
+            for line in status_file:
+                parts = line.split()
+                if parts[0] == key + ":":
+                    return int(parts[1])
+    except OSError:
+        pass
+    raise Warning("warning: could not determine %s" % description)
+
+
+def get_peak_memory_in_kb():
+    return _read_proc_status("VmPeak", "peak memory")
+
+
+def get_memory_in_kb():
+    return _read_proc_status("VmRSS", "memory usage")
+
+
+def get_address_space_in_kb():
+    return _read_proc_status("VmSize", "address space")
@@ -144,13 +144,21 @@ ALIASES["seq-opt-lmcut"] = [
     "--search", "astar(lmcut())"]
 
 
-PORTFOLIOS = {}
-for portfolio in os.listdir(PORTFOLIO_DIR):
-    if portfolio == "__pycache__":
-        continue
-    name, ext = os.path.splitext(portfolio)
-    assert ext == ".py", portfolio
-    PORTFOLIOS[name.replace("_", "-")] = os.path.join(PORTFOLIO_DIR, portfolio)
+# This table is kept in sync with the files in PORTFOLIO_DIR by
+# driver/tests.py. We do not list the directory here because this module
+# is imported for every call that uses an alias.
+PORTFOLIOS = {
+    name: os.path.join(PORTFOLIO_DIR, name.replace("-", "_") + ".py")
+    for name in [
+        "seq-opt-fdss-1",
+        "seq-opt-fdss-2",
+        "seq-opt-merge-and-shrink",
+        "seq-sat-fdss-1",
+        "seq-sat-fdss-2",
+        "seq-sat-fdss-2014",
+        "seq-sat-fdss-2018",
+    ]
+}
 
 
 def show_aliases():
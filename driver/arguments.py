@@ -3,7 +3,6 @@ import os.path
 import re
 import sys
 
-from . import aliases
 from . import returncodes
 from . import util
 
@@ -47,8 +46,11 @@ Portfolios require that a time limit is in effect. Portfolio configurations
 that exceed their time or memory limit are aborted, and the next
 configuration is run."""
 
+# We avoid importing the aliases module here because it is only needed
+# if an alias is used.
 EXAMPLE_PORTFOLIO = os.path.relpath(
-    aliases.PORTFOLIOS["seq-opt-fdss-1"], start=util.REPO_ROOT_DIR)
+    os.path.join(util.DRIVER_DIR, "portfolios", "seq_opt_fdss_1.py"),
+    start=util.REPO_ROOT_DIR)
 
 EXAMPLES = [
     ("Translate and find a plan with A* + LM-Cut:",
@@ -268,6 +270,10 @@ def _set_translator_output_options(parser, args):
             parser, "Cannot pass the \"--sas-file\" option to translate.py from the "
                     "fast-downward.py script. Pass it directly to fast-downward.py instead.")
 
+    if args.stream_sas:
+        # The output file is set up when running the translator.
+        args.search_input = None
+        return
     args.search_input = args.sas_file
     args.translate_options += ["--sas-file", args.search_input]
 
@@ -364,6 +370,13 @@ def parse_args():
     for component in COMPONENTS_PLUS_OVERALL:
         limits.add_argument("--{}-time-limit".format(component))
         limits.add_argument("--{}-memory-limit".format(component))
+    limits.add_argument(
+        "--limits-backend", choices=["rlimit", "monitor"], default="rlimit",
+        help="how to enforce limits: \"rlimit\" limits CPU time and "
+            "virtual memory with setrlimit; \"monitor\" limits wall-clock "
+            "time and resident memory (RSS) by monitoring the components, "
+            "using a cgroup for the memory limit if possible, and reports "
+            "their peak RSS (Linux only; default: %(default)s)")
 
     driver_other = parser.add_argument_group(
         title="other driver options")
@@ -402,6 +415,13 @@ def parse_args():
         "--keep-sas-file", action="store_true",
         help="keep translator output file (implied by --sas-file, default: "
             "delete file if translator and search component are active)")
+    driver_other.add_argument(
+        "--stream-sas", action="store_true",
+        help="pass the translator output to the search component through a "
+            "pipe instead of an intermediate file, so that both run "
+            "concurrently (needs translate and search component; cannot be "
+            "combined with --sas-file, --keep-sas-file or portfolios; "
+            "not supported on Windows)")
 
     driver_other.add_argument(
         "--portfolio", metavar="FILE",
@@ -412,6 +432,16 @@ def parse_args():
     driver_other.add_argument(
         "--portfolio-single-plan", action="store_true",
         help="abort satisficing portfolio after finding the first plan")
+    driver_other.add_argument(
+        "--portfolio-history", metavar="FILE", default=None,
+        help="schedule portfolio configurations adaptively based on the "
+            "per-domain run statistics in FILE and add the results of this "
+            "run to it (FILE is created if it does not exist)")
+
+    driver_other.add_argument(
+        "--resource-usage-file", metavar="FILE", default=None,
+        help="write the resource usage of all component runs (including "
+            "each portfolio configuration) to FILE in JSON format")
 
     driver_other.add_argument(
         "--cleanup", action="store_true",
@@ -430,6 +460,15 @@ def parse_args():
 
     args = parser.parse_args()
 
+    if args.stream_sas:
+        if os.name == "nt":
+            print_usage_and_exit_with_driver_input_error(
+                parser, "--stream-sas is not supported on Windows.")
+        if args.sas_file or args.keep_sas_file:
+            print_usage_and_exit_with_driver_input_error(
+                parser, "--stream-sas cannot be combined with --sas-file "
+                        "or --keep-sas-file.")
+
     if args.sas_file:
         args.keep_sas_file = True
     else:
@@ -457,6 +496,7 @@ def parse_args():
     _convert_limits_to_ints(parser, args)
 
     if args.alias:
+        from . import aliases
         try:
             aliases.set_options_for_alias(args.alias, args)
         except KeyError:
@@ -472,10 +512,20 @@ def parse_args():
     if args.portfolio_single_plan and not args.portfolio:
         print_usage_and_exit_with_driver_input_error(
             parser, "--portfolio-single-plan may only be used for portfolios.")
+    if args.portfolio_history and not args.portfolio:
+        print_usage_and_exit_with_driver_input_error(
+            parser, "--portfolio-history may only be used for portfolios.")
+    if args.stream_sas and args.portfolio:
+        print_usage_and_exit_with_driver_input_error(
+            parser, "--stream-sas cannot be used with portfolios.")
 
     if not args.version and not args.show_aliases and not args.cleanup:
         _set_components_and_inputs(parser, args)
         if "translate" not in args.components or "search" not in args.components:
+            if args.stream_sas:
+                print_usage_and_exit_with_driver_input_error(
+                    parser, "--stream-sas needs the translate and search "
+                            "component.")
             args.keep_sas_file = True
 
     return args
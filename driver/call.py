@@ -1,5 +1,6 @@
 """Make subprocess calls with time and memory limits."""
 
+from . import exec_with_limits
 from . import limits
 from . import returncodes
 
@@ -8,6 +9,7 @@ import os
 import shlex
 import subprocess
 import sys
+import time
 
 
 def print_call_settings(nick, cmd, stdin, time_limit, memory_limit):
@@ -22,49 +24,98 @@ def print_call_settings(nick, cmd, stdin, time_limit, memory_limit):
     logging.info("{} command line string: {}".format(nick, " ".join(escaped_cmd)))
 
 
-def _get_preexec_function(time_limit, memory_limit):
-    def set_limits():
-        def _try_or_exit(function, description):
-            def fail(exception, exitcode):
-                returncodes.print_stderr("{} failed: {}".format(description, exception))
-                os._exit(exitcode)
-            try:
-                function()
-            except NotImplementedError as err:
-                fail(err, returncodes.DRIVER_UNSUPPORTED)
-            except OSError as err:
-                fail(err, returncodes.DRIVER_CRITICAL_ERROR)
-            except ValueError as err:
-                fail(err, returncodes.DRIVER_INPUT_ERROR)
-
-        _try_or_exit(lambda: limits.set_time_limit(time_limit), "Setting time limit")
-        _try_or_exit(lambda: limits.set_memory_limit(memory_limit), "Setting memory limit")
-
-    if time_limit is None and memory_limit is None:
-        return None
+def _start(nick, cmd, time_limit, memory_limit, **kwargs):
+    if limits.get_backend() == "monitor":
+        from . import monitor
+        process = monitor.MonitoredProcess(
+            nick, cmd, time_limit, memory_limit, **kwargs)
     else:
-        return set_limits
-
-
-def check_call(nick, cmd, stdin=None, time_limit=None, memory_limit=None):
+        process = subprocess.Popen(
+            exec_with_limits.get_command(cmd, time_limit, memory_limit, None),
+            **kwargs)
+        process.nick = nick
+        process.cmd = cmd
+        process.start_time = time.monotonic()
+    return process
+
+
+def _get_exitcode(status):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def wait(process, config=None):
+    """Wait for a process started by this module to terminate, record
+    its resource usage (see resource_usage) and return its exit code.
+    *config* is the position of the configuration if the process runs
+    a portfolio configuration."""
+    rusage = None
+    if hasattr(os, "wait4") and process.returncode is None:
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            # The process has already been reaped (e.g., by Popen.poll).
+            pass
+        else:
+            process.returncode = _get_exitcode(status)
+    # Popen.wait returns immediately if we reaped the process above. We
+    # still call it to let MonitoredProcess adjust the exit code.
+    returncode = process.wait()
+    from . import resource_usage
+    resource_usage.record(
+        process.nick, process.cmd, returncode,
+        time.monotonic() - process.start_time, rusage, config)
+    return returncode
+
+
+def _check_call(nick, cmd, time_limit, memory_limit, config=None, **kwargs):
+    with _start(nick, cmd, time_limit, memory_limit, **kwargs) as process:
+        returncode = wait(process, config)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return 0
+
+
+def check_call(nick, cmd, stdin=None, time_limit=None, memory_limit=None,
+               config=None):
     print_call_settings(nick, cmd, stdin, time_limit, memory_limit)
 
-    kwargs = {"preexec_fn": _get_preexec_function(time_limit, memory_limit)}
-
     sys.stdout.flush()
     if stdin:
         with open(stdin) as stdin_file:
-            return subprocess.check_call(cmd, stdin=stdin_file, **kwargs)
+            return _check_call(
+                nick, cmd, time_limit, memory_limit, config, stdin=stdin_file)
     else:
-        return subprocess.check_call(cmd, **kwargs)
+        return _check_call(nick, cmd, time_limit, memory_limit, config)
 
 
-def get_error_output_and_returncode(nick, cmd, time_limit=None, memory_limit=None):
+def start_process(nick, cmd, stdin=None, time_limit=None, memory_limit=None,
+                  **kwargs):
+    """Start *cmd* with the given limits without waiting for it.
+
+    *stdin* can be a filename as for check_call or anything accepted by
+    subprocess.Popen (e.g. a file descriptor). Further keyword
+    arguments are passed on to subprocess.Popen. Use wait to wait for
+    the process."""
+    if isinstance(stdin, str):
+        print_call_settings(nick, cmd, stdin, time_limit, memory_limit)
+        sys.stdout.flush()
+        with open(stdin) as stdin_file:
+            return _start(nick, cmd, time_limit, memory_limit,
+                          stdin=stdin_file, **kwargs)
+
     print_call_settings(nick, cmd, None, time_limit, memory_limit)
 
-    preexec_fn = _get_preexec_function(time_limit, memory_limit)
+    sys.stdout.flush()
+    return _start(nick, cmd, time_limit, memory_limit, stdin=stdin, **kwargs)
+
+
+def get_error_output_and_returncode(nick, cmd, time_limit=None, memory_limit=None):
+    print_call_settings(nick, cmd, None, time_limit, memory_limit)
 
     sys.stdout.flush()
-    p = subprocess.Popen(cmd, preexec_fn=preexec_fn, stderr=subprocess.PIPE)
-    (stdout, stderr) = p.communicate()
-    return stderr, p.returncode
+    p = _start(nick, cmd, time_limit, memory_limit, stderr=subprocess.PIPE)
+    with p.stderr:
+        stderr = p.stderr.read()
+    return stderr, wait(p)
@@ -0,0 +1,83 @@
+"""Apply resource limits to this process and replace it by a command.
+
+Usage: exec_with_limits.py TIME_LIMIT MEMORY_LIMIT CGROUP CMD [ARG ...]
+
+TIME_LIMIT (in seconds) and MEMORY_LIMIT (in bytes) are set with
+setrlimit (see limits.py). If CGROUP (a cgroup directory) is given, the
+process moves into it first. Unused arguments are given as "-".
+
+The driver starts components through this script instead of passing a
+preexec_fn to subprocess.Popen: preexec_fn is not safe to use while the
+driver runs other threads, such as the monitor threads of running
+components (see monitor.py) or the plan watcher (see plan_manager.py).
+Since the process is replaced by the command, the component keeps the
+pid, stdin and stdout of this process.
+"""
+
+import errno
+import os
+import sys
+
+
+NO_VALUE = "-"
+
+
+def get_command(cmd, time_limit, memory_limit, cgroup):
+    """Return a command line that runs *cmd* with the given limits, or
+    *cmd* itself if there is nothing to set up."""
+    if time_limit is None and memory_limit is None and cgroup is None:
+        return cmd
+    # Report a missing executable to the caller as Popen would. We import
+    # shutil here to keep the startup of this script fast.
+    import shutil
+    if shutil.which(cmd[0]) is None:
+        raise FileNotFoundError(
+            errno.ENOENT, os.strerror(errno.ENOENT), cmd[0])
+    args = [NO_VALUE if value is None else str(value)
+            for value in [time_limit, memory_limit, cgroup]]
+    return [sys.executable, "-S", "-E", os.path.abspath(__file__)] + args + cmd
+
+
+def _try_or_exit(function, description):
+    def fail(exception, exitcode):
+        returncodes.print_stderr("{} failed: {}".format(description, exception))
+        os._exit(exitcode)
+    try:
+        function()
+    except NotImplementedError as err:
+        fail(err, returncodes.DRIVER_UNSUPPORTED)
+    except OSError as err:
+        fail(err, returncodes.DRIVER_CRITICAL_ERROR)
+    except ValueError as err:
+        fail(err, returncodes.DRIVER_INPUT_ERROR)
+
+
+def _parse(value, convert):
+    return None if value == NO_VALUE else convert(value)
+
+
+def _attach_to_cgroup(cgroup):
+    with open(os.path.join(cgroup, "cgroup.procs"), "w") as procs:
+        procs.write(str(os.getpid()))
+
+
+def main():
+    time_limit, memory_limit, cgroup = sys.argv[1:4]
+    cmd = sys.argv[4:]
+    time_limit = _parse(time_limit, float)
+    memory_limit = _parse(memory_limit, int)
+    cgroup = _parse(cgroup, str)
+    if cgroup is not None:
+        _try_or_exit(lambda: _attach_to_cgroup(cgroup), "Moving into cgroup")
+    _try_or_exit(lambda: limits.set_time_limit(time_limit), "Setting time limit")
+    _try_or_exit(lambda: limits.set_memory_limit(memory_limit), "Setting memory limit")
+    _try_or_exit(lambda: os.execvp(cmd[0], cmd), "Starting {}".format(cmd[0]))
+
+
+if __name__ == "__main__":
+    # The script runs as "python -S -E exec_with_limits.py ...", so the
+    # repository root is not on the module search path yet.
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    from driver import limits
+    from driver import returncodes
+    main()
@@ -1,9 +1,10 @@
-import logging
+import math
 try:
     import resource
 except ImportError:
     resource = None
 import sys
+import time
 
 from . import returncodes
 from . import util
@@ -19,6 +20,24 @@ memory limits there.
 CANNOT_LIMIT_MEMORY_MSG = "Setting memory limits is not supported on your platform."
 CANNOT_LIMIT_TIME_MSG = "Setting time limits is not supported on your platform."
 
+BACKENDS = ["rlimit", "monitor"]
+
+# The "rlimit" backend limits the CPU time and virtual memory of each
+# component with setrlimit. The "monitor" backend limits wall-clock time
+# and resident memory by monitoring the components (see monitor.py).
+_backend = "rlimit"
+_start_time = time.monotonic()
+
+
+def set_backend(backend):
+    global _backend
+    assert backend in BACKENDS, backend
+    _backend = backend
+
+
+def get_backend():
+    return _backend
+
 
 def can_set_time_limit():
     return resource is not None
@@ -33,6 +52,9 @@ def set_time_limit(time_limit):
         return
     if not can_set_time_limit():
         raise NotImplementedError(CANNOT_LIMIT_TIME_MSG)
+    # Resource limits must be integers, but limits derived from the
+    # overall time limit or portfolio time shares can be fractional.
+    time_limit = int(math.ceil(time_limit))
     # Reaching the soft time limit leads to a (catchable) SIGXCPU signal,
     # which we catch to gracefully exit. Reaching the hard limit leads to
     # a SIGKILL, which is unpreventable. We set a hard limit one second
@@ -48,6 +70,26 @@ def set_time_limit(time_limit):
         resource.setrlimit(resource.RLIMIT_CPU, (time_limit, time_limit))
 
 
+def can_change_time_limit_of_running_process():
+    return resource is not None and hasattr(resource, "prlimit")
+
+
+def lower_time_limit_of_running_process(pid, time_limit):
+    """Lower the CPU time limit of the running process *pid* to
+    *time_limit* seconds (counting the CPU time it has used so far).
+    This is only supported on Linux."""
+    if not can_change_time_limit_of_running_process():
+        raise NotImplementedError(CANNOT_LIMIT_TIME_MSG)
+    time_limit = int(math.ceil(time_limit))
+    soft, hard = resource.prlimit(pid, resource.RLIMIT_CPU)
+    if soft != resource.RLIM_INFINITY and soft <= time_limit:
+        return
+    new_hard = time_limit + 1
+    if hard != resource.RLIM_INFINITY:
+        new_hard = min(new_hard, hard)
+    resource.prlimit(pid, resource.RLIMIT_CPU, (time_limit, new_hard))
+
+
 def set_memory_limit(memory):
     """*memory* must be given in bytes or None."""
     if memory is None:
@@ -69,6 +111,18 @@ def get_memory_limit(component_limit, overall_limit):
     return min(limits) if limits else None
 
 
+def get_elapsed_time():
+    """
+    Return the time that counts against the time limits of the current
+    backend: the wall-clock time since the driver started for the monitor
+    backend and the CPU time of the driver and its child processes
+    otherwise.
+    """
+    if _backend == "monitor":
+        return time.monotonic() - _start_time
+    return util.get_elapsed_time()
+
+
 def get_time_limit(component_limit, overall_limit):
     """
     Return the minimum time limit imposed by the component and overall limits.
@@ -76,7 +130,7 @@ def get_time_limit(component_limit, overall_limit):
     limit = component_limit
     if overall_limit is not None:
         try:
-            elapsed_time = util.get_elapsed_time()
+            elapsed_time = get_elapsed_time()
         except NotImplementedError:
             returncodes.exit_with_driver_unsupported_error(CANNOT_LIMIT_TIME_MSG)
         else:
@@ -87,6 +141,9 @@ def get_time_limit(component_limit, overall_limit):
 
 
 def print_limits(nick, time_limit, memory_limit):
+    # Imported here because exec_with_limits.py uses this module and
+    # should start quickly.
+    import logging
     if time_limit is not None:
         time_limit = str(time_limit) + "s"
     logging.info("{} time limit: {}".format(nick, time_limit))
@@ -2,14 +2,16 @@ import logging
 import os
 import sys
 
-from . import aliases
 from . import arguments
-from . import cleanup
 from . import limits
-from . import run_components
+from . import returncodes
 from . import util
 from . import __version__
 
+# The driver is often called many times in a row, so we import modules
+# that are only needed for some calls (aliases, cleanup, monitor,
+# resource_usage, run_components) when they are needed.
+
 
 def main():
     args = arguments.parse_args()
@@ -23,35 +25,58 @@ def main():
         sys.exit()
 
     if args.show_aliases:
+        from . import aliases
         aliases.show_aliases()
         sys.exit()
 
     if args.cleanup:
+        from . import cleanup
         cleanup.cleanup_temporary_files(args)
         sys.exit()
 
+    if args.limits_backend == "monitor":
+        from . import monitor
+        if not monitor.is_supported():
+            returncodes.exit_with_driver_unsupported_error(
+                "The monitor backend for limits is only supported on Linux.")
+    limits.set_backend(args.limits_backend)
     limits.print_limits("planner", args.overall_time_limit, args.overall_memory_limit)
     print()
 
+    from . import resource_usage
+    from . import run_components
+
     exitcode = None
     for component in args.components:
         if component == "translate":
-            (exitcode, continue_execution) = run_components.run_translate(args)
+            if args.stream_sas:
+                results = run_components.run_translate_and_search_streamed(args)
+            else:
+                results = [
+                    ("translate",) + run_components.run_translate(args)]
         elif component == "search":
-            (exitcode, continue_execution) = run_components.run_search(args)
+            if args.stream_sas:
+                # The search already ran together with the translator.
+                continue
+            results = [("search",) + run_components.run_search(args)]
             if not args.keep_sas_file:
                 print("Remove intermediate file {}".format(args.sas_file))
                 os.remove(args.sas_file)
         elif component == "validate":
-            (exitcode, continue_execution) = run_components.run_validate(args)
+            results = [("validate",) + run_components.run_validate(args)]
         else:
             assert False, "Error: unhandled component: {}".format(component)
-        print("{component} exit code: {exitcode}".format(**locals()))
-        print()
+        for component, exitcode, continue_execution in results:
+            print("{component} exit code: {exitcode}".format(**locals()))
+            print()
         if not continue_execution:
             print("Driver aborting after {}".format(component))
             break
 
+    resource_usage.print_summary()
+    if args.resource_usage_file:
+        resource_usage.write_json(args.resource_usage_file)
+
     try:
         logging.info(f"Planner time: {util.get_elapsed_time():.2f}s")
     except NotImplementedError:
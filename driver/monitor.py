@@ -0,0 +1,269 @@
+"""Enforce limits of planner components by monitoring them from the driver.
+
+This is the "monitor" backend for limits (see --limits-backend). In
+contrast to the default "rlimit" backend, which limits the CPU time and
+the virtual memory (address space) of each component with setrlimit,
+it limits the wall-clock time and the resident set size (RSS):
+
+- When a component exceeds its limit, it receives SIGTERM and, if it is
+  still running GRACE_PERIOD seconds later, SIGKILL. The exit code is
+  then set to the out-of-time or out-of-memory exit code of the component.
+- If the driver may create a cgroup (v2) with the memory controller
+  below its own cgroup, each component runs in its own cgroup whose
+  memory.max is set to the memory limit. Otherwise, the driver polls
+  the RSS from /proc/<pid>/status.
+
+The peak RSS of each component is reported in the log. The backend is
+only supported on Linux.
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from . import exec_with_limits
+from . import limits
+from . import returncodes
+
+
+POLL_INTERVAL = 0.1
+GRACE_PERIOD = 1
+
+LIMIT_EXITCODES = {
+    ("translator", "time"): returncodes.TRANSLATE_OUT_OF_TIME,
+    ("translator", "memory"): returncodes.TRANSLATE_OUT_OF_MEMORY,
+    ("search", "time"): returncodes.SEARCH_OUT_OF_TIME,
+    ("search", "memory"): returncodes.SEARCH_OUT_OF_MEMORY,
+}
+
+
+def is_supported():
+    return sys.platform.startswith("linux")
+
+
+def _read_status_kb(pid, key):
+    try:
+        with open("/proc/{}/status".format(pid)) as status_file:
+            for line in status_file:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _get_own_cgroup_dir():
+    mount_point = None
+    with open("/proc/self/mounts") as mounts:
+        for line in mounts:
+            fields = line.split()
+            if len(fields) >= 3 and fields[2] == "cgroup2":
+                mount_point = fields[1]
+                break
+    if mount_point is None:
+        return None
+    with open("/proc/self/cgroup") as cgroups:
+        for line in cgroups:
+            if line.startswith("0::"):
+                return os.path.join(mount_point, line[3:].strip().lstrip("/"))
+    return None
+
+
+class CGroup:
+    """A cgroup (v2) with a memory limit for a single component."""
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def create(cls, nick, memory_limit):
+        """Return a new cgroup or None if we cannot create one with the
+        memory controller."""
+        try:
+            parent = _get_own_cgroup_dir()
+            if parent is None:
+                return None
+            path = os.path.join(parent, "fast-downward-{}-{}".format(
+                os.getpid(), nick))
+            os.mkdir(path)
+        except OSError:
+            return None
+        cgroup = cls(path)
+        try:
+            with open(cgroup._get_file("cgroup.controllers")) as f:
+                if "memory" not in f.read().split():
+                    raise OSError("memory controller not available")
+            if memory_limit is not None:
+                cgroup._write("memory.max", str(memory_limit))
+                if os.path.exists(cgroup._get_file("memory.swap.max")):
+                    cgroup._write("memory.swap.max", "0")
+        except OSError:
+            cgroup.remove()
+            return None
+        return cgroup
+
+    def _get_file(self, name):
+        return os.path.join(self.path, name)
+
+    def _write(self, name, value):
+        with open(self._get_file(name), "w") as f:
+            f.write(value)
+
+    def _read_int(self, name):
+        try:
+            with open(self._get_file(name)) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def get_memory_usage(self):
+        return self._read_int("memory.current")
+
+    def get_peak_memory_usage(self):
+        # memory.peak is only available on Linux >= 5.19.
+        return self._read_int("memory.peak")
+
+    def was_oom_killed(self):
+        try:
+            with open(self._get_file("memory.events")) as f:
+                for line in f:
+                    key, value = line.split()
+                    if key == "oom_kill":
+                        return int(value) > 0
+        except (OSError, ValueError):
+            pass
+        return False
+
+    def remove(self):
+        try:
+            os.rmdir(self.path)
+        except OSError:
+            pass
+
+
+class MonitoredProcess(subprocess.Popen):
+    """A subprocess.Popen whose wall-clock time and memory usage are
+    limited by a monitoring thread.
+
+    When the process terminates, returncode is set to the out-of-time or
+    out-of-memory exit code of the component if the monitor stopped it."""
+    def __init__(self, nick, cmd, time_limit, memory_limit, **kwargs):
+        self.nick = nick
+        self.cmd = cmd
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.exceeded_limit = None
+        self.peak_memory = 0
+        self._finished = False
+        self._stop_monitoring = threading.Event()
+        self.cgroup = CGroup.create(nick, memory_limit)
+        if self.cgroup:
+            logging.info("{} memory limit enforced by cgroup {}".format(
+                nick, self.cgroup.path))
+        self.start_time = time.monotonic()
+        try:
+            if self.cgroup:
+                # The component moves into the cgroup before it starts.
+                cmd = exec_with_limits.get_command(
+                    cmd, None, None, self.cgroup.path)
+            super().__init__(cmd, **kwargs)
+        except Exception:
+            if self.cgroup:
+                self.cgroup.remove()
+            raise
+        self._monitor = threading.Thread(target=self._run_monitor, daemon=True)
+        self._monitor.start()
+
+    def _get_memory_usage(self):
+        if self.cgroup:
+            return self.cgroup.get_memory_usage()
+        rss = _read_status_kb(self.pid, "VmRSS")
+        return None if rss is None else rss * 1024
+
+    def _update_peak_memory(self, memory):
+        if self.cgroup:
+            peak = self.cgroup.get_peak_memory_usage()
+        else:
+            peak = _read_status_kb(self.pid, "VmHWM")
+            if peak is not None:
+                peak *= 1024
+        self.peak_memory = max(self.peak_memory, peak or 0, memory or 0)
+
+    def _stop(self, limit):
+        self.exceeded_limit = limit
+        logging.info("{} exceeded {} limit, sending SIGTERM".format(
+            self.nick, limit))
+        self._send_signal(signal.SIGTERM)
+
+    def _has_exited(self):
+        # Only the thread waiting for the process may reap it (see
+        # call.wait, which collects its resource usage with os.wait4), so
+        # we check for its termination without reaping it. Until it is
+        # reaped, its pid cannot be reused.
+        if self.returncode is not None:
+            return True
+        try:
+            return os.waitid(
+                os.P_PID, self.pid,
+                os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None
+        except ChildProcessError:
+            return True
+
+    def _send_signal(self, sig):
+        if not self._has_exited():
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def _run_monitor(self):
+        termination_time = None
+        while not self._stop_monitoring.wait(POLL_INTERVAL):
+            memory = self._get_memory_usage()
+            self._update_peak_memory(memory)
+            if termination_time is not None:
+                if time.monotonic() - termination_time > GRACE_PERIOD:
+                    logging.info("{} still running, sending SIGKILL".format(
+                        self.nick))
+                    self._send_signal(signal.SIGKILL)
+                    return
+                continue
+            elapsed = time.monotonic() - self.start_time
+            if self.time_limit is not None and elapsed > self.time_limit:
+                self._stop("time")
+                termination_time = time.monotonic()
+            elif (self.memory_limit is not None and memory is not None and
+                    memory > self.memory_limit):
+                self._stop("memory")
+                termination_time = time.monotonic()
+
+    def _finish(self):
+        if self._finished or self.returncode is None:
+            return
+        self._finished = True
+        self._stop_monitoring.set()
+        self._monitor.join()
+        if self.cgroup:
+            self._update_peak_memory(None)
+            if self.cgroup.was_oom_killed():
+                self.exceeded_limit = "memory"
+            self.cgroup.remove()
+        if self.exceeded_limit:
+            exitcode = LIMIT_EXITCODES.get((self.nick, self.exceeded_limit))
+            if exitcode is not None:
+                self.returncode = exitcode
+        logging.info("{} peak memory (RSS): {} MB".format(
+            self.nick, int(limits.convert_to_mb(self.peak_memory))))
+
+    def wait(self, timeout=None):
+        super().wait(timeout=timeout)
+        self._finish()
+        return self.returncode
+
+    def poll(self):
+        super().poll()
+        self._finish()
+        return self.returncode
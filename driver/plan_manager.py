@@ -1,20 +1,39 @@
+import collections
+import contextlib
 import itertools
 import os
 import os.path
 import re
+import threading
 
 from . import returncodes
 
 
+PlanInfo = collections.namedtuple(
+    "PlanInfo", ["filename", "cost", "problem_type", "timestamp"])
+PlanInfo.__doc__ = """Information about a complete plan passed to plan
+listeners. *timestamp* is the modification time of the plan file."""
+
 _PLAN_INFO_REGEX = re.compile(r"; cost = (\d+) \((unit cost|general cost)\)\n")
 
 
-def _read_last_line(filename):
-    line = None
-    with open(filename) as input_file:
-        for line in input_file:
-            pass
-    return line
+def _read_last_line(filename, block_size=4096):
+    """Return the last line of the file (including its line break, if
+    any) or None for empty files. The file is read backwards from the
+    end in blocks, so that only the end of long plans is read."""
+    with open(filename, "rb") as input_file:
+        position = input_file.seek(0, os.SEEK_END)
+        data = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            input_file.seek(position)
+            data = input_file.read(read_size) + data
+            # Ignore the line break that terminates the last line.
+            line_start = data.rfind(b"\n", 0, len(data) - 1) + 1
+            if line_start > 0:
+                return data[line_start:].decode()
+    return data.decode() or None
 
 
 def _parse_plan(plan_filename):
@@ -30,6 +49,10 @@ def _parse_plan(plan_filename):
         return None, None
 
 
+class BogusPlanError(Exception):
+    pass
+
+
 class PlanManager:
     def __init__(self, plan_prefix, portfolio_bound=None, single_plan=False):
         self._plan_prefix = plan_prefix
@@ -39,6 +62,24 @@ class PlanManager:
             portfolio_bound = "infinity"
         self._portfolio_bound = portfolio_bound
         self._single_plan = single_plan
+        self._listeners = []
+        self._lock = threading.Lock()
+        # Maps plan filenames to (size, modification time, cost, problem
+        # type), so that we only parse each version of a plan file once.
+        self._plan_index = {}
+
+    def add_listener(self, callback):
+        """Call *callback* with a PlanInfo for each new complete plan,
+        as soon as the plan manager detects it. While a watcher is
+        active (see watch), the callback is called from the watcher
+        thread."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Stop calling *callback* for new plans. Do nothing if it is
+        not registered."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
 
     def get_plan_prefix(self):
         return self._plan_prefix
@@ -67,56 +108,118 @@ class PlanManager:
             returncodes.exit_with_driver_critical_error("no plans found yet: cost type not set")
         return self._problem_type
 
+    def _add_plan(self, plan_filename, cost, problem_type):
+        if self._problem_type is None:
+            # This is the first plan we found.
+            self._problem_type = problem_type
+        else:
+            # Check if info from this plan matches previous info.
+            if self._problem_type != problem_type:
+                raise BogusPlanError("problem type has changed")
+            if cost >= self._plan_costs[-1]:
+                raise BogusPlanError("plan quality has not improved")
+        self._plan_costs.append(cost)
+        info = PlanInfo(plan_filename, cost, problem_type,
+                        os.path.getmtime(plan_filename))
+        for callback in self._listeners:
+            callback(info)
+
+    def _add_complete_plans(self):
+        """Add all consecutive new complete plans. Return the filename
+        and whether it exists for the first plan that was not added."""
+        with self._lock:
+            for counter in itertools.count(self.get_plan_counter() + 1):
+                plan_filename = self._get_plan_file(counter)
+                try:
+                    cost, problem_type = self._parse_plan(plan_filename)
+                except FileNotFoundError:
+                    return plan_filename, False
+                if cost is None:
+                    return plan_filename, True
+                print("plan manager: found new plan with cost %d" % cost)
+                try:
+                    self._add_plan(plan_filename, cost, problem_type)
+                except BogusPlanError as err:
+                    raise BogusPlanError("%s: %s" % (plan_filename, err))
+
     def process_new_plans(self):
         """Update information about plans after a planner run.
 
         Read newly generated plans and store the relevant information.
         If the last plan file is incomplete, delete it.
         """
-
-        had_incomplete_plan = False
-        for counter in itertools.count(self.get_plan_counter() + 1):
-            plan_filename = self._get_plan_file(counter)
-            def bogus_plan(msg):
-                returncodes.exit_with_driver_critical_error("%s: %s" % (plan_filename, msg))
-            if not os.path.exists(plan_filename):
-                break
-            if had_incomplete_plan:
-                bogus_plan("plan found after incomplete plan")
-            cost, problem_type = _parse_plan(plan_filename)
-            if cost is None:
-                had_incomplete_plan = True
-                print("%s is incomplete. Deleted the file." % plan_filename)
-                os.remove(plan_filename)
-            else:
-                print("plan manager: found new plan with cost %d" % cost)
-                if self._problem_type is None:
-                    # This is the first plan we found.
-                    self._problem_type = problem_type
-                else:
-                    # Check if info from this plan matches previous info.
-                    if self._problem_type != problem_type:
-                        bogus_plan("problem type has changed")
-                    if cost >= self._plan_costs[-1]:
-                        bogus_plan("plan quality has not improved")
-                self._plan_costs.append(cost)
+        try:
+            plan_filename, exists = self._add_complete_plans()
+        except BogusPlanError as err:
+            returncodes.exit_with_driver_critical_error(err)
+        if exists:
+            print("%s is incomplete. Deleted the file." % plan_filename)
+            os.remove(plan_filename)
+            self._plan_index.pop(plan_filename, None)
+            next_plan_filename = self._get_plan_file(self.get_plan_counter() + 2)
+            if os.path.exists(next_plan_filename):
+                returncodes.exit_with_driver_critical_error(
+                    "%s: plan found after incomplete plan" % next_plan_filename)
+
+    @contextlib.contextmanager
+    def watch(self, interval=0.5):
+        """Detect new complete plans while a planner runs, i.e., while
+        the context is active, and pass them to the listeners.
+
+        Plan files are polled every *interval* seconds. Incomplete plans
+        are left alone; call process_new_plans after the run as usual."""
+        stop = threading.Event()
+        errors = []
+
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    self._add_complete_plans()
+                except BogusPlanError as err:
+                    errors.append(err)
+                    return
+
+        watcher = threading.Thread(target=poll, daemon=True)
+        watcher.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            watcher.join()
+        if errors:
+            returncodes.exit_with_driver_critical_error(errors[0])
+
+    def _parse_plan(self, plan_filename):
+        stat = os.stat(plan_filename)
+        key = (stat.st_size, stat.st_mtime_ns)
+        entry = self._plan_index.get(plan_filename)
+        if entry is None or entry[:2] != key:
+            entry = key + _parse_plan(plan_filename)
+            self._plan_index[plan_filename] = entry
+        return entry[2:]
 
     def get_existing_plans(self):
         """Yield all plans that match the given plan prefix."""
-        if os.path.exists(self._plan_prefix):
+        plan_dir, plan_basename = os.path.split(self._plan_prefix)
+        try:
+            filenames = set(os.listdir(plan_dir or os.curdir))
+        except FileNotFoundError:
+            return
+        if plan_basename in filenames:
             yield self._plan_prefix
 
         for counter in itertools.count(start=1):
             plan_filename = self._get_plan_file(counter)
-            if os.path.exists(plan_filename):
+            if os.path.basename(plan_filename) in filenames:
                 yield plan_filename
             else:
                 break
 
     def delete_existing_plans(self):
         """Delete all plans that match the given plan prefix."""
-        for plan in self.get_existing_plans():
+        for plan in list(self.get_existing_plans()):
             os.remove(plan)
+            self._plan_index.pop(plan, None)
 
     def _get_plan_file(self, number):
         return "%s.%d" % (self._plan_prefix, number)
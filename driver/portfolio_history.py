@@ -0,0 +1,165 @@
+"""Adaptive scheduling of portfolio configurations.
+
+The schedule is based on per-domain statistics of previous portfolio
+runs, stored in a local JSON file of the form
+
+    {domain key: {config key: {"runs": ..., "solved": ...,
+                               "out_of_memory": ..., "time": ...}}}
+
+where the domain key is a hash of the domain file (or "unknown" if the
+driver only runs the search component) and the config key is the
+command line of the configuration in the portfolio file.
+
+Before running the portfolio, configurations are ordered by their
+historical success rate on the domain, and their relative times are
+scaled by a smoothed success rate. When a configuration runs out of
+memory, the out-of-memory rates on the domain break the ties of the
+remaining configurations: of those with the same success rate, the ones
+that often ran out of memory are then tried last. When a configuration
+stops early because it runs out of memory or its search space is
+exhausted, the time it leaves over goes to the next configuration, in
+addition to that configuration's share of the remaining time (static
+schedules distribute it over all remaining configurations). All
+decisions are logged. A history file that
+cannot be read is ignored, and the file is replaced atomically when it
+is saved.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from . import returncodes
+
+
+UNKNOWN_DOMAIN = "unknown"
+
+# Exit codes of configs that stopped before using up their time.
+EARLY_FAILURE_EXITCODES = [
+    returncodes.SEARCH_OUT_OF_MEMORY,
+    returncodes.SEARCH_UNSOLVED_INCOMPLETE,
+]
+
+
+def get_domain_key(domain_file):
+    if domain_file is None:
+        return UNKNOWN_DOMAIN
+    with open(domain_file, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def get_config_key(args):
+    return " ".join(args)
+
+
+class AdaptiveScheduler:
+    def __init__(self, history_file, domain_key):
+        self.history_file = history_file
+        self.domain_key = domain_key
+        self.extra_time = 0
+        self.history = {}
+        if os.path.exists(history_file):
+            try:
+                with open(history_file) as f:
+                    history = json.load(f)
+                if not isinstance(history, dict):
+                    raise ValueError("not a JSON object")
+                self.history = history
+            except (OSError, ValueError) as err:
+                print("adaptive schedule: ignoring unreadable history file "
+                      "{}: {}".format(history_file, err))
+        self.stats = self.history.setdefault(domain_key, {})
+        print("adaptive schedule: {} configs with statistics for domain {}".format(
+            len(self.stats), domain_key))
+
+    def _get_stats(self, args):
+        return self.stats.get(
+            get_config_key(args),
+            {"runs": 0, "solved": 0, "out_of_memory": 0, "time": 0.0})
+
+    def _get_success_rate(self, args):
+        # Laplace-smoothed, so that configs without statistics get 0.5.
+        stats = self._get_stats(args)
+        return (stats["solved"] + 1) / (stats["runs"] + 2)
+
+    def _get_out_of_memory_rate(self, args):
+        stats = self._get_stats(args)
+        return (stats["out_of_memory"] + 1) / (stats["runs"] + 2)
+
+    def _get_order_key(self, config):
+        return -self._get_success_rate(config[1])
+
+    def arrange(self, configs):
+        """Return the configs ordered by decreasing historical success
+        rate (keeping the portfolio order for ties) with relative times
+        scaled by the success rate relative to configs without
+        statistics."""
+        arranged = []
+        for relative_time, args in sorted(configs, key=self._get_order_key):
+            factor = 2 * self._get_success_rate(args)
+            arranged.append((relative_time * factor, args))
+        for pos, (relative_time, args) in enumerate(arranged):
+            stats = self._get_stats(args)
+            print("adaptive schedule: config {} ({} runs, {} solved, {} out of memory) "
+                  "gets relative time {:.2f}: {}".format(
+                      pos, stats["runs"], stats["solved"],
+                      stats["out_of_memory"], relative_time,
+                      get_config_key(args)))
+        return arranged
+
+    def take_extra_time(self):
+        """Return the time left over for the next config and reset it."""
+        extra_time = self.extra_time
+        self.extra_time = 0
+        return extra_time
+
+    def adapt(self, configs, pos, exitcode, run_time, used_time):
+        """Adapt the schedule after configs[pos] terminated with the
+        given exit code after *used_time* of its *run_time* seconds.
+
+        If the config failed early, the next config gets the time it
+        left over on top of its own share (see take_extra_time). If it
+        ran out of memory, configs[pos + 1:] are also reordered in place."""
+        remaining = configs[pos + 1:]
+        if exitcode in EARLY_FAILURE_EXITCODES and remaining:
+            self.extra_time = max(0, run_time - used_time)
+            print("adaptive schedule: config {} stopped with exit code {} "
+                  "after {:.2f}s of {:.2f}s, the next config gets the "
+                  "remaining {:.2f}s".format(
+                      pos, exitcode, used_time, run_time, self.extra_time))
+        if exitcode == returncodes.SEARCH_OUT_OF_MEMORY and len(remaining) > 1:
+            reordered = sorted(
+                remaining,
+                key=lambda config: (self._get_order_key(config),
+                                    self._get_out_of_memory_rate(config[1])))
+            if reordered != remaining:
+                print("adaptive schedule: config {} ran out of memory, trying "
+                      "configs that often ran out of memory on this domain "
+                      "last among configs with the same success rate".format(
+                          pos))
+                configs[pos + 1:] = reordered
+
+    def record(self, args, exitcode, time):
+        stats = self.stats.setdefault(get_config_key(args), self._get_stats(args))
+        stats["runs"] += 1
+        if exitcode in [returncodes.SUCCESS, returncodes.SEARCH_UNSOLVABLE]:
+            stats["solved"] += 1
+        elif exitcode in [returncodes.SEARCH_OUT_OF_MEMORY,
+                          returncodes.SEARCH_OUT_OF_MEMORY_AND_TIME]:
+            stats["out_of_memory"] += 1
+        stats["time"] += time
+
+    def save(self):
+        # Write to a temporary file in the same directory and rename it,
+        # so that the history file is never left partially written.
+        fd, temp_file = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.history_file)),
+            prefix=".history-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.history, f, indent=2, sort_keys=True)
+            os.replace(temp_file, self.history_file)
+        except Exception:
+            os.remove(temp_file)
+            raise
@@ -15,13 +15,15 @@ the process is started.
 
 __all__ = ["run"]
 
-import subprocess
+import os
 import sys
+import tempfile
+import threading
 
 from . import call
 from . import limits
+from . import portfolio_history
 from . import returncodes
-from . import util
 
 
 DEFAULT_TIMEOUT = 1800
@@ -62,37 +64,87 @@ def adapt_args(args, search_cost_type, heuristic_cost_type, plan_manager):
             break
 
 
-def run_search(executable, args, sas_file, plan_manager, time, memory):
+def run_search(executable, args, pos, sas_file, task_cache, plan_manager,
+               time_limit, memory_limit):
+    """Run the search on *sas_file*. If *task_cache* is given, the first
+    config of a portfolio stores the parsed task there and later configs
+    read it from there instead of parsing *sas_file* again."""
     complete_args = [executable] + args + [
         "--internal-plan-file", plan_manager.get_plan_prefix()]
+    if task_cache:
+        complete_args += ["--internal-task-cache", task_cache]
     print("args: %s" % complete_args)
 
+    process = call.start_process(
+        "search", complete_args, stdin=sas_file,
+        time_limit=time_limit, memory_limit=memory_limit)
+    stopped_after_plan = threading.Event()
+
+    def stop_after_first_plan(plan_info):
+        # Called by the plan watcher as soon as the plan is complete.
+        # Anytime configurations would otherwise keep searching for
+        # better plans, which we do not need.
+        print("config {}: found plan {}, stopping search".format(
+            pos, plan_info.filename))
+        stopped_after_plan.set()
+        process.terminate()
+
+    if plan_manager.abort_portfolio_after_first_plan():
+        plan_manager.add_listener(stop_after_first_plan)
     try:
-        exitcode = call.check_call(
-            "search", complete_args, stdin=sas_file,
-            time_limit=time, memory_limit=memory)
-    except subprocess.CalledProcessError as err:
-        exitcode = err.returncode
+        with plan_manager.watch():
+            exitcode = call.wait(process, config=pos)
+    finally:
+        plan_manager.remove_listener(stop_after_first_plan)
+    if stopped_after_plan.is_set():
+        exitcode = returncodes.SUCCESS
     print("exitcode: %d" % exitcode)
     print()
     return exitcode
 
 
-def compute_run_time(timeout, configs, pos):
-    remaining_time = timeout - util.get_elapsed_time()
+def compute_run_time(timeout, configs, pos, extra_time=0):
+    """Return the time for configs[pos]: *extra_time* seconds (left
+    over by the previous config, see portfolio_history) plus its share
+    of the rest of the remaining time."""
+    remaining_time = timeout - limits.get_elapsed_time()
     print("remaining time: {}".format(remaining_time))
     relative_time = configs[pos][0]
     remaining_relative_time = sum(config[0] for config in configs[pos:])
     print("config {}: relative time {}, remaining {}".format(
           pos, relative_time, remaining_relative_time))
+    extra_time = min(extra_time, remaining_time)
+    if extra_time > 0:
+        print("config {}: extra time {}".format(pos, extra_time))
     # For the last config we have relative_time == remaining_relative_time, so
     # we use all of the remaining time at the end.
-    return remaining_time * relative_time / remaining_relative_time
+    return extra_time + (
+        (remaining_time - extra_time) * relative_time / remaining_relative_time)
+
+
+def get_extra_time(scheduler):
+    return scheduler.take_extra_time() if scheduler else 0
+
+
+def run_and_record_search(executable, args, args_template, configs, pos,
+                          sas_file, task_cache, plan_manager, time, memory,
+                          scheduler):
+    start_time = limits.get_elapsed_time()
+    exitcode = run_search(
+        executable, args, pos, sas_file, task_cache, plan_manager, time,
+        memory)
+    if scheduler:
+        used_time = limits.get_elapsed_time() - start_time
+        scheduler.record(args_template, exitcode, used_time)
+        scheduler.adapt(configs, pos, exitcode, time, used_time)
+    return exitcode
 
 
 def run_sat_config(configs, pos, search_cost_type, heuristic_cost_type,
-                   executable, sas_file, plan_manager, timeout, memory):
-    run_time = compute_run_time(timeout, configs, pos)
+                   executable, sas_file, task_cache, plan_manager, timeout,
+                   memory, scheduler):
+    run_time = compute_run_time(
+        timeout, configs, pos, get_extra_time(scheduler))
     if run_time <= 0:
         return None
     _, args_template = configs[pos]
@@ -102,13 +154,15 @@ def run_sat_config(configs, pos, search_cost_type, heuristic_cost_type,
         args.extend([
             "--internal-previous-portfolio-plans",
             str(plan_manager.get_plan_counter())])
-    result = run_search(executable, args, sas_file, plan_manager, run_time, memory)
+    result = run_and_record_search(
+        executable, args, args_template, configs, pos, sas_file,
+        task_cache, plan_manager, run_time, memory, scheduler)
     plan_manager.process_new_plans()
     return result
 
 
-def run_sat(configs, executable, sas_file, plan_manager, final_config,
-            final_config_builder, timeout, memory):
+def run_sat(configs, executable, sas_file, task_cache, plan_manager,
+            final_config, final_config_builder, timeout, memory, scheduler):
     # If the configuration contains S_COST_TYPE or H_COST_TRANSFORM and the task
     # has non-unit costs, we start by treating all costs as one. When we find
     # a solution, we rerun the successful config with real costs.
@@ -120,7 +174,8 @@ def run_sat(configs, executable, sas_file, plan_manager, final_config,
         for pos, (relative_time, args) in enumerate(configs):
             exitcode = run_sat_config(
                 configs, pos, search_cost_type, heuristic_cost_type,
-                executable, sas_file, plan_manager, timeout, memory)
+                executable, sas_file, task_cache, plan_manager, timeout,
+                memory, scheduler)
             if exitcode is None:
                 return
 
@@ -140,7 +195,8 @@ def run_sat(configs, executable, sas_file, plan_manager, final_config,
                     heuristic_cost_type = "plusone"
                     exitcode = run_sat_config(
                         configs, pos, search_cost_type, heuristic_cost_type,
-                        executable, sas_file, plan_manager, timeout, memory)
+                        executable, sas_file, task_cache, plan_manager,
+                        timeout, memory, scheduler)
                     if exitcode is None:
                         return
 
@@ -162,17 +218,20 @@ def run_sat(configs, executable, sas_file, plan_manager, final_config,
         print("Abort portfolio and run final config.")
         exitcode = run_sat_config(
             [(1, final_config)], 0, search_cost_type,
-            heuristic_cost_type, executable, sas_file, plan_manager,
-            timeout, memory)
+            heuristic_cost_type, executable, sas_file, task_cache,
+            plan_manager, timeout, memory, scheduler)
         if exitcode is not None:
             yield exitcode
 
 
-def run_opt(configs, executable, sas_file, plan_manager, timeout, memory):
+def run_opt(configs, executable, sas_file, task_cache, plan_manager, timeout,
+            memory, scheduler):
     for pos, (relative_time, args) in enumerate(configs):
-        run_time = compute_run_time(timeout, configs, pos)
-        exitcode = run_search(executable, args, sas_file, plan_manager,
-                              run_time, memory)
+        run_time = compute_run_time(
+            timeout, configs, pos, get_extra_time(scheduler))
+        exitcode = run_and_record_search(
+            executable, args, args, configs, pos, sas_file, task_cache,
+            plan_manager, run_time, memory, scheduler)
         yield exitcode
 
         if exitcode in [returncodes.SUCCESS, returncodes.SEARCH_UNSOLVABLE]:
@@ -201,12 +260,20 @@ def get_portfolio_attributes(portfolio):
     return attributes
 
 
-def run(portfolio, executable, sas_file, plan_manager, time, memory):
+def run(portfolio, executable, sas_file, plan_manager, time, memory,
+        history_file=None, domain_file=None):
     """
     Run the configs in the given portfolio file.
 
     The portfolio is allowed to run for at most *time* seconds and may
-    use a maximum of *memory* bytes.
+    use a maximum of *memory* bytes. If *history_file* is given, the
+    configs are scheduled adaptively based on the statistics for
+    *domain_file* stored in it (see portfolio_history), and the file is
+    updated with the results of this run.
+
+    The task is parsed only once: the first config stores the parsed
+    task in a cache file that the other configs read instead of
+    *sas_file*. The search logs how long each config takes to start.
     """
     attributes = get_portfolio_attributes(portfolio)
     configs = attributes["CONFIGS"]
@@ -226,13 +293,26 @@ def run(portfolio, executable, sas_file, plan_manager, time, memory):
                 "Portfolios need a time limit. Please pass --search-time-limit "
                 "or --overall-time-limit to fast-downward.py.")
 
-    timeout = util.get_elapsed_time() + time
+    timeout = limits.get_elapsed_time() + time
 
-    if optimal:
-        exitcodes = run_opt(
-            configs, executable, sas_file, plan_manager, timeout, memory)
-    else:
-        exitcodes = run_sat(
-            configs, executable, sas_file, plan_manager, final_config,
-            final_config_builder, timeout, memory)
-    return returncodes.generate_portfolio_exitcode(list(exitcodes))
+    scheduler = None
+    if history_file:
+        scheduler = portfolio_history.AdaptiveScheduler(
+            history_file, portfolio_history.get_domain_key(domain_file))
+        configs = scheduler.arrange(configs)
+
+    with tempfile.TemporaryDirectory(prefix="fast-downward-") as cache_dir:
+        task_cache = os.path.join(cache_dir, "task.cache")
+        if optimal:
+            exitcodes = run_opt(
+                configs, executable, sas_file, task_cache, plan_manager,
+                timeout, memory, scheduler)
+        else:
+            exitcodes = run_sat(
+                configs, executable, sas_file, task_cache, plan_manager,
+                final_config, final_config_builder, timeout, memory,
+                scheduler)
+        exitcodes = list(exitcodes)
+    if scheduler:
+        scheduler.save()
+    return returncodes.generate_portfolio_exitcode(exitcodes)
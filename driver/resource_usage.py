@@ -0,0 +1,119 @@
+"""Collect the resource usage of all component runs of the driver.
+
+For each terminated component process (including each configuration of
+a portfolio), call.wait records the rusage returned by os.wait4 (user
+and system time, peak RSS, page faults, context switches) together with
+the wall-clock time and exit code. Runs of portfolio configurations
+also record the position of the configuration in the portfolio schedule
+(as in the "config <n>" lines of the portfolio log). The driver logs a line per run, a
+summary table at the end, and optionally writes all records as JSON.
+On platforms without os.wait4, only wall-clock time and exit code are
+recorded.
+"""
+
+import json
+import logging
+import sys
+
+from . import limits
+
+
+# Fields taken from the rusage structure.
+RUSAGE_FIELDS = [
+    ("user_time", "ru_utime"),
+    ("system_time", "ru_stime"),
+    ("peak_memory", "ru_maxrss"),
+    ("minor_page_faults", "ru_minflt"),
+    ("major_page_faults", "ru_majflt"),
+    ("voluntary_context_switches", "ru_nvcsw"),
+    ("involuntary_context_switches", "ru_nivcsw"),
+]
+
+_records = []
+
+
+def _get_peak_memory_in_bytes(maxrss):
+    # ru_maxrss is given in bytes on macOS and in KiB elsewhere.
+    if sys.platform == "darwin":
+        return maxrss
+    return maxrss * 1024
+
+
+def record(nick, cmd, exitcode, wall_clock_time, rusage, config=None):
+    usage = {
+        "component": nick,
+        "command": list(cmd),
+        "exitcode": exitcode,
+        "wall_clock_time": wall_clock_time,
+    }
+    if config is not None:
+        usage["config"] = config
+    if rusage is not None:
+        for field, attribute in RUSAGE_FIELDS:
+            usage[field] = getattr(rusage, attribute)
+        usage["peak_memory"] = _get_peak_memory_in_bytes(usage["peak_memory"])
+    _records.append(usage)
+    logging.info("{} resource usage: {}".format(
+        _get_run_name(usage), _format(usage)))
+    return usage
+
+
+def _get_run_name(usage):
+    if "config" in usage:
+        return "{} (config {})".format(usage["component"], usage["config"])
+    return usage["component"]
+
+
+def _format(usage):
+    parts = ["wall-clock time {:.2f}s".format(usage["wall_clock_time"])]
+    if "user_time" in usage:
+        parts += [
+            "user time {:.2f}s".format(usage["user_time"]),
+            "system time {:.2f}s".format(usage["system_time"]),
+            "peak memory (RSS) {} MB".format(
+                int(limits.convert_to_mb(usage["peak_memory"]))),
+            "page faults {} minor/{} major".format(
+                usage["minor_page_faults"], usage["major_page_faults"]),
+            "context switches {} voluntary/{} involuntary".format(
+                usage["voluntary_context_switches"],
+                usage["involuntary_context_switches"]),
+        ]
+    return ", ".join(parts)
+
+
+def get_records():
+    return list(_records)
+
+
+def print_summary():
+    if not _records:
+        return
+    header = ["run", "component", "exit", "wall (s)", "user (s)", "sys (s)",
+              "RSS (MB)", "minflt", "majflt", "nvcsw", "nivcsw"]
+    rows = [header]
+    for run, usage in enumerate(_records, 1):
+        row = [str(run), _get_run_name(usage), str(usage["exitcode"]),
+               "{:.2f}".format(usage["wall_clock_time"])]
+        if "user_time" in usage:
+            row += [
+                "{:.2f}".format(usage["user_time"]),
+                "{:.2f}".format(usage["system_time"]),
+                str(int(limits.convert_to_mb(usage["peak_memory"]))),
+                str(usage["minor_page_faults"]),
+                str(usage["major_page_faults"]),
+                str(usage["voluntary_context_switches"]),
+                str(usage["involuntary_context_switches"]),
+            ]
+        else:
+            row += ["-"] * (len(header) - len(row))
+        rows.append(row)
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    print("Resource usage per component run:")
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+    print()
+
+
+def write_json(filename):
+    with open(filename, "w") as f:
+        json.dump(_records, f, indent=2)
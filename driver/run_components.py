@@ -1,6 +1,6 @@
 import errno
 import logging
-import os.path
+import os
 import subprocess
 import sys
 
@@ -47,22 +47,14 @@ def get_executable(build, rel_path):
     return abs_path
 
 
-def run_translate(args):
-    logging.info("Running translator.")
-    time_limit = limits.get_time_limit(
-        args.translate_time_limit, args.overall_time_limit)
-    memory_limit = limits.get_memory_limit(
-        args.translate_memory_limit, args.overall_memory_limit)
+def _get_translate_command(args, extra_options=()):
     translate = get_executable(args.build, REL_TRANSLATE_PATH)
     assert sys.executable, "Path to interpreter could not be found"
-    cmd = [sys.executable] + [translate] + args.translate_inputs + args.translate_options
+    return ([sys.executable] + [translate] + args.translate_inputs +
+            args.translate_options + list(extra_options))
 
-    stderr, returncode = call.get_error_output_and_returncode(
-        "translator",
-        cmd,
-        time_limit=time_limit,
-        memory_limit=memory_limit)
 
+def _handle_translate_result(stderr, returncode):
     # We collect stderr of the translator and print it here, unless
     # the translator ran out of memory and all output in stderr is
     # related to MemoryError.
@@ -93,6 +85,43 @@ def run_translate(args):
         return (returncode, False)
 
 
+def _get_search_command(args, executable):
+    if not args.search_options:
+        returncodes.exit_with_driver_input_error(
+            "search needs --alias, --portfolio, or search options")
+    if "--help" not in args.search_options:
+        args.search_options.extend(["--internal-plan-file", args.plan_file])
+    return [executable] + args.search_options
+
+
+def _handle_search_returncode(returncode):
+    if returncode == 0:
+        return (0, True)
+    # TODO: if we ever add support for SEARCH_PLAN_FOUND_AND_* directly
+    # in the planner, this assertion no longer holds. Furthermore, we
+    # would need to return (returncode, True) if the returncode is
+    # in [0..10].
+    # Negative exit codes are allowed for passing out signals.
+    assert returncode >= 10 or returncode < 0, "got returncode < 10: {}".format(returncode)
+    return (returncode, False)
+
+
+def run_translate(args):
+    logging.info("Running translator.")
+    time_limit = limits.get_time_limit(
+        args.translate_time_limit, args.overall_time_limit)
+    memory_limit = limits.get_memory_limit(
+        args.translate_memory_limit, args.overall_memory_limit)
+    cmd = _get_translate_command(args)
+
+    stderr, returncode = call.get_error_output_and_returncode(
+        "translator",
+        cmd,
+        time_limit=time_limit,
+        memory_limit=memory_limit)
+    return _handle_translate_result(stderr, returncode)
+
+
 def run_search(args):
     logging.info("Running search (%s)." % args.build)
     time_limit = limits.get_time_limit(
@@ -110,34 +139,128 @@ def run_search(args):
     if args.portfolio:
         assert not args.search_options
         logging.info("search portfolio: %s" % args.portfolio)
+        domain_file = args.translate_inputs[0] if args.translate_inputs else None
         return portfolio_runner.run(
             args.portfolio, executable, args.search_input, plan_manager,
-            time_limit, memory_limit)
+            time_limit, memory_limit, history_file=args.portfolio_history,
+            domain_file=domain_file)
     else:
-        if not args.search_options:
-            returncodes.exit_with_driver_input_error(
-                "search needs --alias, --portfolio, or search options")
-        if "--help" not in args.search_options:
-            args.search_options.extend(["--internal-plan-file", args.plan_file])
         try:
-            call.check_call(
-                "search",
-                [executable] + args.search_options,
-                stdin=args.search_input,
-                time_limit=time_limit,
-                memory_limit=memory_limit)
+            with plan_manager.watch():
+                call.check_call(
+                    "search",
+                    _get_search_command(args, executable),
+                    stdin=args.search_input,
+                    time_limit=time_limit,
+                    memory_limit=memory_limit)
         except subprocess.CalledProcessError as err:
-            # TODO: if we ever add support for SEARCH_PLAN_FOUND_AND_* directly
-            # in the planner, this assertion no longer holds. Furthermore, we
-            # would need to return (err.returncode, True) if the returncode is
-            # in [0..10].
-            # Negative exit codes are allowed for passing out signals.
-            assert err.returncode >= 10 or err.returncode < 0, "got returncode < 10: {}".format(err.returncode)
-            return (err.returncode, False)
+            return _handle_search_returncode(err.returncode)
         else:
             return (0, True)
 
 
+def _is_broken_pipe_error(stderr):
+    # Python ignores SIGPIPE, so writing to a pipe without readers raises
+    # a BrokenPipeError, which ends up in the traceback on stderr.
+    return "BrokenPipeError" in stderr
+
+
+def run_translate_and_search_streamed(args):
+    """Run the translator and the search concurrently, passing the
+    translator output to the search through a pipe instead of an
+    intermediate file. The search starts reading and processing its
+    input while the translator is still writing it.
+
+    Return a list of (component, exitcode, continue_execution) triples
+    for the components that ran, in order."""
+    logging.info("Running translator and search (%s) connected by a pipe." %
+                 args.build)
+    assert not args.portfolio
+    translate_time_limit = limits.get_time_limit(
+        args.translate_time_limit, args.overall_time_limit)
+    translate_memory_limit = limits.get_memory_limit(
+        args.translate_memory_limit, args.overall_memory_limit)
+    search_memory_limit = limits.get_memory_limit(
+        args.search_memory_limit, args.overall_memory_limit)
+    # The search CPU time limit is lowered below once the translator
+    # has finished and we know how much of the overall time it used.
+    search_time_limit = limits.get_time_limit(
+        args.search_time_limit, args.overall_time_limit)
+    executable = get_executable(args.build, REL_SEARCH_PATH)
+    search_cmd = _get_search_command(args, executable)
+
+    plan_manager = PlanManager(
+        args.plan_file,
+        portfolio_bound=args.portfolio_bound,
+        single_plan=args.portfolio_single_plan)
+    plan_manager.delete_existing_plans()
+
+    read_fd, write_fd = os.pipe()
+    try:
+        search = call.start_process(
+            "search", search_cmd, stdin=read_fd,
+            time_limit=search_time_limit, memory_limit=search_memory_limit)
+    finally:
+        os.close(read_fd)
+    try:
+        translate = call.start_process(
+            "translator",
+            _get_translate_command(
+                args, ["--sas-file", "/dev/fd/{}".format(write_fd)]),
+            time_limit=translate_time_limit,
+            memory_limit=translate_memory_limit,
+            stderr=subprocess.PIPE, pass_fds=(write_fd,), text=True)
+    except OSError:
+        search.kill()
+        search.wait()
+        raise
+    finally:
+        # The search only sees the end of its input once all copies of
+        # the write end are closed, including ours.
+        os.close(write_fd)
+
+    with translate.stderr:
+        stderr = translate.stderr.read()
+    translate_exitcode, continue_execution = _handle_translate_result(
+        stderr, call.wait(translate))
+    results = [("translate", translate_exitcode, continue_execution)]
+
+    if not continue_execution:
+        if _is_broken_pipe_error(stderr):
+            # The search terminated before reading all of its input
+            # (e.g., due to invalid options), which made the translator
+            # fail writing to the pipe. Report the search result last so
+            # that its exit code is passed on.
+            returncode = call.wait(search)
+            results.append(("search",) + _handle_search_returncode(returncode))
+        else:
+            # The translator failed on its own (e.g., it ran out of time
+            # or memory), so its exit code is the one to pass on, even if
+            # the search has already terminated.
+            search.kill()
+            call.wait(search)
+        return results
+
+    # With the monitor backend, time limits are wall-clock limits, which
+    # already account for the translator running concurrently.
+    if (args.overall_time_limit is not None and
+            limits.get_backend() == "rlimit" and
+            limits.can_change_time_limit_of_running_process()):
+        search_time_limit = limits.get_time_limit(
+            args.search_time_limit, args.overall_time_limit)
+        try:
+            limits.lower_time_limit_of_running_process(
+                search.pid, search_time_limit)
+        except ProcessLookupError:
+            # The search has already terminated.
+            pass
+
+    with plan_manager.watch():
+        returncode = call.wait(search)
+    results.append(("search",) + _handle_search_returncode(returncode))
+    return results
+
+
 def run_validate(args):
     logging.info("Running validate.")
 
@@ -7,13 +7,22 @@ Test module for Fast Downward driver script. Run with
 import os
 import subprocess
 import sys
+import time
+from types import SimpleNamespace
 
 import pytest
 
 from .aliases import ALIASES, PORTFOLIOS
 from .arguments import EXAMPLES
+from . import call
 from . import limits
+from . import monitor
+from . import portfolio_history
+from . import portfolio_runner
+from . import resource_usage
 from . import returncodes
+from . import run_components
+from .plan_manager import PlanManager
 from .util import REPO_ROOT_DIR, find_domain_filename
 
 
@@ -48,6 +57,15 @@ def test_aliases():
         run_driver(parameters)
 
 
+def test_portfolio_table_matches_portfolio_dir():
+    portfolio_dir = os.path.join(REPO_ROOT_DIR, "driver", "portfolios")
+    portfolio_files = sorted(
+        os.path.join(portfolio_dir, filename)
+        for filename in os.listdir(portfolio_dir)
+        if filename.endswith(".py"))
+    assert sorted(PORTFOLIOS.values()) == portfolio_files
+
+
 def test_show_aliases():
     run_driver(["--show-aliases"])
 
@@ -59,6 +77,17 @@ def test_portfolios():
         run_driver(parameters)
 
 
+def test_lazy_imports():
+    cmd = [sys.executable, "-X", "importtime", "fast-downward.py",
+           "--show-aliases"]
+    output = subprocess.run(
+        cmd, cwd=REPO_ROOT_DIR, stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE, text=True, check=True).stderr
+    for module in ["driver.run_components", "driver.portfolio_runner",
+                   "driver.call"]:
+        assert module not in output
+
+
 @pytest.mark.skipif(not limits.can_set_time_limit(), reason="Cannot set time limits on this system")
 def test_hard_time_limit():
     def preexec_fn():
@@ -84,3 +113,211 @@ def test_automatic_domain_file_name_computation():
         for filename in filenames:
             if "domain" not in filename:
                 assert find_domain_filename(os.path.join(dirpath, filename))
+
+
+def run_streamed_components(monkeypatch, tmp_path, translate_code, search_code):
+    # Replace the translator and the search by Python snippets. The
+    # translator gets "--sas-file /dev/fd/<n>" as its last arguments.
+    monkeypatch.setattr(
+        run_components, "_get_translate_command",
+        lambda args, extra_options: [sys.executable, "-c", translate_code] +
+        list(extra_options))
+    monkeypatch.setattr(
+        run_components, "get_executable", lambda build, rel_path: sys.executable)
+    args = SimpleNamespace(
+        build="release", portfolio=None, search_options=["-c", search_code],
+        plan_file=str(tmp_path / "sas_plan"), portfolio_bound=None,
+        portfolio_single_plan=False, overall_time_limit=None,
+        overall_memory_limit=None, translate_time_limit=None,
+        translate_memory_limit=None, search_time_limit=None,
+        search_memory_limit=None)
+    return run_components.run_translate_and_search_streamed(args)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Streaming needs /dev/fd")
+def test_streamed_translator_failure_decides_exitcode(monkeypatch, tmp_path):
+    # The search terminates before the translator fails on its own. The
+    # driver passes on the exit code of the last result.
+    results = run_streamed_components(
+        monkeypatch, tmp_path,
+        "import sys, time; time.sleep(1); sys.exit({})".format(
+            returncodes.TRANSLATE_OUT_OF_MEMORY),
+        "import sys; sys.exit({})".format(returncodes.SEARCH_INPUT_ERROR))
+    assert results == [
+        ("translate", returncodes.TRANSLATE_OUT_OF_MEMORY, False)]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Streaming needs /dev/fd")
+def test_streamed_search_failure_decides_exitcode(monkeypatch, tmp_path):
+    # The search terminates without reading its input, so the translator
+    # fails writing to the pipe.
+    results = run_streamed_components(
+        monkeypatch, tmp_path,
+        "import sys\n"
+        "with open(sys.argv[-1], 'w') as f:\n"
+        "    for _ in range(1000): f.write('x' * 10**4)",
+        "import sys; sys.exit({})".format(returncodes.SEARCH_INPUT_ERROR))
+    assert results == [
+        ("translate", returncodes.TRANSLATE_CRITICAL_ERROR, False),
+        ("search", returncodes.SEARCH_INPUT_ERROR, False)]
+
+
+@pytest.mark.skipif(not monitor.is_supported(), reason="Monitor backend not supported")
+def test_monitor_leaves_reaping_to_wait(monkeypatch):
+    monkeypatch.setattr(limits, "_backend", "monitor")
+    process = call.start_process(
+        "search", [sys.executable, "-c", "import time; time.sleep(60)"],
+        time_limit=0.2)
+    # The monitor stops the process and checks on it again after the
+    # grace period, before we wait for it.
+    time.sleep(monitor.GRACE_PERIOD + 1)
+    assert call.wait(process) == returncodes.SEARCH_OUT_OF_TIME
+    assert "user_time" in resource_usage.get_records()[-1]
+
+
+@pytest.mark.skipif(not limits.can_set_time_limit(), reason="Cannot set time limits on this system")
+def test_limits_are_set_without_preexec_fn():
+    # Components are started through exec_with_limits.py, which sets the
+    # limits and then replaces itself by the component.
+    process = call.start_process(
+        "search", [sys.executable, "-c",
+                   "import os, resource; "
+                   "print(os.getpid(), *resource.getrlimit(resource.RLIMIT_CPU))"],
+        time_limit=9.5, stdout=subprocess.PIPE, text=True)
+    with process.stdout:
+        output = process.stdout.read()
+    assert call.wait(process) == 0
+    assert output.split() == [str(process.pid), "10", "11"]
+    assert resource_usage.get_records()[-1]["command"][0] == sys.executable
+
+
+def test_missing_executable_with_limits():
+    with pytest.raises(FileNotFoundError):
+        call.check_call("validate", ["does-not-exist"], time_limit=10)
+
+
+def test_portfolio_history_ignores_unreadable_file(tmp_path):
+    history_file = tmp_path / "history.json"
+    history_file.write_text('{"truncated":')
+    scheduler = portfolio_history.AdaptiveScheduler(str(history_file), "domain")
+    scheduler.record(["--search", "astar(blind())"], returncodes.SUCCESS, 1.0)
+    scheduler.save()
+    assert [path.name for path in tmp_path.iterdir()] == ["history.json"]
+    scheduler = portfolio_history.AdaptiveScheduler(str(history_file), "domain")
+    assert scheduler.stats["--search astar(blind())"]["solved"] == 1
+
+
+def test_portfolio_history_breaks_ties_by_out_of_memory_rate(tmp_path):
+    scheduler = portfolio_history.AdaptiveScheduler(
+        str(tmp_path / "history.json"), "domain")
+    solver, memory_hog, other = ["solver"], ["memory-hog"], ["other"]
+    scheduler.record(solver, returncodes.SUCCESS, 1.0)
+    scheduler.record(memory_hog, returncodes.SEARCH_OUT_OF_MEMORY, 1.0)
+    scheduler.record(other, returncodes.SEARCH_UNSOLVED_INCOMPLETE, 1.0)
+    configs = scheduler.arrange(
+        [(1, ["first"]), (1, memory_hog), (1, other), (1, solver)])
+    assert [args for _, args in configs] == [
+        solver, ["first"], memory_hog, other]
+    scheduler.adapt(configs, 0, returncodes.SEARCH_OUT_OF_MEMORY, 10, 10)
+    assert [args for _, args in configs] == [
+        solver, ["first"], other, memory_hog]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Uses a shell script as search")
+def test_portfolio_resource_usage_records_config(tmp_path):
+    search = tmp_path / "search.sh"
+    search.write_text("#!/bin/sh\nexit {}\n".format(
+        returncodes.SEARCH_UNSOLVED_INCOMPLETE))
+    search.chmod(0o755)
+    portfolio = tmp_path / "portfolio.py"
+    portfolio.write_text(
+        'OPTIMAL = True\n'
+        'CONFIGS = [(1, ["--search", "a"]), (1, ["--search", "b"])]\n')
+    sas_file = tmp_path / "output.sas"
+    sas_file.write_text("")
+    num_records = len(resource_usage.get_records())
+    portfolio_runner.run(
+        str(portfolio), str(search), str(sas_file),
+        PlanManager(str(tmp_path / "sas_plan")), 10, None)
+    records = resource_usage.get_records()[num_records:]
+    assert [(usage["component"], usage["config"]) for usage in records] == [
+        ("search", 0), ("search", 1)]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Uses a shell script as search")
+def test_portfolio_configs_share_task_cache(tmp_path):
+    calls = tmp_path / "calls"
+    search = tmp_path / "search.sh"
+    search.write_text(
+        "#!/bin/sh\n"
+        "while [ \"$1\" != --internal-task-cache ]; do shift; done\n"
+        "echo \"$2\" >> {}\n"
+        "touch \"$2\"\n"
+        "exit {}\n".format(calls, returncodes.SEARCH_UNSOLVED_INCOMPLETE))
+    search.chmod(0o755)
+    portfolio = tmp_path / "portfolio.py"
+    portfolio.write_text(
+        'OPTIMAL = True\n'
+        'CONFIGS = [(1, ["--search", "a"]), (1, ["--search", "b"])]\n')
+    sas_file = tmp_path / "output.sas"
+    sas_file.write_text("")
+    portfolio_runner.run(
+        str(portfolio), str(search), str(sas_file),
+        PlanManager(str(tmp_path / "sas_plan")), 10, None)
+    task_caches = calls.read_text().splitlines()
+    assert len(task_caches) == 2 and task_caches[0] == task_caches[1]
+    assert not os.path.exists(os.path.dirname(task_caches[0]))
+
+
+def test_portfolio_gives_time_of_early_failure_to_next_config(
+        monkeypatch, tmp_path):
+    # Simulate the search runs: config "a" stops after 5 of its 25
+    # seconds, the others use all of their time.
+    clock = [0]
+    time_limits = []
+    def run_search(executable, args, pos, sas_file, task_cache,
+                   plan_manager, time_limit, memory_limit):
+        time_limits.append(time_limit)
+        if args == ["a"]:
+            clock[0] += 5
+            return returncodes.SEARCH_UNSOLVED_INCOMPLETE
+        clock[0] += time_limit
+        return returncodes.SEARCH_OUT_OF_TIME
+    monkeypatch.setattr(portfolio_runner, "run_search", run_search)
+    monkeypatch.setattr(limits, "get_elapsed_time", lambda: clock[0])
+    portfolio = tmp_path / "portfolio.py"
+    portfolio.write_text(
+        'OPTIMAL = True\n'
+        'CONFIGS = [(1, ["a"]), (1, ["b"]), (2, ["c"])]\n')
+    portfolio_runner.run(
+        str(portfolio), "search", "output.sas", None, 100, None,
+        history_file=str(tmp_path / "history.json"))
+    # "b" gets the 20 seconds left over by "a" plus its share (1/3) of
+    # the 75 seconds planned for "b" and "c".
+    assert time_limits == [25, 45, 50]
+
+
+def test_portfolio_stops_search_after_first_plan_in_single_plan_mode(
+        tmp_path):
+    # An anytime search that writes its first plan and then keeps
+    # searching for better plans.
+    search = tmp_path / "search"
+    search.write_text(
+        "#! {}\n"
+        "import os, sys, time\n"
+        "plan = sys.argv[sys.argv.index('--internal-plan-file') + 1] + '.1'\n"
+        "with open(plan + '.tmp', 'w') as f:\n"
+        "    f.write('(a)\\n; cost = 1 (unit cost)\\n')\n"
+        "os.rename(plan + '.tmp', plan)\n"
+        "time.sleep(60)\n".format(sys.executable))
+    search.chmod(0o755)
+    sas_file = tmp_path / "output.sas"
+    sas_file.write_text("")
+    plan_manager = PlanManager(str(tmp_path / "sas_plan"), single_plan=True)
+    start = time.monotonic()
+    exitcode = portfolio_runner.run_search(
+        str(search), [], 0, str(sas_file), None, plan_manager, None, None)
+    assert exitcode == returncodes.SUCCESS
+    assert time.monotonic() - start < 30
+    plan_manager.process_new_plans()
+    assert plan_manager.get_plan_counter() == 1
@@ -1,5 +1,12 @@
 #! /usr/bin/env python3
 
 if __name__ == "__main__":
-    from driver.main import main
-    main()
+    import sys
+    if sys.argv[1:] == ["--version"]:
+        # Fast path for the most trivial call, which does not need the
+        # driver modules.
+        from driver import __version__
+        print(__version__)
+    else:
+        from driver.main import main
+        main()
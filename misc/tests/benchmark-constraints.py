@@ -0,0 +1,154 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Benchmark the constraint solver used by the invariant synthesis.
+
+For each task, the script runs the invariant synthesis of the translator
+and captures all constraint systems whose solvability it checks. It then
+solves the captured systems with ConstraintSystem.is_solvable and with a
+reference implementation that enumerates all combinations of
+assignments, reports the times of both, and exits with code 1 if the
+answers differ on any system.
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+from pathlib import Path
+import sys
+import time
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+TRANSLATE_DIR = REPO / "src" / "translate"
+BENCHMARKS = DIR / "benchmarks"
+
+sys.path.insert(0, str(REPO))
+from driver.util import find_domain_filename
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "tasks", nargs="*", type=Path,
+        help="task files (default: first task of each domain in %s)" % BENCHMARKS)
+    parser.add_argument(
+        "--repetitions", type=int, default=3,
+        help="solve the captured systems this many times and report the "
+             "fastest run (default: %(default)d)")
+    return parser.parse_args()
+
+
+def get_default_tasks():
+    tasks = []
+    for domain_dir in sorted(BENCHMARKS.iterdir()):
+        if not domain_dir.is_dir():
+            continue
+        domain_tasks = sorted(
+            f for f in domain_dir.iterdir()
+            if "domain" not in f.name and f.suffix == ".pddl")
+        if domain_tasks:
+            tasks.append(domain_tasks[0])
+    return tasks
+
+
+def import_translator(domain_file, task_file):
+    # The translator modules read their settings from the options module.
+    sys.argv[1:] = [domain_file, task_file]
+    sys.path.insert(0, str(TRANSLATE_DIR))
+    global constraints, instantiate, invariant_finder, normalize, pddl_parser
+    import constraints
+    import instantiate
+    import invariant_finder
+    import normalize
+    import options
+    import pddl_parser
+    options.setup()
+
+
+def is_solvable_by_enumeration(system):
+    """Reference implementation that checks all combinations of
+    assignments one after the other."""
+    for assignments in itertools.product(*system.combinatorial_assignments):
+        equalities = []
+        for assignment in assignments:
+            equalities.extend(assignment.equalities)
+        combined = constraints.Assignment(equalities)
+        if not combined.is_consistent():
+            continue
+        mapping = combined.get_mapping()
+        if all(clause.apply_mapping(mapping).is_satisfiable()
+               for clause in system.neg_clauses):
+            return True
+    return False
+
+
+def capture_systems(domain_file, task_file):
+    systems = []
+    is_solvable = constraints.ConstraintSystem.is_solvable
+    def capturing_is_solvable(system):
+        systems.append(system.copy())
+        return is_solvable(system)
+    # Hide the progress output of the translator.
+    with contextlib.redirect_stdout(io.StringIO()):
+        task = pddl_parser.open(domain_file, task_file)
+        normalize.normalize(task)
+        (_, _, _, _, _, reachable_action_params) = instantiate.explore(task)
+        constraints.ConstraintSystem.is_solvable = capturing_is_solvable
+        try:
+            list(invariant_finder.find_invariants(task, reachable_action_params))
+        finally:
+            constraints.ConstraintSystem.is_solvable = is_solvable
+    return systems
+
+
+def time_solver(solver, systems, repetitions):
+    best_time = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        answers = [solver(system) for system in systems]
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return answers, best_time
+
+
+def main():
+    args = parse_args()
+    tasks = [task.resolve() for task in args.tasks] or get_default_tasks()
+    import_translator(find_domain_filename(str(tasks[0])), str(tasks[0]))
+
+    failed = False
+    total_reference_time = 0
+    total_solver_time = 0
+    print("{:<40} {:>8} {:>8} {:>14} {:>14}".format(
+        "task", "systems", "solvable", "reference (s)", "solver (s)"))
+    for task_file in tasks:
+        name = "-".join(str(task_file).split("/")[-2:])
+        systems = capture_systems(
+            find_domain_filename(str(task_file)), str(task_file))
+        expected, reference_time = time_solver(
+            is_solvable_by_enumeration, systems, args.repetitions)
+        answers, solver_time = time_solver(
+            constraints.ConstraintSystem.is_solvable, systems, args.repetitions)
+        total_reference_time += reference_time
+        total_solver_time += solver_time
+        mark = ""
+        if answers != expected:
+            failed = True
+            mark = "  answers differ on {} systems".format(
+                sum(a != e for a, e in zip(answers, expected)))
+        print("{:<40} {:>8} {:>8} {:>14.4f} {:>14.4f}{}".format(
+            name, len(systems), sum(expected), reference_time, solver_time,
+            mark))
+    print("{:<40} {:>8} {:>8} {:>14.4f} {:>14.4f}".format(
+        "total", "", "", total_reference_time, total_solver_time))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Measure the startup overhead of fast-downward.py and detect regressions.
+
+For each driver call, the script runs the driver several times with
+"python -X importtime", measures the time spent importing driver modules
+(including the modules they import) and the wall-clock time of the
+whole call. It reports the medians and exits
+with code 1 if a median exceeds the given thresholds.
+"""
+
+import argparse
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+DRIVER = REPO / "fast-downward.py"
+
+CALLS = [
+    ["--version"],
+    ["--show-aliases"],
+    ["--help"],
+    ["--cleanup"],
+]
+
+# Matches "import time: <self us> | <cumulative us> | <indentation><module>".
+IMPORT_TIME_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<module> +\S+)$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--runs", type=int, default=10,
+        help="run each call this many times (default: %(default)d)")
+    parser.add_argument(
+        "--max-import-time", type=float, default=None, metavar="MS",
+        help="fail if the median import time of a call exceeds MS milliseconds")
+    parser.add_argument(
+        "--max-wall-time", type=float, default=None, metavar="MS",
+        help="fail if the median wall-clock time of a call exceeds MS "
+             "milliseconds")
+    return parser.parse_args()
+
+
+def get_driver_import_time(stderr):
+    """Return the time in milliseconds spent importing driver modules,
+    including the modules they import. Modules imported lazily by the
+    driver appear as separate top-level imports, so we sum the
+    cumulative times of all top-level driver imports."""
+    total = 0
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            module = match.group("module")
+            is_top_level = not module.startswith("  ")
+            if is_top_level and module.strip().split(".")[0] == "driver":
+                total += int(match.group("cumulative"))
+    return total / 1000
+
+
+def measure(call, cwd):
+    cmd = [sys.executable, "-X", "importtime", str(DRIVER)] + call
+    start = time.perf_counter()
+    result = subprocess.run(
+        cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True)
+    wall_time = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        sys.exit("{} failed with exit code {}".format(
+            " ".join(cmd), result.returncode))
+    return get_driver_import_time(result.stderr), wall_time
+
+
+def main():
+    args = parse_args()
+    failed = False
+    print("{:<20} {:>12} {:>12}".format("call", "import (ms)", "wall (ms)"))
+    for call in CALLS:
+        # Run in an empty directory since --cleanup deletes the files of
+        # previous planner runs in the current directory.
+        with tempfile.TemporaryDirectory() as cwd:
+            samples = [measure(call, cwd) for _ in range(args.runs)]
+        import_time = statistics.median(sample[0] for sample in samples)
+        wall_time = statistics.median(sample[1] for sample in samples)
+        marks = []
+        if args.max_import_time is not None and import_time > args.max_import_time:
+            marks.append("import time above threshold")
+        if args.max_wall_time is not None and wall_time > args.max_wall_time:
+            marks.append("wall-clock time above threshold")
+        failed = failed or bool(marks)
+        print("{:<20} {:>12.1f} {:>12.1f}  {}".format(
+            " ".join(call), import_time, wall_time, ", ".join(marks)))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Benchmark the graph algorithms of the translator (compact_graph.py).
+
+The script generates random graphs shaped like large causal graphs
+(sparse, a few big cycles) and axiom dependency graphs (long layered
+chains with many small cycles), runs SCC computation, reachability and
+transitive closure on them with compact_graph and with reference
+implementations over dicts and sets, reports the times of both, and
+exits with code 1 if the results differ.
+"""
+
+import argparse
+from collections import defaultdict
+from pathlib import Path
+import random
+import sys
+import time
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+sys.path.insert(0, str(REPO / "src" / "translate"))
+import compact_graph
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--nodes", type=int, default=100000,
+        help="number of nodes of the generated graphs (default: %(default)d)")
+    parser.add_argument(
+        "--closure-nodes", type=int, default=3000,
+        help="number of nodes of the graphs for the transitive closure "
+             "(default: %(default)d)")
+    parser.add_argument(
+        "--seed", type=int, default=2023,
+        help="random seed (default: %(default)d)")
+    return parser.parse_args()
+
+
+def generate_causal_graph(num_nodes, rng):
+    # Most arcs go from "lower" to "higher" variables, some go back
+    # and close large cycles.
+    adjacency_list = []
+    for node in range(num_nodes):
+        successors = set()
+        for _ in range(rng.randint(0, 6)):
+            if rng.random() < 0.05:
+                successors.add(rng.randrange(num_nodes))
+            else:
+                successors.add(min(num_nodes - 1, node + rng.randint(1, 50)))
+        successors.discard(node)
+        adjacency_list.append(sorted(successors))
+    return adjacency_list
+
+
+def generate_axiom_dependency_graph(num_nodes, rng):
+    # Layers of derived variables that depend on the next layer, with
+    # small cycles within layers.
+    layer_size = 20
+    adjacency_list = []
+    for node in range(num_nodes):
+        layer_start = node - node % layer_size
+        successors = set()
+        next_layer = layer_start + layer_size
+        for _ in range(rng.randint(1, 4)):
+            if next_layer < num_nodes:
+                successors.add(min(num_nodes - 1,
+                                   next_layer + rng.randrange(layer_size)))
+        if rng.random() < 0.3:
+            successors.add(layer_start + rng.randrange(layer_size))
+        successors.discard(node)
+        adjacency_list.append(sorted(v for v in successors if v < num_nodes))
+    return adjacency_list
+
+
+def reference_sccs(adjacency_list):
+    """Iterative Tarjan over dicts (the previous implementation)."""
+    indices = {}
+    lowlinks = defaultdict(lambda: -1)
+    stack_indices = {}
+    stack = []
+    sccs = []
+    current_index = 0
+    for root in range(len(adjacency_list)):
+        if root in indices:
+            continue
+        iter_stack = [(root, None, None, 0)]
+        while iter_stack:
+            v, w, succ_index, state = iter_stack.pop()
+            if state == 0:
+                current_index += 1
+                indices[v] = lowlinks[v] = current_index
+                stack_indices[v] = len(stack)
+                stack.append(v)
+                iter_stack.append((v, None, 0, 1))
+            elif state == 1:
+                successors = adjacency_list[v]
+                if succ_index == len(successors):
+                    if lowlinks[v] == indices[v]:
+                        stack_index = stack_indices[v]
+                        scc = stack[stack_index:]
+                        del stack[stack_index:]
+                        for n in scc:
+                            del stack_indices[n]
+                        sccs.append(scc)
+                else:
+                    w = successors[succ_index]
+                    if w not in indices:
+                        iter_stack.append((v, w, succ_index, 2))
+                        iter_stack.append((w, None, None, 0))
+                    else:
+                        if w in stack_indices:
+                            lowlinks[v] = min(lowlinks[v], indices[w])
+                        iter_stack.append((v, None, succ_index + 1, 1))
+            else:
+                lowlinks[v] = min(lowlinks[v], lowlinks[w])
+                iter_stack.append((v, None, succ_index + 1, 1))
+    sccs.reverse()
+    return sccs
+
+
+def reference_reachable(adjacency_list, sources):
+    arcs = {node: set(successors)
+            for node, successors in enumerate(adjacency_list)}
+    queue = list(sources)
+    reachable = set(queue)
+    while queue:
+        node = queue.pop()
+        new_neighbors = arcs[node] - reachable
+        reachable |= new_neighbors
+        queue.extend(new_neighbors)
+    return reachable
+
+
+def reference_transitive_closure(adjacency_list):
+    closure = []
+    for node in range(len(adjacency_list)):
+        reachable = reference_reachable(
+            adjacency_list, adjacency_list[node])
+        closure.append(sorted(reachable))
+    return closure
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(name, adjacency_list, closure_adjacency_list, rng):
+    failed = False
+    sources = rng.sample(range(len(adjacency_list)), 10)
+
+    def compact_sccs():
+        graph = compact_graph.CompactGraph.from_adjacency_list(adjacency_list)
+        return graph.get_sccs()
+
+    def compact_reachable():
+        graph = compact_graph.CompactGraph.from_adjacency_list(adjacency_list)
+        reached = graph.get_reachable(sources)
+        return {node for node in range(graph.num_nodes) if reached[node]}
+
+    def compact_transitive_closure():
+        graph = compact_graph.CompactGraph.from_adjacency_list(
+            closure_adjacency_list)
+        return [compact_graph.get_nodes(bitset)
+                for bitset in graph.get_transitive_closure()]
+
+    benchmarks = [
+        ("SCCs", reference_sccs, (adjacency_list,), compact_sccs),
+        ("reachability", reference_reachable, (adjacency_list, sources),
+         compact_reachable),
+        ("transitive closure", reference_transitive_closure,
+         (closure_adjacency_list,), compact_transitive_closure),
+    ]
+    for algorithm, reference, args, compact in benchmarks:
+        expected, reference_time = measure(reference, *args)
+        result, compact_time = measure(compact)
+        mark = ""
+        if result != expected:
+            failed = True
+            mark = "  results differ"
+        print("{:<24} {:<20} {:>14.3f} {:>14.3f}{}".format(
+            name, algorithm, reference_time, compact_time, mark))
+    return failed
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print("{:<24} {:<20} {:>14} {:>14}".format(
+        "graph", "algorithm", "reference (s)", "compact (s)"))
+    failed = False
+    for name, generate in [
+            ("causal graph", generate_causal_graph),
+            ("axiom dependencies", generate_axiom_dependency_graph)]:
+        adjacency_list = generate(args.nodes, rng)
+        closure_adjacency_list = generate(args.closure_nodes, rng)
+        if run_benchmark(name, adjacency_list, closure_adjacency_list, rng):
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
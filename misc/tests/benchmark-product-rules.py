@@ -0,0 +1,197 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Benchmark the product rules of the translator's Datalog exploration.
+
+The script generates tasks with an action whose parameters are
+constrained by independent preconditions, which leads to product rules
+with large cartesian products in the Datalog program. It computes the
+model of each program and then replays the atoms of the model on the
+product rules, once with build_model.ProductRule and once with a
+reference implementation that recomputes the bindings of all atoms of
+the other conditions whenever a rule fires (the previous
+implementation). It reports the times spent in the product rules and
+exits with code 1 if the rules generate different effects.
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+TRANSLATE_DIR = REPO / "src" / "translate"
+
+DOMAIN = """\
+(define (domain product)
+  (:requirements :strips :typing)
+  (:types obj)
+  (:predicates (reached ?x - obj) (link ?x ?y - obj) {predicates})
+  (:action step
+    :parameters (?x ?y - obj)
+    :precondition (and (reached ?x) (link ?x ?y))
+    :effect (reached ?y))
+  (:action combine
+    :parameters ({parameters})
+    :precondition (and {preconditions})
+    :effect (and {effects})))
+"""
+
+PROBLEM = """\
+(define (problem product-{size})
+  (:domain product)
+  (:objects {objects} - obj)
+  (:init (reached o0) {links})
+  (:goal (and {goals})))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 200, 400],
+        help="numbers of objects of the generated tasks (default: %(default)s)")
+    parser.add_argument(
+        "--factors", type=int, default=2,
+        help="number of independent conditions of the product rule "
+             "(default: %(default)d)")
+    return parser.parse_args()
+
+
+def write_task(directory, size, factors):
+    # The objects are reached one after the other along a chain of
+    # links, so the product rule fires for every reached object, with
+    # growing lists of atoms for the other conditions.
+    variables = ["?v%d" % i for i in range(factors)]
+    domain = DOMAIN.format(
+        predicates=" ".join("(done%d ?x - obj)" % i for i in range(factors)),
+        parameters=" ".join(variables) + " - obj",
+        preconditions=" ".join("(reached %s)" % var for var in variables),
+        effects=" ".join("(done%d %s)" % (i, var)
+                         for i, var in enumerate(variables)))
+    problem = PROBLEM.format(
+        size=size,
+        objects=" ".join("o%d" % i for i in range(size)),
+        links=" ".join("(link o%d o%d)" % (i, i + 1) for i in range(size - 1)),
+        goals=" ".join("(done%d o%d)" % (i, size - 1) for i in range(factors)))
+    domain_file = Path(directory) / "domain.pddl"
+    problem_file = Path(directory) / ("problem-%d.pddl" % size)
+    domain_file.write_text(domain)
+    problem_file.write_text(problem)
+    return str(domain_file), str(problem_file)
+
+
+def import_translator(domain_file, task_file):
+    # The translator modules read their settings from the options module.
+    sys.argv[1:] = [domain_file, task_file]
+    sys.path.insert(0, str(TRANSLATE_DIR))
+    global build_model, normalize, pddl_parser, pddl_to_prolog
+    import build_model
+    import normalize
+    import options
+    import pddl_parser
+    import pddl_to_prolog
+    options.setup()
+
+
+def get_reference_product_rule():
+    class ReferenceProductRule(build_model.BuildRule):
+        """ProductRule that recomputes the bindings when firing."""
+        def __init__(self, effect, conditions):
+            self.effect = effect
+            self.conditions = conditions
+            self.atoms_by_index = [[] for c in self.conditions]
+            self.empty_atom_list_no = len(self.conditions)
+        def validate(self):
+            pass
+        def update_index(self, new_atom, cond_index):
+            atom_list = self.atoms_by_index[cond_index]
+            if not atom_list:
+                self.empty_atom_list_no -= 1
+            atom_list.append(new_atom)
+        def _get_bindings(self, atom, cond):
+            return [(var_no, obj) for var_no, obj in zip(cond.args, atom.args)
+                    if isinstance(var_no, int)]
+        def fire(self, new_atom, cond_index, enqueue_func):
+            if self.empty_atom_list_no:
+                return
+            bindings_factors = []
+            for pos, cond in enumerate(self.conditions):
+                if pos == cond_index:
+                    continue
+                atoms = self.atoms_by_index[pos]
+                factor = [self._get_bindings(atom, cond) for atom in atoms]
+                bindings_factors.append(factor)
+            eff_args = self.prepare_effect(new_atom, cond_index)
+            for bindings_list in itertools.product(*bindings_factors):
+                bindings = itertools.chain(*bindings_list)
+                for var_no, obj in bindings:
+                    eff_args[var_no] = obj
+                enqueue_func(self.effect.predicate, eff_args)
+    return ReferenceProductRule
+
+
+def fire_product_rules(prog, model, product_rule_class):
+    product_rule = build_model.ProductRule
+    build_model.ProductRule = product_rule_class
+    try:
+        rules = build_model.convert_rules(prog)
+    finally:
+        build_model.ProductRule = product_rule
+    unifier = build_model.Unifier(rules)
+    matches = [
+        (atom, [(rule, cond_index)
+                for rule, cond_index in unifier.unify(atom)
+                if isinstance(rule, product_rule_class)])
+        for atom in model]
+    effects = []
+    def enqueue_func(predicate, args):
+        effects.append((predicate, tuple(args)))
+    start = time.perf_counter()
+    for atom, rule_matches in matches:
+        for rule, cond_index in rule_matches:
+            rule.update_index(atom, cond_index)
+            rule.fire(atom, cond_index, enqueue_func)
+    return effects, time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    failed = False
+    print("{:<24} {:>10} {:>10} {:>14} {:>14}".format(
+        "task", "atoms", "effects", "reference (s)", "cached (s)"))
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = [write_task(directory, size, args.factors)
+                 for size in args.sizes]
+        import_translator(*tasks[0])
+        reference_rule = get_reference_product_rule()
+        for size, (domain_file, task_file) in zip(args.sizes, tasks):
+            with contextlib.redirect_stdout(io.StringIO()):
+                task = pddl_parser.open(domain_file, task_file)
+                normalize.normalize(task)
+                prog = pddl_to_prolog.translate(task)
+                model = build_model.compute_model(prog)
+            expected, reference_time = fire_product_rules(
+                prog, model, reference_rule)
+            effects, cached_time = fire_product_rules(
+                prog, model, build_model.ProductRule)
+            mark = ""
+            if effects != expected:
+                failed = True
+                mark = "  effects differ"
+            print("{:<24} {:>10} {:>10} {:>14.3f} {:>14.3f}{}".format(
+                "product-%d" % size, len(model), len(effects), reference_time,
+                cached_time, mark))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
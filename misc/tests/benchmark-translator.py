@@ -0,0 +1,388 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Benchmark the translator and detect performance regressions.
+
+The "run" command translates each task of a suite several times,
+collects the CPU and wall-clock times of all phases reported by
+timers.timing, the startup time (imports and option parsing before the
+translator's own timer starts), the time for starting a bare Python
+interpreter, which is not included in the startup time, as well as the
+peak memory, and stores the results for the given revision in a JSON history file. The "compare" command
+compares two revisions from the history file and flags phases that
+became significantly slower (permutation test on the per-run samples).
+"""
+
+import argparse
+from collections import defaultdict
+import datetime
+import itertools
+import json
+import os
+from pathlib import Path
+import random
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+TRANSLATOR = REPO / "src" / "translate" / "translate.py"
+BENCHMARKS = DIR / "benchmarks"
+DEFAULT_HISTORY = DIR / "translator-benchmarks.json"
+
+sys.path.insert(0, str(REPO))
+from driver.util import find_domain_filename
+
+# Matches "Phase: [...]" (block timers) and "Phase... [...]" (inline timers).
+TIMING_PATTERN = re.compile(
+    r"^(?P<phase>.+?)(?::|\.\.\.) "
+    r"\[(?P<cpu>\d+\.\d+)s CPU, (?P<wall>\d+\.\d+)s wall-clock\]$")
+TOTAL_PATTERN = re.compile(
+    r"^Done! \[(?P<cpu>\d+\.\d+)s CPU, (?P<wall>\d+\.\d+)s wall-clock\]$")
+PEAK_MEMORY_PATTERN = re.compile(r"^Translator peak memory: (?P<memory>\d+) KB$")
+TOTAL = "Total"
+STARTUP = "Startup"
+INTERPRETER_STARTUP = "Interpreter startup"
+PEAK_MEMORY = "Peak memory (KB)"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--history", type=Path, default=DEFAULT_HISTORY,
+        help="path to the JSON history file (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="benchmark the translator of the working copy")
+    run_parser.add_argument(
+        "suite", nargs="*", default=["first"],
+        help='Use "all" to benchmark all tasks, '
+             '"first" to benchmark the first task of each domain (default), '
+             'or "<domain>:<problem>" to benchmark individual tasks')
+    run_parser.add_argument(
+        "--benchmarks-dir", type=Path, action="append",
+        help="benchmark directory; can be given multiple times to add "
+             "user-supplied suites (default: %s)" % BENCHMARKS)
+    run_parser.add_argument(
+        "--runs-per-task", type=int, default=5,
+        help="translate each task this many times (default: %(default)d)")
+    run_parser.add_argument(
+        "--revision",
+        help="name under which the results are stored "
+             "(default: current git revision)")
+    run_parser.add_argument(
+        "translator_options", nargs=argparse.REMAINDER,
+        help="options passed to the translator (separate with --)")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="compare two revisions from the history file")
+    compare_parser.add_argument("old_revision")
+    compare_parser.add_argument("new_revision")
+    compare_parser.add_argument(
+        "--metric", choices=["cpu", "wall"], default="cpu",
+        help="which time to compare (default: %(default)s)")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.05,
+        help="minimum relative slowdown to report (default: %(default)s)")
+    compare_parser.add_argument(
+        "--alpha", type=float, default=0.05,
+        help="significance level of the permutation test (default: %(default)s)")
+    compare_parser.add_argument(
+        "--min-time", type=float, default=0.01,
+        help="ignore phases whose mean time is below this many seconds "
+             "(default: %(default)s)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        args.benchmarks_dir = [
+            path.resolve() for path in args.benchmarks_dir or [BENCHMARKS]]
+        if args.translator_options and args.translator_options[0] == "--":
+            args.translator_options = args.translator_options[1:]
+    return args
+
+
+def get_git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+            encoding="utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        sys.exit("Error: could not determine git revision, use --revision.")
+
+
+def get_task_name(path):
+    return "-".join(str(path).split("/")[-2:])
+
+
+def _get_all_tasks_by_domain(benchmarks_dir):
+    tasks = []
+    for domain_dir in sorted(benchmarks_dir.iterdir()):
+        if (not domain_dir.is_dir() or
+                domain_dir.name.startswith((".", "_", "unofficial"))):
+            continue
+        domain_tasks = [
+            f for f in sorted(domain_dir.iterdir())
+            if "domain" not in f.name and f.suffix == ".pddl"]
+        if domain_tasks:
+            tasks.append(domain_tasks)
+    return tasks
+
+
+def get_tasks(args):
+    suite = []
+    for benchmarks_dir in args.benchmarks_dir:
+        tasks_by_domain = _get_all_tasks_by_domain(benchmarks_dir)
+        for task in args.suite:
+            if task == "first":
+                suite.extend(tasks[0] for tasks in tasks_by_domain)
+            elif task == "all":
+                suite.extend(itertools.chain.from_iterable(tasks_by_domain))
+            else:
+                path = benchmarks_dir / task.replace(":", "/")
+                if path.exists():
+                    suite.append(path)
+    return sorted(set(suite))
+
+
+def parse_translator_output(output):
+    """Return a dictionary mapping phase names to (cpu, wall) pairs
+    and the peak memory in KB (or None if it is not reported)."""
+    phases = defaultdict(lambda: [0.0, 0.0])
+    peak_memory = None
+    for line in output.splitlines():
+        line = line.strip()
+        match = TOTAL_PATTERN.match(line)
+        if match:
+            phase = TOTAL
+        else:
+            match = TIMING_PATTERN.match(line)
+            if match:
+                phase = match.group("phase")
+        if match:
+            # Phases that occur several times are summed up.
+            phases[phase][0] += float(match.group("cpu"))
+            phases[phase][1] += float(match.group("wall"))
+            continue
+        match = PEAK_MEMORY_PATTERN.match(line)
+        if match:
+            peak_memory = int(match.group("memory"))
+    return dict(phases), peak_memory
+
+
+def _get_children_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_process(cmd):
+    """Run cmd and return its output together with the CPU and
+    wall-clock time of the process."""
+    start_cpu = _get_children_cpu_time()
+    start_wall = time.perf_counter()
+    try:
+        output = subprocess.check_output(
+            cmd, encoding=sys.getfilesystemencoding(),
+            stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError) as err:
+        sys.exit(f"Call failed: {' '.join(cmd)}\n{err}")
+    return (output, _get_children_cpu_time() - start_cpu,
+            time.perf_counter() - start_wall)
+
+
+def translate_task(task_file, translator_options, sas_file):
+    """Translate the task and return the output together with the CPU
+    and wall-clock time of the whole translator process."""
+    domain_file = find_domain_filename(str(task_file))
+    return run_process(
+        [sys.executable, str(TRANSLATOR), domain_file, str(task_file),
+         "--sas-file", str(sas_file)] + translator_options)
+
+
+def start_interpreter():
+    """Return the CPU and wall-clock time of starting and stopping a
+    Python interpreter that does nothing."""
+    _, cpu, wall = run_process([sys.executable, "-c", ""])
+    return cpu, wall
+
+
+def benchmark_task(task_file, args):
+    samples = defaultdict(lambda: {"cpu": [], "wall": []})
+    peak_memory = []
+    sas_file = Path(f"benchmark-translator-{os.getpid()}.sas")
+    try:
+        for _ in range(args.runs_per_task):
+            output, process_cpu, process_wall = translate_task(
+                task_file, args.translator_options, sas_file)
+            phases, memory = parse_translator_output(output)
+            if TOTAL in phases:
+                total_cpu, total_wall = phases[TOTAL]
+                interpreter_cpu, interpreter_wall = start_interpreter()
+                phases[INTERPRETER_STARTUP] = (interpreter_cpu,
+                                               interpreter_wall)
+                phases[STARTUP] = (
+                    max(0.0, process_cpu - total_cpu - interpreter_cpu),
+                    max(0.0, process_wall - total_wall - interpreter_wall))
+            for phase, (cpu, wall) in phases.items():
+                samples[phase]["cpu"].append(cpu)
+                samples[phase]["wall"].append(wall)
+            if memory is not None:
+                peak_memory.append(memory)
+    finally:
+        if sas_file.exists():
+            sas_file.unlink()
+    return {"phases": dict(samples), "peak_memory_kb": peak_memory}
+
+
+def load_history(path):
+    if path.exists():
+        with open(path) as history_file:
+            return json.load(history_file)
+    return {"revisions": {}}
+
+
+def write_history(path, history):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as history_file:
+        json.dump(history, history_file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def run(args):
+    revision = args.revision or get_git_revision()
+    tasks = get_tasks(args)
+    if not tasks:
+        sys.exit("Error: no tasks found.")
+    results = {}
+    for task in tasks:
+        name = get_task_name(task)
+        print(f"Benchmark {name}", flush=True)
+        results[name] = benchmark_task(task, args)
+        phases = results[name]["phases"]
+        total = phases.get(TOTAL, {}).get("cpu", [])
+        if total:
+            print(f"  total CPU time: {statistics.mean(total):.3f}s "
+                  f"(mean of {len(total)} runs)", flush=True)
+        startup = phases.get(STARTUP, {}).get("wall", [])
+        if startup:
+            print(f"  startup wall-clock time: {statistics.mean(startup):.3f}s",
+                  flush=True)
+    history = load_history(args.history)
+    history["revisions"][revision] = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "runs_per_task": args.runs_per_task,
+        "translator_options": args.translator_options,
+        "tasks": results,
+    }
+    write_history(args.history, history)
+    print(f"Results for revision {revision} written to {args.history}")
+
+
+def permutation_test(old, new, num_samples=10000, seed=2022):
+    """Return the one-sided p-value for the hypothesis that the values
+    in *new* are larger than those in *old*. Uses all permutations if
+    there are at most *num_samples* of them and random permutations
+    (with a fixed seed) otherwise."""
+    observed = statistics.mean(new) - statistics.mean(old)
+    values = old + new
+    num_old = len(old)
+    total = sum(values)
+
+    def difference(old_indices):
+        old_sum = sum(values[i] for i in old_indices)
+        return ((total - old_sum) / len(new)) - (old_sum / num_old)
+
+    num_combinations = 1
+    for i in range(num_old):
+        num_combinations = num_combinations * (len(values) - i) // (i + 1)
+    if num_combinations <= num_samples:
+        splits = itertools.combinations(range(len(values)), num_old)
+        num_splits = num_combinations
+    else:
+        rng = random.Random(seed)
+        splits = (rng.sample(range(len(values)), num_old)
+                  for _ in range(num_samples))
+        num_splits = num_samples
+    # Small tolerance against rounding errors for identical splits.
+    at_least_as_extreme = sum(
+        1 for split in splits if difference(split) >= observed - 1e-12)
+    return at_least_as_extreme / num_splits
+
+
+def compare_samples(old, new, args):
+    """Return (relative change, p-value, is_regression) or None if
+    the samples are not comparable."""
+    if len(old) < 2 or len(new) < 2:
+        return None
+    old_mean = statistics.mean(old)
+    new_mean = statistics.mean(new)
+    if max(old_mean, new_mean) < args.min_time or old_mean <= 0:
+        return None
+    change = (new_mean - old_mean) / old_mean
+    p_value = permutation_test(old, new)
+    is_regression = change > args.threshold and p_value < args.alpha
+    return change, p_value, is_regression
+
+
+def compare(args):
+    history = load_history(args.history)
+    revisions = history["revisions"]
+    for revision in [args.old_revision, args.new_revision]:
+        if revision not in revisions:
+            sys.exit(f"Error: revision {revision} not in {args.history}")
+    old_tasks = revisions[args.old_revision]["tasks"]
+    new_tasks = revisions[args.new_revision]["tasks"]
+    common_tasks = sorted(set(old_tasks) & set(new_tasks))
+    if not common_tasks:
+        sys.exit("Error: the revisions have no tasks in common.")
+
+    regressions = []
+    print(f"Comparing {args.old_revision} (old) with {args.new_revision} "
+          f"(new), metric: {args.metric}")
+    for task in common_tasks:
+        print(f"\n{task}")
+        old_phases = old_tasks[task]["phases"]
+        new_phases = new_tasks[task]["phases"]
+        rows = [(phase, old_phases[phase][args.metric],
+                 new_phases[phase][args.metric])
+                for phase in sorted(set(old_phases) & set(new_phases))]
+        rows.append((PEAK_MEMORY, old_tasks[task]["peak_memory_kb"],
+                     new_tasks[task]["peak_memory_kb"]))
+        for phase, old, new in rows:
+            result = compare_samples(old, new, args)
+            if result is None:
+                continue
+            change, p_value, is_regression = result
+            marker = "  <-- SLOWDOWN" if is_regression else ""
+            print(f"  {phase:<45} {statistics.mean(old):>10.3f} "
+                  f"{statistics.mean(new):>10.3f} {change:>+8.1%} "
+                  f"p={p_value:.3f}{marker}")
+            if is_regression:
+                regressions.append((task, phase, change))
+
+    print()
+    if regressions:
+        print(f"{len(regressions)} significant slowdown(s):")
+        for task, phase, change in regressions:
+            print(f"  {task}: {phase} ({change:+.1%})")
+        sys.exit(1)
+    print("No significant slowdowns.")
+
+
+def main():
+    args = parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
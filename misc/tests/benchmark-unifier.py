@@ -0,0 +1,142 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Benchmark the unification step of the translator's Datalog exploration.
+
+For each task, the script computes the model of the Datalog program and
+then matches all atoms of the model against the rule conditions, once
+by walking the decision trees of build_model.Unifier (the previous
+implementation) and once with its dispatch tables. It reports the
+times of both and exits with code 1 if the matches differ for any atom.
+"""
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+import sys
+import time
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+TRANSLATE_DIR = REPO / "src" / "translate"
+BENCHMARKS = DIR / "benchmarks"
+
+sys.path.insert(0, str(REPO))
+from driver.util import find_domain_filename
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "tasks", nargs="*", type=Path,
+        help="task files (default: first task of each domain in %s)" % BENCHMARKS)
+    parser.add_argument(
+        "--repetitions", type=int, default=3,
+        help="match the atoms this many times and report the fastest run "
+             "(default: %(default)d)")
+    return parser.parse_args()
+
+
+def get_default_tasks():
+    tasks = []
+    for domain_dir in sorted(BENCHMARKS.iterdir()):
+        if not domain_dir.is_dir():
+            continue
+        domain_tasks = sorted(
+            f for f in domain_dir.iterdir()
+            if "domain" not in f.name and f.suffix == ".pddl")
+        if domain_tasks:
+            tasks.append(domain_tasks[0])
+    return tasks
+
+
+def import_translator(domain_file, task_file):
+    # The translator modules read their settings from the options module.
+    sys.argv[1:] = [domain_file, task_file]
+    sys.path.insert(0, str(TRANSLATE_DIR))
+    global build_model, normalize, pddl_parser, pddl_to_prolog
+    import build_model
+    import normalize
+    import options
+    import pddl_parser
+    import pddl_to_prolog
+    options.setup()
+
+
+def compute_rules_and_model(domain_file, task_file):
+    # Hide the progress output of the translator.
+    with contextlib.redirect_stdout(io.StringIO()):
+        task = pddl_parser.open(domain_file, task_file)
+        normalize.normalize(task)
+        prog = pddl_to_prolog.translate(task)
+        rules = build_model.convert_rules(prog)
+        model = build_model.compute_model(prog)
+    return rules, model
+
+
+def unify_with_trees(unifier, atoms):
+    result = []
+    for atom in atoms:
+        matches = []
+        generator = unifier.predicate_to_rule_generator.get(atom.predicate)
+        if generator:
+            generator.generate(atom, matches)
+        result.append(tuple(matches))
+    return result
+
+
+def unify_with_dispatch_tables(unifier, atoms):
+    return [tuple(unifier.unify(atom)) for atom in atoms]
+
+
+def time_unifier(unify_func, rules, atoms, repetitions):
+    best_time = None
+    for _ in range(repetitions):
+        # Build a new unifier so that filling the caches is measured, too.
+        unifier = build_model.Unifier(rules)
+        start = time.perf_counter()
+        matches = unify_func(unifier, atoms)
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return matches, best_time
+
+
+def main():
+    args = parse_args()
+    tasks = [task.resolve() for task in args.tasks] or get_default_tasks()
+    import_translator(find_domain_filename(str(tasks[0])), str(tasks[0]))
+
+    failed = False
+    total_tree_time = 0
+    total_table_time = 0
+    print("{:<40} {:>8} {:>8} {:>14} {:>14}".format(
+        "task", "rules", "atoms", "trees (s)", "tables (s)"))
+    for task_file in tasks:
+        name = "-".join(str(task_file).split("/")[-2:])
+        rules, atoms = compute_rules_and_model(
+            find_domain_filename(str(task_file)), str(task_file))
+        expected, tree_time = time_unifier(
+            unify_with_trees, rules, atoms, args.repetitions)
+        matches, table_time = time_unifier(
+            unify_with_dispatch_tables, rules, atoms, args.repetitions)
+        total_tree_time += tree_time
+        total_table_time += table_time
+        mark = ""
+        if matches != expected:
+            failed = True
+            mark = "  matches differ on {} atoms".format(
+                sum(m != e for m, e in zip(matches, expected)))
+        print("{:<40} {:>8} {:>8} {:>14.4f} {:>14.4f}{}".format(
+            name, len(rules), len(atoms), tree_time, table_time, mark))
+    print("{:<40} {:>8} {:>8} {:>14.4f} {:>14.4f}".format(
+        "total", "", "", total_tree_time, total_table_time))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
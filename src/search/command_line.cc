@@ -105,6 +105,11 @@ static shared_ptr<SearchEngine> parse_cmd_line_aux(
             num_previously_generated_plans = parse_int_arg(arg, args[i]);
             if (num_previously_generated_plans < 0)
                 throw ArgError("argument for --internal-previous-portfolio-plans must be positive");
+        } else if (arg == "--internal-task-cache") {
+            // Handled by get_task_cache_filename before reading the task.
+            if (is_last)
+                throw ArgError("missing argument after --internal-task-cache");
+            ++i;
         } else if (utils::startswith(arg, "--") &&
                    registry.is_predefinition(arg.substr(2))) {
             if (is_last)
@@ -150,6 +155,16 @@ shared_ptr<SearchEngine> parse_cmd_line(
 }
 
 
+string get_task_cache_filename(int argc, const char **argv) {
+    for (int i = 1; i < argc - 1; ++i) {
+        if (sanitize_arg_string(argv[i]) == "--internal-task-cache") {
+            return argv[i + 1];
+        }
+    }
+    return "";
+}
+
+
 string usage(const string &progname) {
     return "usage: \n" +
            progname + " [OPTIONS] --search SEARCH < OUTPUT\n\n"
@@ -171,5 +186,8 @@ string usage(const string &progname) {
            "    This planner call is part of a portfolio which already created\n"
            "    plan files FILENAME.1 up to FILENAME.COUNTER.\n"
            "    Start enumerating plan files with COUNTER+1, i.e. FILENAME.COUNTER+1\n\n"
+           "--internal-task-cache FILENAME\n"
+           "    Read the task from the task cache FILENAME instead of OUTPUT if\n"
+           "    it exists, and write it there otherwise.\n\n"
            "See https://www.fast-downward.org for details.";
 }
@@ -24,6 +24,13 @@ extern std::shared_ptr<SearchEngine> parse_cmd_line(
     int argc, const char **argv, options::Registry &registry, bool dry_run,
     bool is_unit_cost);
 
+/*
+  Return the argument of --internal-task-cache, or the empty string if
+  the option is not given. Unlike the other options, it is needed before
+  the task is read, so it is not handled by parse_cmd_line.
+*/
+extern std::string get_task_cache_filename(int argc, const char **argv);
+
 extern std::string usage(const std::string &progname);
 
 #endif
@@ -25,7 +25,12 @@ int main(int argc, const char **argv) {
     bool unit_cost = false;
     if (static_cast<string>(argv[1]) != "--help") {
         utils::g_log << "reading input..." << endl;
-        tasks::read_root_task(cin);
+        string task_cache_filename = get_task_cache_filename(argc, argv);
+        if (task_cache_filename.empty()) {
+            tasks::read_root_task(cin);
+        } else {
+            tasks::read_root_task_with_cache(cin, task_cache_filename);
+        }
         utils::g_log << "done reading input!" << endl;
         TaskProxy task_proxy(*tasks::g_root_task);
         unit_cost = task_properties::is_unit_cost(task_proxy);
@@ -52,6 +57,7 @@ int main(int argc, const char **argv) {
         utils::exit_with(ExitCode::SEARCH_INPUT_ERROR);
     }
 
+    utils::g_log << "Startup time: " << utils::g_timer << endl;
     utils::Timer search_timer;
     engine->search();
     search_timer.stop();
@@ -5,10 +5,13 @@
 #include "../state_registry.h"
 
 #include "../utils/collections.h"
+#include "../utils/logging.h"
 #include "../utils/timer.h"
 
 #include <algorithm>
 #include <cassert>
+#include <cstdio>
+#include <fstream>
 #include <memory>
 #include <set>
 #include <unordered_set>
@@ -20,6 +23,8 @@ using utils::ExitCode;
 
 namespace tasks {
 static const int PRE_FILE_VERSION = 3;
+static const string TASK_CACHE_MAGIC = "fast-downward-task-cache";
+static const int TASK_CACHE_VERSION = 1;
 shared_ptr<AbstractTask> g_root_task = nullptr;
 
 struct ExplicitVariable {
@@ -29,6 +34,7 @@ struct ExplicitVariable {
     int axiom_layer;
     int axiom_default_value;
 
+    ExplicitVariable() = default;
     explicit ExplicitVariable(istream &in);
 };
 
@@ -49,6 +55,7 @@ struct ExplicitOperator {
     bool is_an_axiom;
 
     void read_pre_post(istream &in);
+    ExplicitOperator() = default;
     ExplicitOperator(istream &in, bool is_an_axiom, bool use_metric);
 };
 
@@ -66,9 +73,20 @@ class RootTask : public AbstractTask {
     const ExplicitEffect &get_effect(int op_id, int effect_id, bool is_axiom) const;
     const ExplicitOperator &get_operator_or_axiom(int index, bool is_axiom) const;
 
+    RootTask() = default;
+    void evaluate_axioms_in_initial_state();
+
 public:
     explicit RootTask(istream &in);
 
+    /*
+      Read and write the task in the binary format of the task cache (see
+      read_root_task_with_cache). read_from_cache returns nullptr if the
+      stream does not start with the header of the current format.
+    */
+    static shared_ptr<RootTask> read_from_cache(istream &in);
+    void write_to_cache(ostream &out) const;
+
     virtual int get_num_variables() const override;
     virtual string get_variable_name(int var) const override;
     virtual int get_variable_domain_size(int var) const override;
@@ -351,6 +369,10 @@ RootTask::RootTask(istream &in) {
     /* TODO: We should be stricter here and verify that we
        have reached the end of "in". */
 
+    evaluate_axioms_in_initial_state();
+}
+
+void RootTask::evaluate_axioms_in_initial_state() {
     /*
       HACK: We use a TaskProxy to access g_axiom_evaluators here which assumes
       that this task is completely constructed.
@@ -359,6 +381,160 @@ RootTask::RootTask(istream &in) {
     axiom_evaluator.evaluate(initial_state_values);
 }
 
+/*
+  The task cache stores the parsed task in a binary format: integers are
+  stored in the native representation of the machine, strings as their
+  length followed by their characters, and vectors as their size
+  followed by their elements. The cache is only meant to be read by the
+  planner binary that wrote it.
+*/
+static void write_int(ostream &out, int value) {
+    out.write(reinterpret_cast<const char *>(&value), sizeof(value));
+}
+
+static int read_int(istream &in) {
+    int value = 0;
+    in.read(reinterpret_cast<char *>(&value), sizeof(value));
+    return value;
+}
+
+static void write_string(ostream &out, const string &value) {
+    write_int(out, value.size());
+    out.write(value.data(), value.size());
+}
+
+static string read_string(istream &in) {
+    string value(read_int(in), '\0');
+    in.read(&value[0], value.size());
+    return value;
+}
+
+static void write_fact(ostream &out, const FactPair &fact) {
+    write_int(out, fact.var);
+    write_int(out, fact.value);
+}
+
+static FactPair read_fact(istream &in) {
+    int var = read_int(in);
+    int value = read_int(in);
+    return FactPair(var, value);
+}
+
+template<typename Facts>
+static void write_facts(ostream &out, const Facts &facts) {
+    write_int(out, facts.size());
+    for (const FactPair &fact : facts) {
+        write_fact(out, fact);
+    }
+}
+
+static vector<FactPair> read_cached_facts(istream &in) {
+    vector<FactPair> facts(read_int(in), FactPair::no_fact);
+    for (FactPair &fact : facts) {
+        fact = read_fact(in);
+    }
+    return facts;
+}
+
+static void write_operators(ostream &out, const vector<ExplicitOperator> &ops) {
+    write_int(out, ops.size());
+    for (const ExplicitOperator &op : ops) {
+        write_string(out, op.name);
+        write_int(out, op.cost);
+        write_facts(out, op.preconditions);
+        write_int(out, op.effects.size());
+        for (const ExplicitEffect &effect : op.effects) {
+            write_fact(out, effect.fact);
+            write_facts(out, effect.conditions);
+        }
+    }
+}
+
+static vector<ExplicitOperator> read_cached_operators(
+    istream &in, bool is_axiom) {
+    vector<ExplicitOperator> ops(read_int(in));
+    for (ExplicitOperator &op : ops) {
+        op.is_an_axiom = is_axiom;
+        op.name = read_string(in);
+        op.cost = read_int(in);
+        op.preconditions = read_cached_facts(in);
+        int num_effects = read_int(in);
+        op.effects.reserve(num_effects);
+        for (int i = 0; i < num_effects; ++i) {
+            FactPair fact = read_fact(in);
+            op.effects.emplace_back(fact.var, fact.value, read_cached_facts(in));
+        }
+    }
+    return ops;
+}
+
+shared_ptr<RootTask> RootTask::read_from_cache(istream &in) {
+    string magic(TASK_CACHE_MAGIC.size(), '\0');
+    in.read(&magic[0], magic.size());
+    if (!in || magic != TASK_CACHE_MAGIC ||
+        read_int(in) != TASK_CACHE_VERSION || !in) {
+        return nullptr;
+    }
+    shared_ptr<RootTask> task(new RootTask());
+    task->variables.resize(read_int(in));
+    for (ExplicitVariable &var : task->variables) {
+        var.name = read_string(in);
+        var.axiom_layer = read_int(in);
+        var.axiom_default_value = read_int(in);
+        var.domain_size = read_int(in);
+        var.fact_names.resize(var.domain_size);
+        for (string &fact_name : var.fact_names) {
+            fact_name = read_string(in);
+        }
+    }
+    task->mutexes.resize(task->variables.size());
+    for (size_t var = 0; var < task->variables.size(); ++var) {
+        task->mutexes[var].resize(task->variables[var].domain_size);
+        for (set<FactPair> &mutex_facts : task->mutexes[var]) {
+            vector<FactPair> facts = read_cached_facts(in);
+            mutex_facts.insert(facts.begin(), facts.end());
+        }
+    }
+    task->operators = read_cached_operators(in, false);
+    task->axioms = read_cached_operators(in, true);
+    task->goals = read_cached_facts(in);
+    if (!in) {
+        cerr << "Task cache is truncated." << endl;
+        utils::exit_with(ExitCode::SEARCH_CRITICAL_ERROR);
+    }
+
+    // The initial state values before evaluating the axioms are the
+    // default values of the variables (see RootTask(istream &)).
+    for (const ExplicitVariable &var : task->variables) {
+        task->initial_state_values.push_back(var.axiom_default_value);
+    }
+    task->evaluate_axioms_in_initial_state();
+    return task;
+}
+
+void RootTask::write_to_cache(ostream &out) const {
+    out.write(TASK_CACHE_MAGIC.data(), TASK_CACHE_MAGIC.size());
+    write_int(out, TASK_CACHE_VERSION);
+    write_int(out, variables.size());
+    for (const ExplicitVariable &var : variables) {
+        write_string(out, var.name);
+        write_int(out, var.axiom_layer);
+        write_int(out, var.axiom_default_value);
+        write_int(out, var.domain_size);
+        for (const string &fact_name : var.fact_names) {
+            write_string(out, fact_name);
+        }
+    }
+    for (const vector<set<FactPair>> &mutexes_by_value : mutexes) {
+        for (const set<FactPair> &mutex_facts : mutexes_by_value) {
+            write_facts(out, mutex_facts);
+        }
+    }
+    write_operators(out, operators);
+    write_operators(out, axioms);
+    write_facts(out, goals);
+}
+
 const ExplicitVariable &RootTask::get_variable(int var) const {
     assert(utils::in_bounds(var, variables));
     return variables[var];
@@ -498,6 +674,43 @@ void read_root_task(istream &in) {
     g_root_task = make_shared<RootTask>(in);
 }
 
+void read_root_task_with_cache(istream &in, const string &cache_filename) {
+    assert(!g_root_task);
+    ifstream cache_file(cache_filename, ios::binary);
+    if (cache_file) {
+        shared_ptr<RootTask> task = RootTask::read_from_cache(cache_file);
+        if (task) {
+            utils::g_log << "read task from cache " << cache_filename << endl;
+            g_root_task = task;
+            return;
+        }
+        utils::g_log << "ignoring task cache " << cache_filename
+                     << " in an unknown format" << endl;
+    }
+
+    shared_ptr<RootTask> task = make_shared<RootTask>(in);
+    g_root_task = task;
+    /*
+      Write to a temporary file first, so that a planner that is started
+      while we write (or after we are killed) never sees a partial cache.
+    */
+    string tmp_filename = cache_filename + ".tmp";
+    {
+        ofstream tmp_file(tmp_filename, ios::binary);
+        task->write_to_cache(tmp_file);
+        if (!tmp_file) {
+            utils::g_log << "could not write task cache " << cache_filename
+                         << endl;
+            remove(tmp_filename.c_str());
+            return;
+        }
+    }
+    if (rename(tmp_filename.c_str(), cache_filename.c_str()) != 0) {
+        utils::g_log << "could not write task cache " << cache_filename << endl;
+        remove(tmp_filename.c_str());
+    }
+}
+
 static shared_ptr<AbstractTask> _parse(OptionParser &parser) {
     if (parser.dry_run())
         return nullptr;
@@ -3,8 +3,18 @@
 
 #include "../abstract_task.h"
 
+#include <string>
+
 namespace tasks {
 extern std::shared_ptr<AbstractTask> g_root_task;
 extern void read_root_task(std::istream &in);
+/*
+  Read the root task from the task cache file if it exists. Otherwise
+  read it from "in" and write it to the cache file, so that later planner
+  calls on the same task (e.g. the configurations of a portfolio) can
+  skip parsing the translator output.
+*/
+extern void read_root_task_with_cache(
+    std::istream &in, const std::string &cache_filename);
 }
 #endif
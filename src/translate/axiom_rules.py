@@ -1,6 +1,6 @@
+import compact_graph
 import options
 import pddl
-import sccs
 import timers
 
 from collections import defaultdict
@@ -121,10 +121,49 @@ def get_strongly_connected_components(dependencies):
         indices = [variable_to_index[atom] for atom in sorted(pos.union(neg))]
         adjacency_list.append(indices)
 
-    index_groups = sccs.get_sccs_adjacency_list(adjacency_list)
+    graph = compact_graph.CompactGraph.from_adjacency_list(adjacency_list)
+    index_groups = graph.get_sccs()
     groups = [[sorted_vars[i] for i in g] for g in index_groups]
     return groups
 
+def compute_non_dominated_conditions(conditions, skipped=()):
+    """Return the indices of all conditions that are not dominated.
+
+    *conditions* is a list of duplicate-free condition tuples (sorted
+    lists also work) and *skipped* a collection of indices that must
+    not be returned and are not considered as dominating. A condition
+    is dominated if it is a superset of a non-skipped condition that
+    occurs earlier in the list or that is not dominated itself. Of
+    multiple identical conditions, only the first one is kept.
+
+    We keep an index mapping each literal to the conditions that
+    contain it. The candidates dominated by a condition are then the
+    intersection of the index entries of its literals, which we
+    compute starting with the rarest literal."""
+    skipped = set(skipped)
+    conditions_by_literal = defaultdict(set)
+    for index, condition in enumerate(conditions):
+        if index not in skipped:
+            for literal in condition:
+                conditions_by_literal[literal].add(index)
+
+    for index, condition in enumerate(conditions):
+        if index in skipped:
+            continue   # Required to keep one of multiple identical axioms.
+        if not condition:  # empty condition: dominates everything
+            return [index]
+        candidate_sets = [conditions_by_literal[literal]
+                          for literal in condition]
+        rarest = min(candidate_sets, key=len)
+        if len(rarest) == 1:
+            # Only this condition contains the rarest literal.
+            continue
+        dominated = rarest.intersection(*candidate_sets)
+        dominated.discard(index)
+        skipped.update(dominated)
+    return [index for index in range(len(conditions)) if index not in skipped]
+
+
 # Expects a list of axioms *with the same head* and returns a subset consisting
 # of all non-dominated axioms whose conditions have been cleaned up
 # (duplicate elimination).
@@ -139,28 +178,11 @@ def compute_simplified_axioms(axioms):
         axiom.condition = sorted(set(axiom.condition))
 
     # Remove dominated axioms.
-    axioms_to_skip = set()
-    axioms_by_literal = defaultdict(set)
-    for axiom in axioms:
-        if axiom.effect in axiom.condition:
-            axioms_to_skip.add(id(axiom))
-        else:
-            for literal in axiom.condition:
-                axioms_by_literal[literal].add(id(axiom))
-
-    for axiom in axioms:
-        if id(axiom) in axioms_to_skip:
-            continue   # Required to keep one of multiple identical axioms.
-        if not axiom.condition:  # empty condition: dominates everything
-            return [axiom]
-        literals = iter(axiom.condition)
-        dominated_axioms = axioms_by_literal[next(literals)].copy()
-        for literal in literals:
-            dominated_axioms &= axioms_by_literal[literal]
-        for dominated_axiom in dominated_axioms:
-            if dominated_axiom != id(axiom):
-                axioms_to_skip.add(dominated_axiom)
-    return [axiom for axiom in axioms if id(axiom) not in axioms_to_skip]
+    axioms_to_skip = [index for index, axiom in enumerate(axioms)
+                      if axiom.effect in axiom.condition]
+    non_dominated = compute_non_dominated_conditions(
+        [axiom.condition for axiom in axioms], axioms_to_skip)
+    return [axioms[index] for index in non_dominated]
 
 
 def compute_clusters(axioms, goals, operators):
@@ -248,9 +270,19 @@ def compute_axiom_layers(clusters, strategy):
 
 
 def compute_negative_axioms(clusters):
+    # Several derived variables often have identical definitions, so we
+    # cache the negated conditions by the conditions of the axioms.
+    negation_cache = {}
     for cluster in clusters:
         if cluster.needed_negatively:
-            if len(cluster.variables) > 1:
+            variable = next(iter(cluster.variables))
+            negated_axioms = None
+            if len(cluster.variables) == 1:
+                negated_axioms = negate(cluster.axioms[variable],
+                                        negation_cache)
+            if negated_axioms is not None:
+                cluster.axioms[variable] += negated_axioms
+            else:
                 # If the cluster contains multiple variables, they have a cyclic
                 # positive dependency. In this case, the "obvious" way of
                 # negating the formula defining the derived variable is
@@ -264,39 +296,65 @@ def compute_negative_axioms(clusters):
                 # accuracy. Negating the rules in an exact
                 # (non-overapproximating) way is possible but more expensive.
                 # Again, see issue453 for details.
+                #
+                # We use the same overapproximation if the negation of a
+                # single variable exceeds the size limit set with
+                # --negative-axiom-size-limit.
                 for variable in cluster.variables:
                     name = cluster.axioms[variable][0].name
                     negated_axiom = pddl.PropositionalAxiom(name, [], variable.negate())
                     cluster.axioms[variable].append(negated_axiom)
-            else:
-                variable = next(iter(cluster.variables))
-                negated_axioms = negate(cluster.axioms[variable])
-                cluster.axioms[variable] += negated_axioms
 
 
-def negate(axioms):
-    assert axioms
-    result = [pddl.PropositionalAxiom(axioms[0].name, [], axioms[0].effect.negate())]
-    for axiom in axioms:
-        condition = axiom.condition
+def negate_conditions(conditions, size_limit):
+    """Negate the DNF given by a list of conditions and return the
+    negation as a list of non-dominated conditions, or None if an
+    intermediate result has more than size_limit conditions.
+
+    We multiply out one disjunct at a time and remove dominated
+    conditions from the intermediate results, which does not change
+    the final result but can keep the intermediate results small."""
+    result = [()]
+    for condition in conditions:
         if len(condition) == 0:
             # The derived fact we want to negate is triggered with an
             # empty condition, so it is always true and its negation
             # is always false.
             return []
-        elif len(condition) == 1:  # Handle easy special case quickly.
-            new_literal = condition[0].negate()
-            for result_axiom in result:
-                result_axiom.condition.append(new_literal)
-        else:
-            new_result = []
-            for literal in condition:
-                literal = literal.negate()
-                for result_axiom in result:
-                    new_axiom = result_axiom.clone()
-                    new_axiom.condition.append(literal)
-                    new_result.append(new_axiom)
-            result = new_result
+        negated_literals = [literal.negate() for literal in condition]
+        new_result = []
+        for result_condition in result:
+            for literal in negated_literals:
+                if literal in result_condition:
+                    new_result.append(result_condition)
+                else:
+                    new_result.append(
+                        tuple(sorted(result_condition + (literal,))))
+        new_result = [new_result[index] for index in
+                      compute_non_dominated_conditions(new_result)]
+        if size_limit is not None and len(new_result) > size_limit:
+            return None
+        result = new_result
+    return result
+
+
+def negate(axioms, negation_cache=None):
+    """Return the negated axioms of a list of axioms with the same head,
+    or None if the negation exceeds --negative-axiom-size-limit."""
+    assert axioms
+    key = tuple(tuple(axiom.condition) for axiom in axioms)
+    if negation_cache is not None and key in negation_cache:
+        conditions = negation_cache[key]
+    else:
+        conditions = negate_conditions(key, options.negative_axiom_size_limit)
+        if negation_cache is not None:
+            negation_cache[key] = conditions
+    if conditions is None:
+        return None
+    name = axioms[0].name
+    effect = axioms[0].effect.negate()
+    result = [pddl.PropositionalAxiom(name, list(condition), effect)
+              for condition in conditions]
     result = compute_simplified_axioms(result)
     return result
 
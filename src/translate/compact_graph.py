@@ -0,0 +1,163 @@
+"""Compact directed graphs over the nodes {0, ..., N-1}.
+
+The successors are stored in compressed sparse row (CSR) format: the
+successors of node u are targets[offsets[u]:offsets[u + 1]], where
+offsets and targets are flat integer arrays. This needs much less
+memory than dicts of sets and lets us implement the graph algorithms
+used by the translator iteratively over flat arrays:
+
+- Tarjan's algorithm for strongly connected components (with an
+  explicit stack, since recursion exceeds python's maximal recursion
+  depth on some planning instances),
+- reachability from a set of source nodes, using a bytearray of
+  visited flags, and
+- the transitive closure, represented as one bitset (a python int) of
+  reachable nodes per node.
+"""
+
+from array import array
+
+
+class CompactGraph:
+    def __init__(self, num_nodes, offsets, targets):
+        assert len(offsets) == num_nodes + 1
+        self.num_nodes = num_nodes
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_adjacency_list(cls, adjacency_list):
+        """Create a graph from a list whose u-th entry contains the
+        successors of node u. The order of the successors is kept."""
+        offsets = array("l", [0])
+        targets = array("l")
+        for successors in adjacency_list:
+            targets.extend(successors)
+            offsets.append(len(targets))
+        return cls(len(adjacency_list), offsets, targets)
+
+    @classmethod
+    def from_arcs(cls, num_nodes, arcs):
+        """Create a graph from an iterable of arcs (u, v). The successors
+        of each node are ordered as the arcs."""
+        adjacency_list = [[] for _ in range(num_nodes)]
+        for u, v in arcs:
+            adjacency_list[u].append(v)
+        return cls.from_adjacency_list(adjacency_list)
+
+    def get_num_arcs(self):
+        return len(self.targets)
+
+    def get_successors(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def get_sccs(self):
+        """Return the strongly connected components as a list of lists
+        that defines a partition of {0, ..., N-1}.
+
+        The derived graph where each SCC is a single "supernode" is
+        necessarily acyclic. The SCCs are returned in a topological
+        sort order with respect to this derived DAG. The nodes are
+        visited in increasing order and their successors in the given
+        order, so the result is deterministic."""
+        offsets = self.offsets
+        targets = self.targets
+        num_nodes = self.num_nodes
+        # indices[v] == 0 means that v has not been visited yet.
+        indices = [0] * num_nodes
+        lowlinks = [0] * num_nodes
+        stack_positions = [-1] * num_nodes
+        stack = []
+        sccs = []
+        current_index = 0
+
+        for root in range(num_nodes):
+            if indices[root]:
+                continue
+            current_index += 1
+            indices[root] = lowlinks[root] = current_index
+            stack_positions[root] = len(stack)
+            stack.append(root)
+            # Entries are (node, position of the next arc to consider).
+            iter_stack = [(root, offsets[root])]
+            while iter_stack:
+                v, pos = iter_stack[-1]
+                end = offsets[v + 1]
+                while pos < end:
+                    w = targets[pos]
+                    pos += 1
+                    if not indices[w]:
+                        iter_stack[-1] = (v, pos)
+                        current_index += 1
+                        indices[w] = lowlinks[w] = current_index
+                        stack_positions[w] = len(stack)
+                        stack.append(w)
+                        iter_stack.append((w, offsets[w]))
+                        break
+                    elif stack_positions[w] >= 0 and indices[w] < lowlinks[v]:
+                        lowlinks[v] = indices[w]
+                else:
+                    iter_stack.pop()
+                    if lowlinks[v] == indices[v]:
+                        stack_position = stack_positions[v]
+                        scc = stack[stack_position:]
+                        del stack[stack_position:]
+                        for node in scc:
+                            stack_positions[node] = -1
+                        sccs.append(scc)
+                    if iter_stack:
+                        parent = iter_stack[-1][0]
+                        if lowlinks[v] < lowlinks[parent]:
+                            lowlinks[parent] = lowlinks[v]
+        sccs.reverse()
+        return sccs
+
+    def get_reachable(self, sources):
+        """Return a bytearray whose u-th entry is 1 if node u is
+        reachable from one of the source nodes (which are reachable
+        from themselves) and 0 otherwise."""
+        offsets = self.offsets
+        targets = self.targets
+        reached = bytearray(self.num_nodes)
+        stack = []
+        for source in sources:
+            if not reached[source]:
+                reached[source] = 1
+                stack.append(source)
+        while stack:
+            node = stack.pop()
+            for pos in range(offsets[node], offsets[node + 1]):
+                successor = targets[pos]
+                if not reached[successor]:
+                    reached[successor] = 1
+                    stack.append(successor)
+        return reached
+
+    def get_transitive_closure(self):
+        """Return a list whose u-th entry is a bitset (int) in which
+        bit v is set if there is a path of at least one arc from node u
+        to node v.
+
+        Nodes in the same SCC reach the same nodes, so we compute one
+        bitset per SCC, in reverse topological order."""
+        offsets = self.offsets
+        targets = self.targets
+        closure = [0] * self.num_nodes
+        for scc in reversed(self.get_sccs()):
+            reached = 0
+            if len(scc) > 1:
+                for node in scc:
+                    reached |= 1 << node
+            for node in scc:
+                for pos in range(offsets[node], offsets[node + 1]):
+                    successor = targets[pos]
+                    reached |= closure[successor] | (1 << successor)
+            for node in scc:
+                closure[node] = reached
+        return closure
+
+
+def get_nodes(bitset):
+    """Return the nodes in the given bitset in increasing order."""
+    return [node for node, bit in enumerate(reversed(bin(bitset)[2:]))
+            if bit == "1"]
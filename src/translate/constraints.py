@@ -1,5 +1,3 @@
-import itertools
-
 class NegativeClause:
     # disjunction of inequalities
     def __init__(self, parts):
@@ -102,20 +100,6 @@ class ConstraintSystem:
         neg_clauses = " and ".join(neg_clauses)
         return assigs + "(" + neg_clauses + ")"
 
-    def _all_clauses_satisfiable(self, assignment):
-        mapping = assignment.get_mapping()
-        for neg_clause in self.neg_clauses:
-            clause = neg_clause.apply_mapping(mapping)
-            if not clause.is_satisfiable():
-                return False
-        return True
-
-    def _combine_assignments(self, assignments):
-        new_equalities = []
-        for a in assignments:
-            new_equalities.extend(a.equalities)
-        return Assignment(new_equalities)
-
     def add_assignment(self, assignment):
         self.add_assignment_disjunction([assignment])
 
@@ -151,10 +135,107 @@ class ConstraintSystem:
         """Check whether the combinatorial assignments include at least
            one consistent assignment under which the negative clauses
            are satisfiable"""
-        for assignments in itertools.product(*self.combinatorial_assignments):
-            combined = self._combine_assignments(assignments)
-            if not combined.is_consistent():
-                continue
-            if self._all_clauses_satisfiable(combined):
+        # Instead of enumerating the Cartesian product of the
+        # disjunctions, we choose one assignment per disjunction in a
+        # depth-first search and extend the equivalence classes
+        # incrementally. Since adding equalities never makes an
+        # inconsistent assignment consistent or a violated negative
+        # clause satisfiable, we can backtrack as soon as this happens.
+        # Disjunctions with fewer alternatives are tried first.
+        disjunctions = sorted(self.combinatorial_assignments, key=len)
+        classes = _EquivalenceClasses()
+        if not self._negative_clauses_satisfiable(classes):
+            return False
+
+        def extend(depth):
+            if depth == len(disjunctions):
                 return True
-        return False
+            for assignment in disjunctions[depth]:
+                checkpoint = classes.checkpoint()
+                if (classes.add_equalities(assignment.equalities) and
+                        self._negative_clauses_satisfiable(classes) and
+                        extend(depth + 1)):
+                    return True
+                classes.undo(checkpoint)
+            return False
+
+        return extend(0)
+
+    def _negative_clauses_satisfiable(self, classes):
+        for neg_clause in self.neg_clauses:
+            for (v1, v2) in neg_clause.parts:
+                if not classes.same_class(v1, v2):
+                    break
+            else:
+                return False
+        return True
+
+
+class _EquivalenceClasses:
+    """Union-find structure over variables and objects that supports
+    undoing the most recent unions. Each class may contain at most
+    one object (i.e., an item not starting with "?")."""
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.constant = {}
+        # Roots that have been attached to another root, most recent last.
+        self.trail = []
+
+    def find(self, item):
+        # No path compression, so that unions can be undone.
+        parent = self.parent
+        while item in parent:
+            item = parent[item]
+        return item
+
+    def same_class(self, item1, item2):
+        return item1 == item2 or self.find(item1) == self.find(item2)
+
+    def _get_constant(self, root):
+        if root in self.constant:
+            return self.constant[root]
+        if not root.startswith("?"):
+            return root
+        return None
+
+    def union(self, item1, item2):
+        """Merge the classes of the given items and return False if this
+        would put two different objects into the same class."""
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return True
+        const1 = self._get_constant(root1)
+        const2 = self._get_constant(root2)
+        if const1 is not None and const2 is not None:
+            return False
+        size1 = self.size.get(root1, 1)
+        size2 = self.size.get(root2, 1)
+        if size1 < size2:
+            root1, root2, size1, size2 = root2, root1, size2, size1
+            const1, const2 = const2, const1
+        self.parent[root2] = root1
+        self.size[root1] = size1 + size2
+        added_constant = const1 is None and const2 is not None
+        if added_constant:
+            self.constant[root1] = const2
+        self.trail.append((root1, root2, size1, added_constant))
+        return True
+
+    def add_equalities(self, equalities):
+        for (v1, v2) in equalities:
+            if not self.union(v1, v2):
+                return False
+        return True
+
+    def checkpoint(self):
+        return len(self.trail)
+
+    def undo(self, checkpoint):
+        while len(self.trail) > checkpoint:
+            root1, root2, old_size1, added_constant = self.trail.pop()
+            del self.parent[root2]
+            self.size[root1] = old_size1
+            if added_constant:
+                del self.constant[root1]
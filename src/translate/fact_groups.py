@@ -1,4 +1,3 @@
-import invariant_finder
 import options
 import pddl
 import timers
@@ -31,16 +30,46 @@ def instantiate_groups(groups, task, reachable_facts):
     return [expand_group(group, task, reachable_facts) for group in groups]
 
 class GroupCoverQueue:
+    """Bucket queue for the greedy choice of covering groups.
+
+    Facts are mapped to integer IDs and groups are stored as
+    immutable tuples of fact IDs. Instead of removing covered facts
+    from all groups containing them, we mark them as covered and only
+    decrement the size counters of the affected groups. Buckets are
+    updated lazily: a group is only moved to the bucket of its
+    current size when it reaches the top of its old bucket. This
+    gives the same choices (including tie-breaking) as shrinking the
+    groups explicitly, but runs in time linear in the total size of
+    the groups."""
     def __init__(self, groups):
+        self.facts = []
+        fact_ids = {}
+        self.groups = []
+        self.sizes = []
+        self.groups_by_fact = []
         if groups:
-            self.max_size = max([len(group) for group in groups])
-            self.groups_by_size = [[] for i in range(self.max_size + 1)]
-            self.groups_by_fact = {}
             for group in groups:
-                group = set(group) # Copy group, as it will be modified.
-                self.groups_by_size[len(group)].append(group)
+                group_ids = []
                 for fact in group:
-                    self.groups_by_fact.setdefault(fact, []).append(group)
+                    fact_id = fact_ids.get(fact)
+                    if fact_id is None:
+                        fact_id = len(self.facts)
+                        fact_ids[fact] = fact_id
+                        self.facts.append(fact)
+                        self.groups_by_fact.append([])
+                    group_ids.append(fact_id)
+                # Remove duplicates.
+                group_ids = tuple(dict.fromkeys(group_ids))
+                group_no = len(self.groups)
+                self.groups.append(group_ids)
+                self.sizes.append(len(group_ids))
+                for fact_id in group_ids:
+                    self.groups_by_fact[fact_id].append(group_no)
+            self.covered = bytearray(len(self.facts))
+            self.max_size = max(self.sizes)
+            self.groups_by_size = [[] for i in range(self.max_size + 1)]
+            for group_no, size in enumerate(self.sizes):
+                self.groups_by_size[size].append(group_no)
             self._update_top()
         else:
             self.max_size = 0
@@ -48,22 +77,27 @@ class GroupCoverQueue:
         return self.max_size > 1
     __nonzero__ = __bool__
     def pop(self):
-        result = list(self.top) # Copy; this group will shrink further.
+        covered = self.covered
+        result = [fact_id for fact_id in self.groups[self.top]
+                  if not covered[fact_id]]
         if options.use_partial_encoding:
-            for fact in result:
-                for group in self.groups_by_fact[fact]:
-                    group.remove(fact)
+            sizes = self.sizes
+            for fact_id in result:
+                covered[fact_id] = 1
+                for group_no in self.groups_by_fact[fact_id]:
+                    sizes[group_no] -= 1
         self._update_top()
-        return result
+        return [self.facts[fact_id] for fact_id in result]
     def _update_top(self):
         while self.max_size > 1:
             max_list = self.groups_by_size[self.max_size]
             while max_list:
                 candidate = max_list.pop()
-                if len(candidate) == self.max_size:
+                size = self.sizes[candidate]
+                if size == self.max_size:
                     self.top = candidate
                     return
-                self.groups_by_size[len(candidate)].append(candidate)
+                self.groups_by_size[size].append(candidate)
             self.max_size -= 1
 
 def choose_groups(groups, reachable_facts):
@@ -93,19 +127,27 @@ def collect_all_mutex_groups(groups, atoms):
     # NOTE: This should be functionally identical to choose_groups
     # when partial_encoding is set to False. Maybe a future
     # refactoring could take that into account.
-    all_groups = []
-    uncovered_facts = atoms.copy()
-    for group in groups:
-        uncovered_facts.difference_update(group)
-        all_groups.append(group)
+    all_groups = list(groups)
+    uncovered_facts = atoms.difference(*groups)
     all_groups += [[fact] for fact in uncovered_facts]
     return all_groups
 
 def sort_groups(groups):
     return sorted(sorted(group) for group in groups)
 
-def compute_groups(task, atoms, reachable_action_params):
-    groups = invariant_finder.get_groups(task, reachable_action_params)
+def compute_groups(task, atoms, reachable_action_params,
+                   propositional_actions=None):
+    """If propositional_actions is given, the task is propositional
+    (see propositional.py) and the invariants are synthesized on these
+    ground actions instead of the lifted task."""
+    if options.invariant_generation_max_candidates == 0:
+        groups = []
+    elif propositional_actions is not None:
+        import propositional
+        groups = propositional.get_groups(task, atoms, propositional_actions)
+    else:
+        import invariant_finder
+        groups = invariant_finder.get_groups(task, reachable_action_params)
 
     with timers.timing("Instantiating groups"):
         groups = instantiate_groups(groups, task, atoms)
@@ -1,6 +1,9 @@
 #! /usr/bin/env python3
 
 
+import compact_graph
+
+
 class Graph:
     def __init__(self, nodes):
         self.nodes = nodes
@@ -9,31 +12,25 @@ class Graph:
         self.neighbours[u].add(v)
         self.neighbours[v].add(u)
     def connected_components(self):
-        remaining_nodes = set(self.nodes)
-        result = []
-        def dfs(node):
-            result[-1].append(node)
-            remaining_nodes.remove(node)
-            for neighbour in self.neighbours[node]:
-                if neighbour in remaining_nodes:
-                    dfs(neighbour)
-        while remaining_nodes:
-            node = next(iter(remaining_nodes))
-            result.append([])
-            dfs(node)
-            result[-1].sort()
-        return sorted(result)
+        # Since the graph is undirected, its connected components are
+        # the strongly connected components of the symmetric digraph.
+        nodes = list(self.neighbours)
+        node_to_index = {node: index for index, node in enumerate(nodes)}
+        graph = compact_graph.CompactGraph.from_adjacency_list(
+            [[node_to_index[v] for v in self.neighbours[u]] for u in nodes])
+        return sorted(sorted(nodes[index] for index in component)
+                      for component in graph.get_sccs())
 
 
 def transitive_closure(pairs):
-    # Warshall's algorithm.
-    result = set(pairs)
-    nodes = {u for (u, v) in pairs} | {v for (u, v) in pairs}
-    for k in nodes:
-        for i in nodes:
-            for j in nodes:
-                if (i, j) not in result and (i, k) in result and (k, j) in result:
-                    result.add((i, j))
+    nodes = list(dict.fromkeys(node for pair in pairs for node in pair))
+    node_to_index = {node: index for index, node in enumerate(nodes)}
+    graph = compact_graph.CompactGraph.from_arcs(
+        len(nodes), ((node_to_index[u], node_to_index[v]) for (u, v) in pairs))
+    closure = graph.get_transitive_closure()
+    result = [(nodes[u], nodes[v])
+              for u in range(len(nodes))
+              for v in compact_graph.get_nodes(closure[u])]
     return sorted(result)
 
 
@@ -18,17 +18,6 @@ def get_fluent_facts(task, model):
     return {fact for fact in model
             if fact.predicate in fluent_predicates}
 
-def get_objects_by_type(typed_objects, types):
-    result = defaultdict(list)
-    supertypes = {}
-    for type in types:
-        supertypes[type.name] = type.supertype_names
-    for obj in typed_objects:
-        result[obj.type_name].append(obj.name)
-        for type in supertypes[obj.type_name]:
-            result[type].append(obj.name)
-    return result
-
 def instantiate_goal(goal, init_facts, fluent_facts):
     # With the way this module is designed, we need to "instantiate"
     # the goal to make sure we properly deal with static conditions,
@@ -61,7 +50,7 @@ def instantiate(task, model):
         else:
             init_facts.add(element)
 
-    type_to_objects = get_objects_by_type(task.objects, task.types)
+    type_to_objects = task.get_type_index().objects_by_type
 
     instantiated_actions = []
     instantiated_axioms = []
@@ -102,15 +91,21 @@ def instantiate(task, model):
             sorted(instantiated_axioms), reachable_action_parameters)
 
 
-def explore(task):
+def explore(task, memory_limit=None, num_workers=None):
     prog = pddl_to_prolog.translate(task)
-    model = build_model.compute_model(prog)
+    if num_workers is None:
+        model = build_model.compute_model(prog, memory_limit)
+    else:
+        import parallel_model
+        model = parallel_model.compute_model(prog, num_workers)
     with timers.timing("Completing instantiation"):
         return instantiate(task, model)
 
 
 if __name__ == "__main__":
+    import options
     import pddl_parser
+    options.setup()
     task = pddl_parser.open()
     relaxed_reachable, atoms, actions, goals, axioms, _ = explore(task)
     print("goal relaxed reachable: %s" % relaxed_reachable)
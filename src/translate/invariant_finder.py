@@ -137,6 +137,8 @@ if __name__ == "__main__":
     import normalize
     import pddl_parser
 
+    options.setup()
+
     print("Parsing...")
     task = pddl_parser.open()
     print("Normalizing...")
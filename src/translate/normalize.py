@@ -1,9 +1,16 @@
 #! /usr/bin/env python3
 
 import copy
+from collections import Counter
 
 import pddl
 
+
+# Statistics for the two ways of handling disjunctive conditions (see
+# build_DNF and split_disjunctions).
+split_disjunction_counters = Counter()
+disjunction_axiom_counter = 0
+
 class ConditionProxy:
     def clone_owner(self):
         clone = copy.copy(self)
@@ -11,6 +18,7 @@ class ConditionProxy:
         return clone
 
 class PreconditionProxy(ConditionProxy):
+    kind = "actions"
     def __init__(self, action):
         self.owner = action
         self.condition = action.precondition
@@ -29,6 +37,7 @@ class PreconditionProxy(ConditionProxy):
         return self.owner.type_map
 
 class EffectConditionProxy(ConditionProxy):
+    kind = "effects"
     def __init__(self, action, effect):
         self.action = action
         self.owner = effect
@@ -50,6 +59,7 @@ class EffectConditionProxy(ConditionProxy):
         return self.action.type_map
 
 class AxiomConditionProxy(ConditionProxy):
+    kind = "axioms"
     def __init__(self, axiom):
         self.owner = axiom
         self.condition = axiom.condition
@@ -72,6 +82,7 @@ class AxiomConditionProxy(ConditionProxy):
         return self.owner.type_map
 
 class GoalConditionProxy(ConditionProxy):
+    kind = "goals"
     def __init__(self, task):
         self.owner = task
         self.condition = task.goal
@@ -153,11 +164,12 @@ def remove_universal_quantifiers(task):
             return condition.change_parts(new_parts)
 
     new_axioms_by_condition = {}
+    table = pddl.ConditionTable()
     for proxy in tuple(all_conditions(task)):
         # Cannot use generator because we add new axioms on the fly.
         if proxy.condition.has_universal_part():
             type_map = proxy.get_type_map()
-            proxy.set(recurse(proxy.condition))
+            proxy.set(recurse(table.get(proxy.condition)))
 
 
 # [2] Pull disjunctions to the root of the condition.
@@ -167,8 +179,81 @@ def remove_universal_quantifiers(task):
 # (1) or(phi, or(psi, psi'))      ==  or(phi, psi, psi')
 # (2) exists(vars, or(phi, psi))  ==  or(exists(vars, phi), exists(vars, psi))
 # (3) and(phi, or(psi, psi'))     ==  or(and(phi, psi), and(phi, psi'))
-def build_DNF(task):
+#
+# Rule (3) can blow up the condition exponentially. If a size limit is
+# given, we first estimate the number of disjuncts of the DNF and, if it
+# exceeds the limit, replace disjunctive subconditions by atoms of new
+# axioms (see compile_disjunctions). The axioms are split into one axiom
+# per disjunct later, which only adds up their sizes.
+def product(numbers):
+    result = 1
+    for number in numbers:
+        result *= number
+    return result
+
+def get_dnf_size(condition, size_by_condition):
+    size = size_by_condition.get(condition)
+    if size is None:
+        part_sizes = [get_dnf_size(part, size_by_condition)
+                      for part in condition.parts]
+        if isinstance(condition, pddl.Disjunction):
+            size = sum(part_sizes)
+        elif isinstance(condition, pddl.Conjunction):
+            size = product(part_sizes)
+        else:
+            size = max(part_sizes, default=1)
+        size_by_condition[condition] = size
+    return size
+
+def compile_disjunctions(task, condition, size_limit, type_map,
+                         new_axioms_by_condition, size_by_condition):
+    """Replace disjunctive parts of conjunctions in the condition by
+    atoms of new axioms until the DNF size of each conjunction is at
+    most size_limit."""
     def recurse(condition):
+        # Uses the arguments from surrounding scope.
+        if get_dnf_size(condition, size_by_condition) <= size_limit:
+            return condition
+        new_parts = [recurse(part) for part in condition.parts]
+        if isinstance(condition, pddl.Conjunction):
+            part_sizes = [get_dnf_size(part, size_by_condition)
+                          for part in new_parts]
+            size = product(part_sizes)
+            # Replace the largest disjunctive parts first.
+            for pos in sorted(range(len(new_parts)),
+                              key=lambda pos: -part_sizes[pos]):
+                if size <= size_limit or part_sizes[pos] == 1:
+                    break
+                size //= part_sizes[pos]
+                new_parts[pos] = get_axiom_atom(new_parts[pos])
+        return condition.change_parts(new_parts)
+
+    def get_axiom_atom(condition):
+        global disjunction_axiom_counter
+        parameters = sorted(condition.free_variables())
+        typed_parameters = tuple(pddl.TypedObject(v, type_map[v])
+                                 for v in parameters)
+        key = (condition, typed_parameters)
+        axiom = new_axioms_by_condition.get(key)
+        if not axiom:
+            axiom = task.add_axiom(list(typed_parameters), condition)
+            new_axioms_by_condition[key] = axiom
+            disjunction_axiom_counter += 1
+        return pddl.Atom(axiom.name, parameters)
+
+    return recurse(condition)
+
+def build_DNF(task, size_limit=None):
+    def recurse(condition):
+        # Uses dnf_by_condition from surrounding scope. The conditions
+        # are canonical (see pddl.ConditionTable), so each distinct
+        # subcondition is only transformed once.
+        result = dnf_by_condition.get(condition)
+        if result is None:
+            result = dnf_by_condition[condition] = transform(condition)
+        return result
+
+    def transform(condition):
         disjunctive_parts = []
         other_parts = []
         for part in condition.parts:
@@ -206,9 +291,27 @@ def build_DNF(task):
                     result_parts.append(pddl.Conjunction((part1, part2)))
         return pddl.Disjunction(result_parts)
 
-    for proxy in all_conditions(task):
-        if proxy.condition.has_disjunction():
-            proxy.set(recurse(proxy.condition).simplified())
+    dnf_by_condition = {}
+    size_by_condition = {}
+    new_axioms_by_condition = {}
+    table = pddl.ConditionTable()
+    # compile_disjunctions appends new axioms to task.axioms, so we iterate
+    # over a snapshot of the conditions and then handle the new axioms.
+    proxies = list(all_conditions(task))
+    num_axioms = len(task.axioms)
+    while proxies:
+        for proxy in proxies:
+            if proxy.condition.has_disjunction():
+                condition = table.get(proxy.condition)
+                if (size_limit is not None and
+                        get_dnf_size(condition, size_by_condition) > size_limit):
+                    condition = table.get(compile_disjunctions(
+                        task, condition, size_limit, proxy.get_type_map(),
+                        new_axioms_by_condition, size_by_condition))
+                proxy.set(recurse(condition).simplified())
+        proxies = [AxiomConditionProxy(axiom)
+                   for axiom in task.axioms[num_axioms:]]
+        num_axioms = len(task.axioms)
 
 # [3] Split conditions at the outermost disjunction.
 def split_disjunctions(task):
@@ -220,6 +323,7 @@ def split_disjunctions(task):
                 new_proxy.set(part)
                 new_proxy.register_owner(task)
             proxy.delete_owner(task)
+            split_disjunction_counters[proxy.kind] += len(proxy.condition.parts)
 
 # [4] Pull existential quantifiers out of conjunctions and group them.
 #
@@ -230,6 +334,13 @@ def split_disjunctions(task):
 #       if var does not occur in phi as a free variable.
 def move_existential_quantifiers(task):
     def recurse(condition):
+        # Uses moved_by_condition from surrounding scope (see build_DNF).
+        result = moved_by_condition.get(condition)
+        if result is None:
+            result = moved_by_condition[condition] = transform(condition)
+        return result
+
+    def transform(condition):
         existential_parts = []
         other_parts = []
         for part in condition.parts:
@@ -257,9 +368,11 @@ def move_existential_quantifiers(task):
         new_conjunction = pddl.Conjunction(new_conjunction_parts)
         return pddl.ExistentialCondition(new_parameters, (new_conjunction,))
 
+    moved_by_condition = {}
+    table = pddl.ConditionTable()
     for proxy in all_conditions(task):
         if proxy.condition.has_existential_part():
-            proxy.set(recurse(proxy.condition).simplified())
+            proxy.set(recurse(table.get(proxy.condition)).simplified())
 
 
 # [5a] Drop existential quantifiers from axioms, turning them
@@ -324,10 +437,10 @@ def substitute_complicated_goal(task):
 # Combine Steps [1], [2], [3], [4], [5] and do some additional verification
 # that the task makes sense.
 
-def normalize(task):
+def normalize(task, dnf_size_limit=None):
     remove_universal_quantifiers(task)
     substitute_complicated_goal(task)
-    build_DNF(task)
+    build_DNF(task, dnf_size_limit)
     split_disjunctions(task)
     move_existential_quantifiers(task)
     eliminate_existential_quantifiers_from_axioms(task)
@@ -391,7 +504,9 @@ def condition_to_rule_body(parameters, condition):
     return result
 
 if __name__ == "__main__":
+    import options
     import pddl_parser
+    options.setup()
     task = pddl_parser.open()
     normalize(task)
     task.dump()
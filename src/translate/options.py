@@ -2,6 +2,14 @@ import argparse
 import sys
 
 
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            "must be at least 1, got {}".format(number))
+    return number
+
+
 def parse_args():
     argparser = argparse.ArgumentParser()
     argparser.add_argument(
@@ -25,6 +33,30 @@ def parse_args():
         "generation and obtain only binary variables. The limit is "
         "needed for grounded input files that would otherwise produce "
         "too many candidates.")
+    exploration_group = argparser.add_mutually_exclusive_group()
+    exploration_group.add_argument(
+        "--exploration-workers", default=None, type=positive_int,
+        metavar="N",
+        help="explore the Datalog program with N worker processes. The "
+        "output does not depend on N and is the same as without this "
+        "option. If the translator has a memory (address space) limit, "
+        "the memory available beyond the current usage is divided "
+        "evenly among the main process and the workers.")
+    exploration_group.add_argument(
+        "--exploration-memory-limit", default=None, type=int, metavar="MIB",
+        help="explore the Datalog program in a mode that releases the data "
+        "of saturated predicates and rules early and, if the translator "
+        "uses more than MIB MiB of memory, moves large join indexes to a "
+        "temporary file. The result is the same as without this option, "
+        "but exploration is slower.")
+    argparser.add_argument(
+        "--skip-propositional-fast-path",
+        dest="use_propositional_fast_path", action="store_false",
+        help="By default, tasks whose actions and axioms have no "
+        "parameters (e.g., grounded input files) are explored directly "
+        "and their mutex groups are computed by ground invariant "
+        "synthesis. This option uses the lifted Datalog exploration "
+        "and invariant synthesis for these tasks as well.")
     argparser.add_argument(
         "--sas-file", default="output.sas",
         help="path to the SAS output file (default: %(default)s)")
@@ -36,6 +68,29 @@ def parse_args():
         help="infer additional preconditions. This setting can cause a "
         "severe performance penalty due to weaker relevance analysis "
         "(see issue7).")
+    argparser.add_argument(
+        "--negative-precondition-expansion-limit", default=None, type=int,
+        help="max number of operators into which the negative "
+        "preconditions of a single operator are multiplied out. Above "
+        "this limit, negative preconditions are compiled into auxiliary "
+        "derived variables instead. By default, they are always "
+        "multiplied out because derived variables are not supported by "
+        "all heuristics.")
+    argparser.add_argument(
+        "--dnf-size-limit", default=None, type=int,
+        help="max number of disjuncts into which a single precondition, "
+        "effect condition or axiom condition is multiplied out when "
+        "converting it to disjunctive normal form. Above this limit, "
+        "disjunctive subconditions are compiled into auxiliary derived "
+        "variables instead. By default, conditions are always multiplied "
+        "out because derived variables are not supported by all "
+        "heuristics.")
+    argparser.add_argument(
+        "--negative-axiom-size-limit", default=None, type=int,
+        help="max number of axioms generated when negating the axioms of a "
+        "derived variable. Above this limit, the negation is "
+        "overapproximated by assuming that the variable can be false "
+        "unconditionally. By default, there is no limit.")
     argparser.add_argument(
         "--keep-unreachable-facts",
         dest="filter_unreachable_facts", action="store_false",
@@ -67,8 +122,7 @@ def copy_args_to_module(args):
 
 
 def setup():
+    """Parse the command line and store the options as module attributes.
+    Scripts that use the options must call this function first."""
     args = parse_args()
     copy_args_to_module(args)
-
-
-setup()
@@ -0,0 +1,311 @@
+#! /usr/bin/env python3
+
+# Parallel computation of the model of a Datalog program (see
+# build_model for the sequential version).
+#
+# The rules are partitioned such that the rules connected by auxiliary
+# predicates (introduced by splitting a rule into a chain of joins) end
+# up in the same partition. Each partition is evaluated by a worker
+# process that keeps the indexes of its rules. The main process
+# proceeds in rounds: it sends the new atoms of the last round to the
+# workers whose rules have conditions on their predicates. The workers
+# process them together with the auxiliary atoms they derive from them
+# and send back the other derived atoms, which form the new atoms of the
+# next round after removing duplicates.
+#
+# The order in which atoms are derived depends on the partition, so
+# the result is sorted into a canonical order (by predicate, then by
+# arguments) that does not depend on the number of workers. The
+# translator output is the same as with the sequential exploration
+# since the SAS task sorts its operators and axioms.
+#
+# Worker processes inherit the memory (address space) limit of the
+# translator. To keep their total usage within the limit, each worker
+# gets an equal share of the memory beyond the current usage. A worker
+# that dies (e.g., with a MemoryError) is reported as a MemoryError of
+# the main process, so the translator exits with its out-of-memory code.
+
+from collections import deque
+import multiprocessing
+import sys
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import build_model
+import pddl
+import timers
+import tools
+
+
+RULE_TYPES = {
+    rule_type.__name__: rule_type
+    for rule_type in [build_model.JoinRule, build_model.ProductRule,
+                      build_model.ProjectRule]}
+
+
+class RulePartition:
+    """The rules of one partition and their indexes. Predicates are
+    represented by integer IDs, atoms by pairs of predicate ID and
+    argument tuple."""
+    def __init__(self, rule_specs, local_predicates):
+        rules = []
+        for type_name, (effect_predicate, effect_args), conditions in rule_specs:
+            rules.append(RULE_TYPES[type_name](
+                pddl.Atom(effect_predicate, effect_args),
+                [pddl.Atom(predicate, args) for predicate, args in conditions]))
+        self.unifier = build_model.Unifier(rules)
+        self.local_predicates = local_predicates
+        self.local_atoms = set()
+        self.derived_atoms = set()
+
+    def process(self, atoms):
+        """Return the atoms of non-local predicates derived from the
+        given atoms that have not been returned before, in the order in
+        which they are derived."""
+        queue = deque(pddl.Atom(predicate, args) for predicate, args in atoms)
+        result = []
+        def enqueue_func(predicate, args):
+            atom = (predicate, tuple(args))
+            if predicate in self.local_predicates:
+                if atom not in self.local_atoms:
+                    self.local_atoms.add(atom)
+                    queue.append(pddl.Atom(predicate, atom[1]))
+            elif atom not in self.derived_atoms:
+                self.derived_atoms.add(atom)
+                result.append(atom)
+        while queue:
+            atom = queue.popleft()
+            for rule, cond_index in self.unifier.unify(atom):
+                rule.update_index(atom, cond_index)
+                rule.fire(atom, cond_index, enqueue_func)
+        return result
+
+
+def get_worker_memory_limit(num_workers):
+    """Return the address space limit in bytes for each of num_workers
+    worker processes or None if the translator has no limit."""
+    if resource is None:
+        return None
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_AS)
+    if soft_limit == resource.RLIM_INFINITY:
+        return None
+    try:
+        used = tools.get_address_space_in_kb() * 1024
+    except Warning:
+        return None
+    # The main process gets a share as well.
+    return used + max(0, soft_limit - used) // (num_workers + 1)
+
+
+def _run_worker(connection, rule_specs, local_predicates, memory_limit):
+    if memory_limit is not None:
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard_limit))
+    try:
+        partition = RulePartition(rule_specs, local_predicates)
+        while True:
+            atoms = connection.recv()
+            if atoms is None:
+                break
+            connection.send(partition.process(atoms))
+    except MemoryError:
+        # Exit without a traceback. The main process raises a MemoryError
+        # when it notices that the worker terminated.
+        sys.exit(1)
+    connection.close()
+
+
+class WorkerProcess:
+    """RulePartition evaluated in a separate process."""
+    def __init__(self, rule_specs, local_predicates, memory_limit=None):
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_run_worker,
+            args=(child_connection, rule_specs, local_predicates,
+                  memory_limit),
+            daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def _raise_terminated(self):
+        self.process.join(timeout=1)
+        raise MemoryError(
+            "exploration worker terminated with exit code %s" %
+            self.process.exitcode)
+
+    def send(self, atoms):
+        try:
+            self.connection.send(atoms)
+        except OSError:
+            self._raise_terminated()
+
+    def receive(self):
+        try:
+            return self.connection.recv()
+        except (EOFError, OSError):
+            self._raise_terminated()
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class LocalWorker:
+    """RulePartition evaluated in the main process."""
+    def __init__(self, rule_specs, local_predicates):
+        self.partition = RulePartition(rule_specs, local_predicates)
+        self.result = None
+
+    def send(self, atoms):
+        self.result = self.partition.process(atoms)
+
+    def receive(self):
+        return self.result
+
+    def stop(self):
+        pass
+
+
+def partition_rules(rules, num_partitions):
+    """Return a list of num_partitions lists of rule numbers such that
+    the producing and the consuming rules of each auxiliary predicate are
+    in the same partition."""
+    parents = list(range(len(rules)))
+    def find(rule_no):
+        while parents[rule_no] != rule_no:
+            parents[rule_no] = parents[parents[rule_no]]
+            rule_no = parents[rule_no]
+        return rule_no
+
+    rules_by_auxiliary_predicate = {}
+    for rule_no, rule in enumerate(rules):
+        for atom in [rule.effect] + rule.conditions:
+            if build_model.is_auxiliary_predicate(atom.predicate):
+                rules_by_auxiliary_predicate.setdefault(
+                    atom.predicate, []).append(rule_no)
+    for rule_nos in rules_by_auxiliary_predicate.values():
+        root = find(rule_nos[0])
+        for rule_no in rule_nos[1:]:
+            parents[find(rule_no)] = root
+
+    components = {}
+    for rule_no in range(len(rules)):
+        components.setdefault(find(rule_no), []).append(rule_no)
+    # Greedily assign the largest components to the partitions with the
+    # fewest rules.
+    partitions = [[] for _ in range(num_partitions)]
+    for component in sorted(components.values(),
+                            key=lambda component: (-len(component), component)):
+        partition = min(partitions, key=len)
+        partition.extend(component)
+    return [sorted(partition) for partition in partitions if partition]
+
+
+def compute_model(prog, num_workers):
+    """Return the atoms of non-auxiliary predicates in the minimal model
+    of prog in canonical order, using num_workers worker processes. With
+    one worker, all partitions are evaluated in the main process."""
+    with timers.timing("Preparing model"):
+        rules = build_model.convert_rules(prog)
+        fact_atoms = sorted(fact.atom for fact in prog.facts)
+        predicate_ids = {}
+        for atom in fact_atoms:
+            predicate_ids.setdefault(atom.predicate, len(predicate_ids))
+        for rule in rules:
+            for atom in [rule.effect] + rule.conditions:
+                predicate_ids.setdefault(atom.predicate, len(predicate_ids))
+        predicates = list(predicate_ids)
+
+        partitions = partition_rules(rules, num_workers)
+        consumers = {}
+        partition_specs = []
+        for partition_no, partition in enumerate(partitions):
+            rule_specs = []
+            local_predicates = set()
+            for rule_no in partition:
+                rule = rules[rule_no]
+                effect_predicate = predicate_ids[rule.effect.predicate]
+                rule_specs.append((
+                    rule.__class__.__name__,
+                    (effect_predicate, rule.effect.args),
+                    [(predicate_ids[cond.predicate], cond.args)
+                     for cond in rule.conditions]))
+                if build_model.is_auxiliary_predicate(rule.effect.predicate):
+                    local_predicates.add(effect_predicate)
+                for cond in rule.conditions:
+                    consumer_list = consumers.setdefault(
+                        predicate_ids[cond.predicate], [])
+                    if not consumer_list or consumer_list[-1] != partition_no:
+                        consumer_list.append(partition_no)
+            partition_specs.append((rule_specs, local_predicates))
+
+    print("Generated %d rules." % len(rules))
+    print("Distributed rules to %d partitions." % len(partitions))
+    with timers.timing("Computing model"):
+        if num_workers == 1:
+            workers = [LocalWorker(*specs) for specs in partition_specs]
+        else:
+            memory_limit = get_worker_memory_limit(len(partition_specs))
+            workers = [WorkerProcess(*specs, memory_limit)
+                       for specs in partition_specs]
+        try:
+            model = set()
+            new_atoms = []
+            for atom in fact_atoms:
+                atom = (predicate_ids[atom.predicate], atom.args)
+                if atom not in model:
+                    model.add(atom)
+                    new_atoms.append(atom)
+            num_rounds = 0
+            while new_atoms:
+                num_rounds += 1
+                batches = [[] for _ in workers]
+                for atom in new_atoms:
+                    for partition_no in consumers.get(atom[0], ()):
+                        batches[partition_no].append(atom)
+                active_workers = [worker for worker, batch
+                                  in zip(workers, batches) if batch]
+                for worker, batch in zip(workers, batches):
+                    if batch:
+                        worker.send(batch)
+                new_atoms = []
+                for worker in active_workers:
+                    for atom in worker.receive():
+                        if atom not in model:
+                            model.add(atom)
+                            new_atoms.append(atom)
+        finally:
+            for worker in workers:
+                worker.stop()
+    print("%d relevant atoms" % len(model))
+    print("%d rounds" % num_rounds)
+    return [pddl.Atom(predicates[predicate], args)
+            for predicate, args in sorted(model)]
+
+
+if __name__ == "__main__":
+    import normalize
+    import options
+    import pddl_parser
+    import pddl_to_prolog
+
+    options.setup()
+
+    print("Parsing...")
+    task = pddl_parser.open()
+    print("Normalizing...")
+    normalize.normalize(task)
+    print("Writing rules...")
+    prog = pddl_to_prolog.translate(task)
+
+    model = compute_model(prog, multiprocessing.cpu_count())
+    for atom in model:
+        print(atom)
+    print("%d atoms" % len(model))
@@ -1,5 +1,6 @@
 from .pddl_types import Type
 from .pddl_types import TypedObject
+from .pddl_types import TypeIndex
 
 from .tasks import Task
 from .tasks import Requirements
@@ -14,6 +15,7 @@ from .actions import PropositionalAction
 from .axioms import Axiom
 from .axioms import PropositionalAxiom
 
+from .conditions import ConditionTable
 from .conditions import Literal
 from .conditions import Atom
 from .conditions import NegatedAtom
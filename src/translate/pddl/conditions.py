@@ -28,9 +28,20 @@ class Condition:
         method = getattr(self, method_name, self._propagate)
         return method(part_results, *args)
     def _propagate(self, parts, *args):
+        if all(new_part is part for new_part, part in zip(parts, self.parts)):
+            # Conditions are immutable, so we can reuse unchanged nodes.
+            return self
         return self.change_parts(parts)
     def simplified(self):
-        return self._postorder_visit("_simplified")
+        # Memoized per node, so shared subconditions are only simplified
+        # once (see ConditionTable).
+        result = self.__dict__.get("_simplified_condition")
+        if result is None:
+            parts = [part.simplified() for part in self.parts]
+            method = getattr(self, "_simplified", self._propagate)
+            result = method(parts)
+            self._simplified_condition = result
+        return result
     def relaxed(self):
         return self._postorder_visit("_relaxed")
     def untyped(self):
@@ -49,9 +60,20 @@ class Condition:
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
         raise ValueError("Cannot instantiate condition: not normalized")
     def free_variables(self):
-        result = set()
-        for part in self.parts:
-            result |= part.free_variables()
+        return set(self._get_free_variables())
+    def _get_free_variables(self):
+        result = self.__dict__.get("_free_variables")
+        if result is None:
+            result = frozenset().union(
+                *(part._get_free_variables() for part in self.parts))
+            self._free_variables = result
+        return result
+    def _get_negation(self, compute_negation):
+        result = self.__dict__.get("_negation")
+        if result is None:
+            result = compute_negation()
+            self._negation = result
+            result._negation = self
         return result
     def has_disjunction(self):
         for part in self.parts:
@@ -69,6 +91,36 @@ class Condition:
                 return True
         return False
 
+class ConditionTable:
+    """Hash-consing table for conditions.
+
+    get returns a canonical instance for each distinct condition, with
+    all subconditions canonical as well, so that equal subconditions
+    are represented by the same object. Since simplified, free_variables
+    and negate are memoized per node, their results are then computed
+    once per distinct subcondition."""
+    def __init__(self):
+        self._canonical = {}
+        # Maps id(condition) to (condition, canonical condition). We keep
+        # the condition alive, so that its id is not reused.
+        self._canonical_by_id = {}
+
+    def get(self, condition):
+        entry = self._canonical_by_id.get(id(condition))
+        if entry is not None:
+            return entry[1]
+        parts = [self.get(part) for part in condition.parts]
+        if all(new_part is part for new_part, part in zip(parts, condition.parts)):
+            new_condition = condition
+        else:
+            new_condition = condition.change_parts(parts)
+        canonical = self._canonical.setdefault(new_condition, new_condition)
+        self._canonical_by_id[id(condition)] = (condition, canonical)
+        return canonical
+
+    def __len__(self):
+        return len(self._canonical)
+
 class ConstantCondition(Condition):
     # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
     __hash__ = Condition.__hash__
@@ -133,7 +185,8 @@ class Conjunction(JunctorCondition):
         for part in self.parts:
             part.instantiate(var_mapping, init_facts, fluent_facts, result)
     def negate(self):
-        return Disjunction([p.negate() for p in self.parts])
+        return self._get_negation(
+            lambda: Disjunction([p.negate() for p in self.parts]))
 
 class Disjunction(JunctorCondition):
     def _simplified(self, parts):
@@ -151,7 +204,8 @@ class Disjunction(JunctorCondition):
             return result_parts[0]
         return Disjunction(result_parts)
     def negate(self):
-        return Conjunction([p.negate() for p in self.parts])
+        return self._get_negation(
+            lambda: Conjunction([p.negate() for p in self.parts]))
     def has_disjunction(self):
         return True
 
@@ -184,10 +238,12 @@ class QuantifiedCondition(Condition):
         new_parts = (self.parts[0].uniquify_variables(type_map, renamings),)
         return self.__class__(new_parameters, new_parts)
 
-    def free_variables(self):
-        result = Condition.free_variables(self)
-        for par in self.parameters:
-            result.discard(par.name)
+    def _get_free_variables(self):
+        result = self.__dict__.get("_free_variables")
+        if result is None:
+            result = Condition._get_free_variables(self).difference(
+                par.name for par in self.parameters)
+            self._free_variables = result
         return result
     def change_parts(self, parts):
         return self.__class__(self.parameters, parts)
@@ -198,7 +254,8 @@ class UniversalCondition(QuantifiedCondition):
         return UniversalCondition(self.parameters,
                                   [Disjunction(type_literals + parts)])
     def negate(self):
-        return ExistentialCondition(self.parameters, [p.negate() for p in self.parts])
+        return self._get_negation(lambda: ExistentialCondition(
+            self.parameters, [p.negate() for p in self.parts]))
     def has_universal_part(self):
         return True
 
@@ -208,7 +265,8 @@ class ExistentialCondition(QuantifiedCondition):
         return ExistentialCondition(self.parameters,
                                     [Conjunction(type_literals + parts)])
     def negate(self):
-        return UniversalCondition(self.parameters, [p.negate() for p in self.parts])
+        return self._get_negation(lambda: UniversalCondition(
+            self.parameters, [p.negate() for p in self.parts]))
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
         assert not result, "Condition not simplified"
         self.parts[0].instantiate(var_mapping, init_facts, fluent_facts, result)
@@ -257,8 +315,10 @@ class Literal(Condition):
         new_args = list(self.args)
         new_args[position] = new_arg
         return self.__class__(self.predicate, new_args)
-    def free_variables(self):
-        return {arg for arg in self.args if arg[0] == "?"}
+    def simplified(self):
+        return self
+    def _get_free_variables(self):
+        return frozenset(arg for arg in self.args if arg[0] == "?")
 
 class Atom(Literal):
     negated = False
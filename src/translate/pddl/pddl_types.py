@@ -68,3 +68,35 @@ class TypedObject:
         from . import conditions
         predicate_name = _get_type_predicate_name(self.type_name)
         return conditions.Atom(predicate_name, [self.name])
+
+
+class TypeIndex:
+    """Objects of each type, taking the type hierarchy into account.
+
+    This is computed once per task (see Task.get_type_index) and shared
+    by the Datalog translation and the instantiation of actions and
+    axioms. Requires that the supertype names of the types have been
+    set by the parser."""
+    def __init__(self, types, objects):
+        self.objects = objects
+        # Maps each type name to the names of the type and its supertypes.
+        self.type_closure = {type.name: [type.name] + type.supertype_names
+                             for type in types}
+        self.objects_by_type = {type.name: [] for type in types}
+        for obj in objects:
+            for type_name in self.type_closure[obj.type_name]:
+                self.objects_by_type[type_name].append(obj.name)
+
+    def get_objects(self, type_name):
+        return self.objects_by_type.get(type_name, [])
+
+    def get_type_atoms(self, predicates=None):
+        """Yield the atoms type@T(o) for all objects o of type T, object
+        by object. If predicates is given, only yield atoms whose
+        predicate is in it."""
+        from . import conditions
+        for obj in self.objects:
+            for type_name in self.type_closure[obj.type_name]:
+                predicate = _get_type_predicate_name(type_name)
+                if predicates is None or predicate in predicates:
+                    yield conditions.Atom(predicate, [obj.name])
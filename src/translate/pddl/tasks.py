@@ -1,4 +1,5 @@
 from . import axioms
+from . import pddl_types
 from . import predicates
 
 
@@ -19,6 +20,12 @@ class Task:
         self.axioms = axioms
         self.axiom_counter = 0
         self.use_min_cost_metric = use_metric
+        self._type_index = None
+
+    def get_type_index(self):
+        if self._type_index is None:
+            self._type_index = pddl_types.TypeIndex(self.types, self.objects)
+        return self._type_index
 
     def add_axiom(self, parameters, condition):
         name = "new-axiom@%d" % self.axiom_counter
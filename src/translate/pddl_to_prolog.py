@@ -142,15 +142,13 @@ class Rule:
         cond_str = ", ".join(map(str, self.conditions))
         return "%s :- %s." % (self.effect, cond_str)
 
-def translate_typed_object(prog, obj, type_dict):
-    supertypes = type_dict[obj.type_name].supertype_names
-    for type_name in [obj.type_name] + supertypes:
-        prog.add_fact(pddl.TypedObject(obj.name, type_name).get_atom())
-
-def translate_facts(prog, task):
-    type_dict = {type.name: type for type in task.types}
-    for obj in task.objects:
-        translate_typed_object(prog, obj, type_dict)
+def translate_facts(prog, task, rules):
+    # Type facts are only needed for the types that occur in rule bodies,
+    # which are usually few compared to the types in deep hierarchies.
+    body_predicates = {condition.predicate
+                       for conditions, _ in rules for condition in conditions}
+    for atom in task.get_type_index().get_type_atoms(body_predicates):
+        prog.add_fact(atom)
     for fact in task.init:
         assert isinstance(fact, pddl.Atom) or isinstance(fact, pddl.Assign)
         if isinstance(fact, pddl.Atom):
@@ -160,8 +158,9 @@ def translate(task):
     # Note: The function requires that the task has been normalized.
     with timers.timing("Generating Datalog program"):
         prog = PrologProgram()
-        translate_facts(prog, task)
-        for conditions, effect in normalize.build_exploration_rules(task):
+        rules = normalize.build_exploration_rules(task)
+        translate_facts(prog, task, rules)
+        for conditions, effect in rules:
             prog.add_rule(Rule(conditions, effect))
     with timers.timing("Normalizing Datalog program", block=True):
         # Using block=True because normalization can output some messages
@@ -172,7 +171,9 @@ def translate(task):
 
 
 if __name__ == "__main__":
+    import options
     import pddl_parser
+    options.setup()
     task = pddl_parser.open()
     normalize.normalize(task)
     prog = translate(task)
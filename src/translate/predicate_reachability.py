@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+
+# Cheap relaxed reachability check on the predicate abstraction of the
+# exploration rules. Every atom p(a1, ..., an) is abstracted to its
+# predicate p, and a rule fires as soon as all predicates in its body
+# are reachable. Since every relaxed reachable atom has a reachable
+# predicate, the goal is relaxed unreachable if the "@goal-reachable"
+# predicate is unreachable in the abstraction. This lets us detect
+# some unsolvable tasks without building the full Datalog model.
+
+import normalize
+import pddl
+
+
+def get_initial_predicates(task):
+    predicates = {atom.predicate
+                  for atom in task.get_type_index().get_type_atoms()}
+    for fact in task.init:
+        if isinstance(fact, pddl.Atom):
+            predicates.add(fact.predicate)
+    return predicates
+
+
+def compute_reachable_predicates(task):
+    """Return the set of reachable predicates and the number of
+    applicable rules in the predicate abstraction of the exploration
+    rules of the (normalized) task."""
+    rules = normalize.build_exploration_rules(task)
+
+    # Counter-based propagation as for relaxed reachability with unit
+    # costs: each rule counts its unreached body predicates and fires
+    # when the counter drops to zero.
+    rules_by_body_predicate = {}
+    unreached_counters = []
+    queue = []
+    for rule_no, (conditions, effect) in enumerate(rules):
+        body_predicates = {cond.predicate for cond in conditions}
+        unreached_counters.append(len(body_predicates))
+        for predicate in body_predicates:
+            rules_by_body_predicate.setdefault(predicate, []).append(rule_no)
+        if not body_predicates:
+            queue.append(effect.predicate)
+
+    reachable = set()
+    queue.extend(get_initial_predicates(task))
+    num_applicable_rules = sum(
+        1 for counter in unreached_counters if counter == 0)
+    while queue:
+        predicate = queue.pop()
+        if predicate in reachable:
+            continue
+        reachable.add(predicate)
+        for rule_no in rules_by_body_predicate.get(predicate, ()):
+            unreached_counters[rule_no] -= 1
+            if not unreached_counters[rule_no]:
+                num_applicable_rules += 1
+                queue.append(rules[rule_no][1].predicate)
+    return reachable, num_applicable_rules, len(rules)
+
+
+def goal_reachable(task):
+    reachable, num_applicable_rules, num_rules = (
+        compute_reachable_predicates(task))
+    print("%d of %d exploration rules applicable at predicate level" % (
+        num_applicable_rules, num_rules))
+    print("%d predicates reachable at predicate level" % len(reachable))
+    return "@goal-reachable" in reachable
+
+
+if __name__ == "__main__":
+    import options
+    import pddl_parser
+    options.setup()
+    task = pddl_parser.open()
+    normalize.normalize(task)
+    print("goal reachable at predicate level: %s" % goal_reachable(task))
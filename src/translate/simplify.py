@@ -26,6 +26,7 @@ filter_unreachable_propositions.)
 from collections import defaultdict
 from itertools import count
 
+import compact_graph
 import sas_tasks
 
 DEBUG = False
@@ -68,14 +69,10 @@ class DomainTransitionGraph:
     def reachable(self):
         """Return the values reachable from the initial value.
         Represented as a set(int)."""
-        queue = [self.init]
-        reachable = set(queue)
-        while queue:
-            node = queue.pop()
-            new_neighbors = self.arcs.get(node, set()) - reachable
-            reachable |= new_neighbors
-            queue.extend(new_neighbors)
-        return reachable
+        graph = compact_graph.CompactGraph.from_adjacency_list(
+            [self.arcs.get(value, ()) for value in range(self.size)])
+        reached = graph.get_reachable([self.init])
+        return {value for value in range(self.size) if reached[value]}
 
     def dump(self):
         """Dump the DTG."""
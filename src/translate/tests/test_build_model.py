@@ -0,0 +1,40 @@
+import pddl
+from pddl_to_prolog import Rule, PrologProgram
+import build_model
+
+
+def get_program():
+    prog = PrologProgram()
+    for obj in ["obj1", "obj2"]:
+        prog.add_fact(pddl.Atom("s", [obj]))
+        # Equal but not identical arguments, as when they are parsed from
+        # different positions of the task file.
+        prog.add_fact(pddl.Atom("q", [obj, "".join(list(obj))]))
+    prog.add_fact(pddl.Atom("r", ["obj3"]))
+    for obj in ["obj1", "obj2", "obj3"]:
+        prog.add_fact(pddl.Atom("=", [obj, obj]))
+    prog.add_rule(Rule([pddl.Atom("s", ["?x"])], pddl.Atom("p", ["?x", "?x"])))
+    prog.add_rule(Rule(
+        [pddl.Atom("p", ["?x", "?y"]), pddl.Atom("q", ["?x", "?y"]),
+         pddl.Atom("r", ["?z"])],
+        pddl.Atom("done", ["?x", "?y", "?z"])))
+    prog.add_rule(Rule([pddl.Atom("done", ["obj1", "obj1", "obj3"])],
+                       pddl.Atom("@goal-reachable", [])))
+    prog.normalize()
+    prog.split_rules()
+    return prog
+
+
+def get_relevant_atoms(model):
+    return [atom for atom in model
+            if not build_model.is_auxiliary_predicate(atom.predicate)]
+
+
+def test_memory_bounded_model_with_spilling(monkeypatch):
+    expected = get_relevant_atoms(build_model.compute_model(get_program()))
+    # Check for saturation and spill all join indexes after every atom.
+    monkeypatch.setattr(build_model.MemoryBoundedQueue, "CHECK_INTERVAL", 1)
+    monkeypatch.setattr(build_model.MemoryBoundedQueue, "SPILL_MIN_ATOMS", 0)
+    model = build_model.compute_model(get_program(), memory_limit=0)
+    assert model == expected
+    assert pddl.Atom("@goal-reachable", []) in model
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+from .test_propositional import TRANSLATE_DIR
+
+
+DOMAIN = """
+(define (domain choices)
+  (:predicates (a1) (b1) (a2) (b2) (a3) (b3) (done))
+  (:action finish
+    :precondition (and (or (a1) (b1)) (or (a2) (b2)) (or (a3) (b3)))
+    :effect (done)))
+"""
+
+PROBLEM = """
+(define (problem choices-1)
+  (:domain choices)
+  (:init (b1) (a2) (b3))
+  (:goal (done)))
+"""
+
+
+def translate(tmp_path, *options):
+    domain = tmp_path / "domain.pddl"
+    problem = tmp_path / "problem.pddl"
+    domain.write_text(DOMAIN)
+    problem.write_text(PROBLEM)
+    cmd = [sys.executable, "translate.py", str(domain), str(problem),
+           "--sas-file", str(tmp_path / "output.sas")] + list(options)
+    return subprocess.check_output(cmd, cwd=TRANSLATE_DIR, text=True)
+
+
+def test_dnf_size_limit_compiles_disjunctions_into_axioms(tmp_path):
+    # The precondition of "finish" has a DNF with 2 * 2 * 2 = 8 disjuncts.
+    output = translate(tmp_path)
+    assert "8 actions, 0 effects and 0 axioms created" in output
+    assert "0 disjunctive conditions compiled into axioms" in output
+
+    # With a limit of 2, two of the three disjunctions are replaced by
+    # new axioms, which are split into two axioms each.
+    output = translate(tmp_path, "--dnf-size-limit", "2")
+    assert "2 actions, 0 effects and 4 axioms created" in output
+    assert "2 disjunctive conditions compiled into axioms" in output
+    assert "Translator operators: 1" in output
+    assert "Translator axioms: 2" in output
@@ -0,0 +1,82 @@
+import pytest
+
+import build_model
+import parallel_model
+import pddl
+from pddl_to_prolog import Rule, PrologProgram
+
+from .test_build_model import get_program, get_relevant_atoms
+
+
+def get_chain_program():
+    """Return a program whose rules with many conditions are split into
+    chains of join rules over auxiliary predicates."""
+    prog = PrologProgram()
+    objects = ["obj%d" % i for i in range(6)]
+    for obj1, obj2 in zip(objects, objects[1:]):
+        prog.add_fact(pddl.Atom("e", [obj1, obj2]))
+    for obj in objects:
+        prog.add_fact(pddl.Atom("=", [obj, obj]))
+    for obj in objects[::2]:
+        prog.add_fact(pddl.Atom("a", [obj]))
+    for obj in objects[1::2]:
+        prog.add_fact(pddl.Atom("b", [obj]))
+    prog.add_rule(Rule(
+        [pddl.Atom("e", ["?w", "?x"]), pddl.Atom("e", ["?x", "?y"]),
+         pddl.Atom("e", ["?y", "?z"]), pddl.Atom("a", ["?w"]),
+         pddl.Atom("b", ["?z"])],
+        pddl.Atom("path", ["?w", "?z"])))
+    prog.add_rule(Rule(
+        [pddl.Atom("path", ["?w", "?x"]), pddl.Atom("e", ["?x", "?y"]),
+         pddl.Atom("path", ["?y", "?z"]), pddl.Atom("b", ["?x"])],
+        pddl.Atom("long", ["?w", "?z"])))
+    prog.add_rule(Rule(
+        [pddl.Atom("b", ["?x"]), pddl.Atom("e", ["?x", "?y"]),
+         pddl.Atom("a", ["?y"]), pddl.Atom("e", ["?y", "?z"])],
+        pddl.Atom("step", ["?x", "?z"])))
+    prog.add_rule(Rule([pddl.Atom("long", ["obj0", "?x"])],
+                       pddl.Atom("@goal-reachable", [])))
+    prog.normalize()
+    prog.split_rules()
+    return prog
+
+
+def test_model_does_not_depend_on_number_of_workers():
+    model = parallel_model.compute_model(get_program(), 1)
+    assert parallel_model.compute_model(get_program(), 2) == model
+    expected = get_relevant_atoms(build_model.compute_model(get_program()))
+    assert sorted(model) == sorted(expected)
+
+
+def test_terminated_worker_raises_memory_error():
+    worker = parallel_model.WorkerProcess([], set())
+    worker.process.kill()
+    worker.process.join()
+    with pytest.raises(MemoryError):
+        worker.send([])
+        worker.receive()
+    worker.stop()
+
+
+def test_partitions_keep_auxiliary_join_chains_together():
+    rules = build_model.convert_rules(get_chain_program())
+    chains = {}
+    for rule_no, rule in enumerate(rules):
+        for atom in [rule.effect] + rule.conditions:
+            if build_model.is_auxiliary_predicate(atom.predicate):
+                chains.setdefault(atom.predicate, set()).add(rule_no)
+    assert any(len(rule_nos) > 1 for rule_nos in chains.values())
+    for num_partitions in [2, 3, 4]:
+        partitions = parallel_model.partition_rules(rules, num_partitions)
+        assert len(partitions) > 1
+        assert sorted(sum(partitions, [])) == list(range(len(rules)))
+        for rule_nos in chains.values():
+            assert any(rule_nos <= set(partition) for partition in partitions)
+
+
+def test_model_with_join_chains_does_not_depend_on_number_of_workers():
+    expected = get_relevant_atoms(build_model.compute_model(get_chain_program()))
+    assert pddl.Atom("@goal-reachable", []) in expected
+    for num_workers in [1, 2, 3]:
+        model = parallel_model.compute_model(get_chain_program(), num_workers)
+        assert sorted(model) == sorted(expected)
@@ -0,0 +1,26 @@
+import os.path
+import subprocess
+import sys
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+TRANSLATE_DIR = os.path.dirname(DIR)
+REGRESSION_TESTS = os.path.join(TRANSLATE_DIR, "regression-tests")
+DOMAIN = os.path.join(REGRESSION_TESTS, "grounded-gripper-domain.pddl")
+PROBLEM = os.path.join(REGRESSION_TESTS, "grounded-gripper-problem.pddl")
+
+
+def translate(sas_file, *options):
+    cmd = [sys.executable, "translate.py", DOMAIN, PROBLEM,
+           "--sas-file", str(sas_file)] + list(options)
+    output = subprocess.check_output(cmd, cwd=TRANSLATE_DIR, text=True)
+    with open(sas_file) as f:
+        return output, f.read()
+
+
+def test_propositional_fast_path(tmp_path):
+    output, fast_sas = translate(tmp_path / "fast.sas")
+    assert "Task is propositional" in output
+    output, lifted_sas = translate(
+        tmp_path / "lifted.sas", "--skip-propositional-fast-path")
+    assert "Task is propositional" not in output
+    assert fast_sas == lifted_sas
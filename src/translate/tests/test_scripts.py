@@ -15,6 +15,7 @@ SCRIPTS = [
     "invariant_finder.py",
     "normalize.py",
     "pddl_to_prolog.py",
+    "predicate_reachability.py",
     "translate.py",
 ]
 
@@ -17,14 +17,28 @@ def cartesian_product(sequences):
                 yield item + sequence
 
 
-def get_peak_memory_in_kb():
+def _read_proc_status(key, description):
+    """Return the value of *key* (e.g. "VmPeak") in /proc/self/status in
+    KB. Raise a Warning mentioning *description* if it is not available."""
     try:
         # This will only work on Linux systems.
         with open("/proc/self/status") as status_file:
             for line in status_file:
                 parts = line.split()
-                if parts[0] == "VmPeak:":
+                if parts[0] == key + ":":
                     return int(parts[1])
     except OSError:
         pass
-    raise Warning("warning: could not determine peak memory")
+    raise Warning("warning: could not determine %s" % description)
+
+
+def get_peak_memory_in_kb():
+    return _read_proc_status("VmPeak", "peak memory")
+
+
+def get_memory_in_kb():
+    return _read_proc_status("VmRSS", "memory usage")
+
+
+def get_address_space_in_kb():
+    return _read_proc_status("VmSize", "address space")
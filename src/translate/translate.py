@@ -3,7 +3,6 @@
 
 import os
 import sys
-import traceback
 
 def python_version_supported():
     return sys.version_info >= (3, 6)
@@ -12,7 +11,7 @@ if not python_version_supported():
     sys.exit("Error: Translator only supports Python >= 3.6.")
 
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from copy import deepcopy
 from itertools import product
 
@@ -23,6 +22,8 @@ import normalize
 import options
 import pddl
 import pddl_parser
+import predicate_reachability
+import propositional
 import sas_tasks
 import signal
 import simplify
@@ -50,6 +51,8 @@ TRANSLATE_OUT_OF_TIME = 21
 
 simplified_effect_condition_counter = 0
 added_implied_precondition_counter = 0
+multiplied_out_negative_precondition_counter = 0
+derived_negative_precondition_counter = 0
 
 
 def strips_to_sas_dictionary(groups, assert_partial):
@@ -63,7 +66,69 @@ def strips_to_sas_dictionary(groups, assert_partial):
     return [len(group) + 1 for group in groups], dictionary
 
 
-def translate_strips_conditions_aux(conditions, dictionary, ranges):
+class NegativePreconditionVariables:
+    """Auxiliary derived variables for negative operator preconditions.
+
+    A negative precondition (not p) is usually translated into the
+    disjunctive condition "var != val" over the variable representing
+    p, which is then multiplied out into one operator per possible
+    value. If the number of operators resulting from the multiplication
+    exceeds *expansion_limit*, we instead introduce a binary derived
+    variable that is true (value 0) iff var takes one of the remaining
+    values and use it as a single precondition. Variables are shared
+    between operators that need the same set of values."""
+
+    def __init__(self, num_variables, expansion_limit):
+        self.first_var = num_variables
+        self.expansion_limit = expansion_limit
+        self.var_by_condition = {}
+        self.axioms = []
+
+    def get_variable(self, var, vals):
+        key = (var, frozenset(vals))
+        aux_var = self.var_by_condition.get(key)
+        if aux_var is None:
+            aux_var = self.first_var + len(self.var_by_condition)
+            self.var_by_condition[key] = aux_var
+            for val in sorted(vals):
+                self.axioms.append(sas_tasks.SASAxiom([(var, val)], (aux_var, 0)))
+        return aux_var
+
+    def restrict_expansion(self, condition):
+        """Replace disjunctive parts of condition (var -> set of values)
+        by auxiliary derived variables, largest first, until the number
+        of conditions produced by multiplying out is within the limit."""
+        global multiplied_out_negative_precondition_counter
+        global derived_negative_precondition_counter
+        disjunctive = deque(sorted(
+            ((var, vals) for var, vals in condition.items() if len(vals) > 1),
+            key=lambda pair: (-len(pair[1]), pair[0])))
+        expansion_size = 1
+        for _, vals in disjunctive:
+            expansion_size *= len(vals)
+        if self.expansion_limit is not None:
+            while disjunctive and expansion_size > self.expansion_limit:
+                var, vals = disjunctive.popleft()
+                expansion_size //= len(vals)
+                del condition[var]
+                condition[self.get_variable(var, vals)] = {0}
+                derived_negative_precondition_counter += 1
+        multiplied_out_negative_precondition_counter += len(disjunctive)
+
+    def get_num_variables(self):
+        return len(self.var_by_condition)
+
+    def get_translation_key(self):
+        key = []
+        for aux_var in range(self.first_var,
+                             self.first_var + self.get_num_variables()):
+            atom = pddl.Atom("@negative-precondition-%d" % aux_var, [])
+            key.append([str(atom), str(atom.negate())])
+        return key
+
+
+def translate_strips_conditions_aux(conditions, dictionary, ranges,
+                                    negative_precondition_vars=None):
     condition = {}
     for fact in conditions:
         if fact.negated:
@@ -104,8 +169,11 @@ def translate_strips_conditions_aux(conditions, dictionary, ranges):
             ## However, here we avoid introducing new derived predicates
             ## by treating the negative precondition as a disjunctive
             ## precondition and expanding it by "multiplying out" the
-            ## possibilities.  This can lead to an exponential blow-up so
-            ## it would be nice to choose the behaviour as an option.
+            ## possibilities. This can lead to an exponential blow-up, so
+            ## for operator preconditions, the option
+            ## --negative-precondition-expansion-limit bounds the
+            ## expansion by falling back to derived variables (see
+            ## NegativePreconditionVariables).
             done = False
             new_condition = {}
             atom = pddl.Atom(fact.predicate, fact.args)  # force positive
@@ -154,11 +222,14 @@ def translate_strips_conditions_aux(conditions, dictionary, ranges):
                     flat_conds = new_conds
             return flat_conds
 
+    if negative_precondition_vars is not None:
+        negative_precondition_vars.restrict_expansion(condition)
     return multiply_out(condition)
 
 
 def translate_strips_conditions(conditions, dictionary, ranges,
-                                mutex_dict, mutex_ranges):
+                                mutex_dict, mutex_ranges,
+                                negative_precondition_vars=None):
     if not conditions:
         return [{}]  # Quick exit for common case.
 
@@ -167,13 +238,16 @@ def translate_strips_conditions(conditions, dictionary, ranges,
                                        mutex_ranges) is None:
         return None
 
-    return translate_strips_conditions_aux(conditions, dictionary, ranges)
+    return translate_strips_conditions_aux(conditions, dictionary, ranges,
+                                           negative_precondition_vars)
 
 
 def translate_strips_operator(operator, dictionary, ranges, mutex_dict,
-                              mutex_ranges, implied_facts):
+                              mutex_ranges, implied_facts,
+                              negative_precondition_vars=None):
     conditions = translate_strips_conditions(operator.precondition, dictionary,
-                                             ranges, mutex_dict, mutex_ranges)
+                                             ranges, mutex_dict, mutex_ranges,
+                                             negative_precondition_vars)
     if conditions is None:
         return []
     sas_operators = []
@@ -385,12 +459,14 @@ def translate_strips_axiom(axiom, dictionary, ranges, mutex_dict, mutex_ranges):
 
 
 def translate_strips_operators(actions, strips_to_sas, ranges, mutex_dict,
-                               mutex_ranges, implied_facts):
+                               mutex_ranges, implied_facts,
+                               negative_precondition_vars=None):
     result = []
     for action in actions:
         sas_ops = translate_strips_operator(action, strips_to_sas, ranges,
                                             mutex_dict, mutex_ranges,
-                                            implied_facts)
+                                            implied_facts,
+                                            negative_precondition_vars)
         result.extend(sas_ops)
     return result
 
@@ -436,8 +512,8 @@ def translate_task(strips_to_sas, ranges, translation_key,
                    init, goals,
                    actions, axioms, metric, implied_facts):
     with timers.timing("Processing axioms", block=True):
-        axioms, axiom_layer_dict = axiom_rules.handle_axioms(actions, axioms, goals,
-                                                             options.layer_strategy)
+        axioms, axiom_layer_dict = axiom_rules.handle_axioms(
+            actions, axioms, goals, options.layer_strategy)
 
     if options.dump_task:
         # Remove init facts that don't occur in strips_to_sas: they're constant.
@@ -474,9 +550,12 @@ def translate_task(strips_to_sas, ranges, translation_key,
         return solvable_sas_task("Empty goal")
     goal = sas_tasks.SASGoal(goal_pairs)
 
+    negative_precondition_vars = NegativePreconditionVariables(
+        len(ranges), options.negative_precondition_expansion_limit)
     operators = translate_strips_operators(actions, strips_to_sas, ranges,
                                            mutex_dict, mutex_ranges,
-                                           implied_facts)
+                                           implied_facts,
+                                           negative_precondition_vars)
     axioms = translate_strips_axioms(axioms, strips_to_sas, ranges, mutex_dict,
                                      mutex_ranges)
 
@@ -485,6 +564,17 @@ def translate_task(strips_to_sas, ranges, translation_key,
         assert layer >= 0
         [(var, val)] = strips_to_sas[atom]
         axiom_layers[var] = layer
+
+    # The auxiliary variables only depend on non-derived variables, so
+    # they can go into the lowest layer. Their fallback value is 1.
+    num_aux_vars = negative_precondition_vars.get_num_variables()
+    if num_aux_vars:
+        ranges = ranges + [2] * num_aux_vars
+        axiom_layers += [0] * num_aux_vars
+        translation_key = (translation_key +
+                           negative_precondition_vars.get_translation_key())
+        init.values += [1] * num_aux_vars
+        axioms += negative_precondition_vars.axioms
     variables = sas_tasks.SASVariables(ranges, axiom_layers, translation_key)
     mutexes = [sas_tasks.SASMutexGroup(group) for group in mutex_key]
     return sas_tasks.SASTask(variables, mutexes, init, goal,
@@ -520,9 +610,23 @@ def unsolvable_sas_task(msg):
     return trivial_task(solvable=False)
 
 def pddl_to_sas(task):
+    with timers.timing("Checking predicate-level reachability", block=True):
+        goal_reachable = predicate_reachability.goal_reachable(task)
+    if not goal_reachable:
+        return unsolvable_sas_task("No relaxed solution at predicate level")
+
+    is_propositional = (options.use_propositional_fast_path and
+                        propositional.is_propositional(task))
     with timers.timing("Instantiating", block=True):
-        (relaxed_reachable, atoms, actions, goal_list, axioms,
-         reachable_action_params) = instantiate.explore(task)
+        if is_propositional:
+            print("Task is propositional, skipping Datalog exploration.")
+            (relaxed_reachable, atoms, actions, goal_list, axioms,
+             reachable_action_params) = propositional.explore(task)
+        else:
+            (relaxed_reachable, atoms, actions, goal_list, axioms,
+             reachable_action_params) = instantiate.explore(
+                task, options.exploration_memory_limit,
+                options.exploration_workers)
 
     if not relaxed_reachable:
         return unsolvable_sas_task("No relaxed solution")
@@ -534,7 +638,8 @@ def pddl_to_sas(task):
 
     with timers.timing("Computing fact groups", block=True):
         groups, mutex_groups, translation_key = fact_groups.compute_groups(
-            task, atoms, reachable_action_params)
+            task, atoms, reachable_action_params,
+            propositional_actions=actions if is_propositional else None)
 
     with timers.timing("Building STRIPS to SAS dictionary"):
         ranges, strips_to_sas = strips_to_sas_dictionary(
@@ -573,6 +678,10 @@ def pddl_to_sas(task):
           simplified_effect_condition_counter)
     print("%d implied preconditions added" %
           added_implied_precondition_counter)
+    print("%d negative preconditions multiplied out" %
+          multiplied_out_negative_precondition_counter)
+    print("%d negative preconditions compiled into derived variables" %
+          derived_negative_precondition_counter)
 
     if options.filter_unreachable_facts:
         with timers.timing("Detecting unreachable propositions", block=True):
@@ -608,10 +717,39 @@ def build_mutex_key(strips_to_sas, groups):
     return group_keys
 
 
+class ImpliedFacts:
+    """Mapping from FDR pairs to the FDR pairs they imply.
+
+    Instead of storing the implied pairs for every fact separately,
+    which is quadratic in the size of the mutex groups, we store for
+    each mutex group the pairs it implies once and keep an inverted
+    index from facts to the mutex groups they occur in. implied[p]
+    iterates over the implied pairs of p (possibly with duplicates)."""
+
+    def __init__(self):
+        self.implied_by_group = []
+        self.groups_by_fact = defaultdict(list)
+
+    def add_group(self, facts, implied_pairs):
+        group_no = len(self.implied_by_group)
+        self.implied_by_group.append(tuple(implied_pairs))
+        for fact in facts:
+            self.groups_by_fact[fact].append(group_no)
+
+    def __getitem__(self, fact):
+        fact_var = fact[0]
+        for group_no in self.groups_by_fact.get(fact, ()):
+            for implied_pair in self.implied_by_group[group_no]:
+                # A pair never implies the negation of its own
+                # proposition.
+                if implied_pair[0] != fact_var:
+                    yield implied_pair
+
+
 def build_implied_facts(strips_to_sas, groups, mutex_groups):
-    ## Compute a dictionary mapping facts (FDR pairs) to lists of FDR
-    ## pairs implied by that fact. In other words, in all states
-    ## containing p, all pairs in implied_facts[p] must also be true.
+    ## Compute a mapping from facts (FDR pairs) to the FDR pairs
+    ## implied by that fact. In other words, in all states containing
+    ## p, all pairs in implied_facts[p] must also be true.
     ##
     ## There are two simple cases where a pair p implies a pair q != p
     ## in our FDR encodings:
@@ -639,17 +777,21 @@ def build_implied_facts(strips_to_sas, groups, mutex_groups):
     ## Then we compute implied facts as follows: for each mutex group,
     ## check if prop is lonely (then and only then "not prop" has a
     ## representation as an FDR pair). In that case, all other facts
-    ## in this mutex group imply "not prop".
-    implied_facts = defaultdict(list)
+    ## in this mutex group imply "not prop". The pair for "not prop" is
+    ## (prop_var, 1) and the only pair representing prop is
+    ## (prop_var, 0), so ImpliedFacts can exclude prop itself by
+    ## comparing variables.
+    implied_facts = ImpliedFacts()
     for mutex_group in mutex_groups:
+        implied_pairs = []
         for prop in mutex_group:
             prop_var = lonely_propositions.get(prop)
             if prop_var is not None:
-                prop_is_false = (prop_var, 1)
-                for other_prop in mutex_group:
-                    if other_prop is not prop:
-                        for other_fact in strips_to_sas[other_prop]:
-                            implied_facts[other_fact].append(prop_is_false)
+                implied_pairs.append((prop_var, 1))
+        if implied_pairs:
+            facts = [fact for prop in mutex_group
+                     for fact in strips_to_sas[prop]]
+            implied_facts.add_group(facts, implied_pairs)
 
     return implied_facts
 
@@ -676,13 +818,20 @@ def dump_statistics(sas_task):
 
 
 def main():
+    options.setup()
     timer = timers.Timer()
     with timers.timing("Parsing", True):
         task = pddl_parser.open(
             domain_filename=options.domain, task_filename=options.task)
 
     with timers.timing("Normalizing task"):
-        normalize.normalize(task)
+        normalize.normalize(task, options.dnf_size_limit)
+    print("%d actions, %d effects and %d axioms created by splitting "
+          "disjunctions" % (normalize.split_disjunction_counters["actions"],
+                            normalize.split_disjunction_counters["effects"],
+                            normalize.split_disjunction_counters["axioms"]))
+    print("%d disjunctive conditions compiled into axioms" %
+          normalize.disjunction_axiom_counter)
 
     if options.generate_relaxed_task:
         # Remove delete effects.
@@ -723,6 +872,7 @@ if __name__ == "__main__":
         main()
     except MemoryError:
         del emergency_memory
+        import traceback
         print()
         print("Translator ran out of memory, traceback:")
         print("=" * 79)
@@ -2,7 +2,7 @@ from collections import defaultdict, deque
 from itertools import chain
 import heapq
 
-import sccs
+import compact_graph
 
 DEBUG = False
 
@@ -72,7 +72,8 @@ class CausalGraph:
         assert(len(self.weighted_graph) <= self.num_variables)
         for source, target_weights in self.weighted_graph.items():
             unweighted_graph[source] = sorted(target_weights.keys())
-        return sccs.get_sccs_adjacency_list(unweighted_graph)
+        graph = compact_graph.CompactGraph.from_adjacency_list(unweighted_graph)
+        return graph.get_sccs()
 
     def calculate_topological_pseudo_sort(self, sccs):
         for scc in sccs:
@@ -96,22 +97,14 @@ class CausalGraph:
                 self.ordering.append(scc[0])
 
     def calculate_important_vars(self, goal):
-        # Note for future refactoring: it is perhaps more idiomatic
-        # and efficient to use a set rather than a defaultdict(bool).
-        necessary = defaultdict(bool)
-        for var, _ in goal.pairs:
-            if not necessary[var]:
-                necessary[var] = True
-                self.dfs(var, necessary)
-        return necessary
-
-    def dfs(self, node, necessary):
-        stack = [pred for pred in self.predecessor_graph[node]]
-        while stack:
-            n = stack.pop()
-            if not necessary[n]:
-                necessary[n] = True
-                stack.extend(pred for pred in self.predecessor_graph[n])
+        """Return the set of variables that are ancestors of a goal
+        variable in the causal graph (including the goal variables)."""
+        predecessor_graph = compact_graph.CompactGraph.from_adjacency_list(
+            [self.predecessor_graph.get(var, ()) for var in
+             range(self.num_variables)])
+        necessary = predecessor_graph.get_reachable(
+            var for var, _ in goal.pairs)
+        return {var for var in range(self.num_variables) if necessary[var]}
 
 
 class MaxDAG:
@@ -280,5 +273,5 @@ def find_and_apply_variable_order(sas_task, reorder_vars=True,
             necessary = cg.calculate_important_vars(sas_task.goal)
             print("%s of %s variables necessary." % (len(necessary),
                                                      len(order)))
-            order = [var for var in order if necessary[var]]
+            order = [var for var in order if var in necessary]
         VariableOrder(order).apply_to_task(sas_task)